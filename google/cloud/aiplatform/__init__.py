@@ -15,7 +15,9 @@
 # limitations under the License.
 #
 
-from google.cloud.aiplatform import gapic
+from google.cloud.aiplatform.helpers import _lazy
 
 
-__all__ = (gapic,)
+__all__ = ("gapic",)
+
+__getattr__, __dir__ = _lazy.attach(globals(), {"gapic": "{}.gapic".format(__name__)})
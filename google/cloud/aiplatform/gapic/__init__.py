@@ -16,9 +16,15 @@
 #
 
 # The latest GAPIC version is exported to the google.cloud.aiplatform.gapic namespace.
-from google.cloud.aiplatform_v1 import *
-from google.cloud.aiplatform.gapic import schema
-
 from google.cloud import aiplatform_v1 as v1
+from google.cloud.aiplatform.helpers import _lazy
 
 __all__ = ()
+
+# The schema package and the names re-exported from aiplatform_v1 load on
+# first access.
+__getattr__, __dir__ = _lazy.attach(
+    globals(),
+    {"schema": "{}.schema".format(__name__)},
+    attributes={name: v1.__name__ for name in v1.__all__},
+)
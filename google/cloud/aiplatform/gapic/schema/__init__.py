@@ -14,33 +14,45 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from google.cloud.aiplatform.helpers import _decorators
-from google.cloud.aiplatform.v1beta1.schema import predict
-from google.cloud.aiplatform.v1beta1.schema import trainingjob
-from google.cloud.aiplatform.v1beta1.schema.predict.instance_v1beta1 import (
-    types as instance,
-)
-from google.cloud.aiplatform.v1beta1.schema.predict.params_v1beta1 import (
-    types as params,
-)
-from google.cloud.aiplatform.v1beta1.schema.predict.prediction_v1beta1 import (
-    types as prediction,
-)
-from google.cloud.aiplatform.v1beta1.schema.trainingjob.definition_v1beta1 import (
-    types as definition,
-)
+from google.cloud.aiplatform.helpers import _lazy
 
 __all__ = (
+    "definition",
+    "instance",
+    "params",
     "predict",
+    "prediction",
     "trainingjob",
 )
 
-enhanced_types_packages = [
-    instance,
-    params,
-    prediction,
-    definition,
-]
+_PREDICT = "google.cloud.aiplatform.v1beta1.schema.predict"
+_TRAININGJOB = "google.cloud.aiplatform.v1beta1.schema.trainingjob"
+
+# The enhanced types are loaded, and get their to_value()/from_value()
+# methods, only when one of these is first used.
+_getattr, __dir__ = _lazy.attach(
+    globals(),
+    {
+        "predict": _PREDICT,
+        "trainingjob": _TRAININGJOB,
+        "instance": _PREDICT + ".instance_v1beta1.types",
+        "params": _PREDICT + ".params_v1beta1.types",
+        "prediction": _PREDICT + ".prediction_v1beta1.types",
+        "definition": _TRAININGJOB + ".definition_v1beta1.types",
+    },
+)
+
+
+def __getattr__(name):
+    if name == "enhanced_types_packages":
+        # Kept for code that relied on the module-level list.
+        value = globals()[name] = [
+            _getattr(package)
+            for package in ("instance", "params", "prediction", "definition")
+        ]
+        return value
+    return _getattr(name)
+
 
-for pkg in enhanced_types_packages:
-    _decorators._add_methods_to_classes_in_package(pkg)
+if not _lazy._HAS_MODULE_GETATTR:  # pragma: NO COVER
+    __getattr__("enhanced_types_packages")
@@ -1,3 +1,30 @@
-from google.cloud.aiplatform.helpers import value_converter
+from google.cloud.aiplatform.helpers import _lazy
 
-__all__ = (value_converter,)
+# Helpers are imported on first access: several of them pull in optional
+# dependencies such as numpy, and the enhanced schema types only need
+# value_converter.
+__all__ = (
+    "batching",
+    "caching",
+    "channel_pool",
+    "client_pool",
+    "columnar",
+    "fan_out",
+    "hedging",
+    "images",
+    "predictor",
+    "prefetch",
+    "raw",
+    "resource_names",
+    "schemata",
+    "segmentation",
+    "splitting",
+    "streaming",
+    "tabular",
+    "value_converter",
+    "views",
+)
+
+__getattr__, __dir__ = _lazy.attach(
+    globals(), {name: "{}.{}".format(__name__, name) for name in __all__}
+)
@@ -51,20 +51,48 @@ def _add_methods_to_classes_in_package(pkg):
         setattr(cls, "from_map", _add_from_map_to_class(cls))
         cls.from_map.__doc__ = value_converter.from_map.__doc__
 
+        # Add the bulk to_values(), from_values() and columns_to_values()
+        for name, method in _add_bulk_methods_to_class(cls):
+            setattr(cls, name, method)
+            method.__doc__ = getattr(value_converter, name).__doc__
+
 
 def _add_from_value_to_class(cls):
+    converter = value_converter._get_converter(cls)
+
     def _from_value(value):
-        return value_converter.from_value(cls, value)
+        return converter.from_value(value)
 
     return _from_value
 
 
 def _add_from_map_to_class(cls):
+    converter = value_converter._get_converter(cls)
+
     def _from_map(map_):
-        return value_converter.from_map(cls, map_)
+        return converter.from_map(map_)
 
     return _from_map
 
 
+def _add_bulk_methods_to_class(cls):
+    converter = value_converter._get_converter(cls)
+
+    def _to_values(messages):
+        return converter.to_values(messages)
+
+    def _from_values(values):
+        return converter.from_values(values)
+
+    def _columns_to_values(columns):
+        return converter.columns_to_values(columns)
+
+    return (
+        ("to_values", _to_values),
+        ("from_values", _from_values),
+        ("columns_to_values", _columns_to_values),
+    )
+
+
 marshal = Marshal(name="google.cloud.aiplatform.v1beta1")
 marshal.register(Value, ConversionValueRule(marshal=marshal))
@@ -0,0 +1,67 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import absolute_import
+import importlib
+import sys
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+# Module __getattr__ and __dir__ (PEP 562) need Python 3.7.
+_HAS_MODULE_GETATTR = sys.version_info >= (3, 7)
+
+
+def attach(
+    namespace: Dict[str, Any],
+    submodules: Mapping[str, str],
+    on_load: Optional[Callable[[str, Any], None]] = None,
+    attributes: Optional[Mapping[str, str]] = None,
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """Returns a module ``__getattr__`` and ``__dir__`` loading submodules lazily.
+
+    Each name in ``submodules`` is imported on first access and then
+    stored in ``namespace``, so later accesses are plain lookups. On
+    Python 3.6 every submodule is imported right away instead.
+
+    Args:
+        namespace: The ``globals()`` of the module.
+        submodules: Maps attribute names to the modules they load.
+        on_load: Called with the name and module after each import.
+        attributes: Maps attribute names to the modules they are read
+            from, for names re-exported from another module.
+    """
+    module_name = namespace["__name__"]
+    attributes = attributes or {}
+
+    def __getattr__(name: str) -> Any:
+        if name in attributes:
+            value = getattr(importlib.import_module(attributes[name]), name)
+            namespace[name] = value
+            return value
+        target = submodules.get(name)
+        if target is None:
+            raise AttributeError(
+                "module {!r} has no attribute {!r}".format(module_name, name)
+            )
+        module = importlib.import_module(target)
+        if on_load is not None:
+            on_load(name, module)
+        namespace[name] = module
+        return module
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(submodules) | set(attributes))
+
+    if not _HAS_MODULE_GETATTR:  # pragma: NO COVER
+        for name in list(submodules) + list(attributes):
+            __getattr__(name)
+    return __getattr__, __dir__
@@ -0,0 +1,267 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import absolute_import
+import asyncio
+import collections
+from concurrent import futures
+import threading
+import time
+from typing import Any, Deque, List, Optional, Sequence, Tuple
+
+from google.api_core import gapic_v1  # type: ignore
+from google.api_core import retry as retries  # type: ignore
+from google.cloud.aiplatform.helpers.value_converter import _as_value
+from google.protobuf.struct_pb2 import Value
+
+
+class _Batch:
+    """Instances and the futures waiting on them for one ``PredictRequest``."""
+
+    __slots__ = ("instances", "futures", "byte_size", "deadline")
+
+    def __init__(self, deadline: float):
+        self.instances: List[Value] = []
+        self.futures: List[futures.Future] = []
+        self.byte_size = 0
+        self.deadline = deadline
+
+
+class BatchingPredictor:
+    """Gathers concurrent single-instance predictions into batched requests.
+
+    Each call to :meth:`submit` adds one instance to the open batch and
+    returns a future for its prediction. The batch is sent as a single
+    ``PredictRequest`` once it holds ``max_instances`` instances, once its
+    serialized instances reach ``max_bytes``, or ``linger`` seconds after
+    its first instance arrived, whichever happens first. The predictions of
+    the response are handed back to each caller in order.
+
+    The predictor is safe to use from several threads and from asyncio
+    coroutines (see :meth:`predict_async`).
+
+    Args:
+        client: A ``PredictionServiceClient`` (any API version).
+        endpoint (str): The name of the Endpoint serving the predictions.
+        parameters (Optional[google.protobuf.struct_pb2.Value]): The
+            parameters sent with every batched request.
+        max_instances (int): Maximum number of instances per request.
+        max_bytes (int): Maximum serialized size of the instances of one
+            request. A single instance larger than this is sent on its own.
+        linger (float): Maximum number of seconds an instance waits for
+            others to join its batch.
+        max_concurrent_requests (int): Maximum number of batched requests
+            in flight at once.
+        retry (google.api_core.retry.Retry): Designation of what errors, if
+            any, should be retried for each batched request.
+        timeout (float): The timeout for each batched request.
+        metadata (Sequence[Tuple[str, str]]): Strings which should be sent
+            along with each batched request as metadata.
+    """
+
+    def __init__(
+        self,
+        client,
+        endpoint: str,
+        parameters: Optional[Value] = None,
+        *,
+        max_instances: int = 64,
+        max_bytes: int = 1024 * 1024,
+        linger: float = 0.005,
+        max_concurrent_requests: int = 4,
+        retry: retries.Retry = gapic_v1.method.DEFAULT,
+        timeout: float = None,
+        metadata: Sequence[Tuple[str, str]] = (),
+    ):
+        if max_instances < 1:
+            raise ValueError("max_instances must be at least 1.")
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1.")
+        if linger < 0:
+            raise ValueError("linger must not be negative.")
+
+        self._client = client
+        self._endpoint = endpoint
+        self._parameters = parameters
+        self._max_instances = max_instances
+        self._max_bytes = max_bytes
+        self._linger = linger
+        self._retry = retry
+        self._timeout = timeout
+        self._metadata = tuple(metadata)
+
+        self._cond = threading.Condition()
+        self._open: Optional[_Batch] = None
+        self._sealed: Deque[_Batch] = collections.deque()
+        self._closed = False
+        self._executor = futures.ThreadPoolExecutor(
+            max_workers=max_concurrent_requests, thread_name_prefix="BatchingPredictor",
+        )
+        self._dispatcher = threading.Thread(
+            target=self._dispatch_loop, name="BatchingPredictor-dispatch", daemon=True
+        )
+        self._dispatcher.start()
+
+    def submit(self, instance: Any) -> futures.Future:
+        """Queues one instance for prediction.
+
+        Args:
+            instance: a :class:`~google.protobuf.struct_pb2.Value` or an
+                enhanced schema type instance.
+
+        Returns:
+            A :class:`concurrent.futures.Future` resolving to the prediction
+            for ``instance``.
+
+        Raises:
+            RuntimeError: If the predictor has been closed.
+        """
+        value = _as_value(instance)
+        size = value.ByteSize()
+        future = futures.Future()
+
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Cannot submit to a closed BatchingPredictor.")
+
+            batch = self._open
+            if batch is not None and batch.byte_size + size > self._max_bytes:
+                self._seal()
+                batch = None
+            if batch is None:
+                batch = self._open = _Batch(time.monotonic() + self._linger)
+
+            batch.instances.append(value)
+            batch.futures.append(future)
+            batch.byte_size += size
+
+            if (
+                len(batch.instances) >= self._max_instances
+                or batch.byte_size >= self._max_bytes
+            ):
+                self._seal()
+            self._cond.notify()
+
+        return future
+
+    def predict(self, instance: Any, timeout: Optional[float] = None) -> Any:
+        """Predicts a single instance, blocking until its batch returns.
+
+        Args:
+            instance: a :class:`~google.protobuf.struct_pb2.Value` or an
+                enhanced schema type instance.
+            timeout: Maximum number of seconds to wait for the prediction.
+
+        Returns:
+            The prediction for ``instance``.
+        """
+        return self.submit(instance).result(timeout=timeout)
+
+    async def predict_async(self, instance: Any) -> Any:
+        """Predicts a single instance from a coroutine.
+
+        Args:
+            instance: a :class:`~google.protobuf.struct_pb2.Value` or an
+                enhanced schema type instance.
+
+        Returns:
+            The prediction for ``instance``.
+        """
+        return await asyncio.wrap_future(self.submit(instance))
+
+    def flush(self) -> None:
+        """Sends the open batch without waiting for its linger deadline."""
+        with self._cond:
+            self._seal()
+            self._cond.notify()
+
+    def close(self) -> None:
+        """Sends any queued instances and waits for all requests to finish.
+
+        Instances submitted after this call raise :class:`RuntimeError`.
+        """
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._seal()
+            self._cond.notify()
+        self._dispatcher.join()
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "BatchingPredictor":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _seal(self) -> None:
+        # Must be called with self._cond held.
+        if self._open is not None:
+            self._sealed.append(self._open)
+            self._open = None
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._sealed:
+                    if self._open is not None:
+                        remaining = self._open.deadline - time.monotonic()
+                        if remaining <= 0:
+                            self._seal()
+                            break
+                        self._cond.wait(remaining)
+                    elif self._closed:
+                        return
+                    else:
+                        self._cond.wait()
+                batch = self._sealed.popleft()
+            self._executor.submit(self._send, batch)
+
+    def _send(self, batch: _Batch) -> None:
+        # Instances whose callers already cancelled are not sent.
+        live = [
+            (instance, future)
+            for instance, future in zip(batch.instances, batch.futures)
+            if future.set_running_or_notify_cancel()
+        ]
+        if not live:
+            return
+        instances, pending = zip(*live)
+
+        try:
+            response = self._client.predict(
+                endpoint=self._endpoint,
+                instances=instances,
+                parameters=self._parameters,
+                retry=self._retry,
+                timeout=self._timeout,
+                metadata=self._metadata,
+            )
+            predictions = list(response.predictions)
+            if len(predictions) != len(pending):
+                raise ValueError(
+                    "Expected {} predictions, got {}.".format(
+                        len(pending), len(predictions)
+                    )
+                )
+        except Exception as exc:
+            for future in pending:
+                future.set_exception(exc)
+            return
+
+        for future, prediction in zip(pending, predictions):
+            future.set_result(prediction)
+
+
+__all__ = ("BatchingPredictor",)
@@ -0,0 +1,411 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import absolute_import
+import collections
+import hashlib
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from google.api_core import gapic_v1  # type: ignore
+from google.api_core import retry as retries  # type: ignore
+from google.cloud.aiplatform.helpers.value_converter import _as_value
+from google.protobuf.struct_pb2 import Value
+
+
+def _digest(*messages) -> bytes:
+    """Returns a canonical hash of the deterministic encoding of ``messages``."""
+    digest = hashlib.blake2b(digest_size=16)
+    for message in messages:
+        if message is None:
+            digest.update(b"\x00")
+        else:
+            digest.update(b"\x01")
+            digest.update(message.SerializeToString(deterministic=True))
+    return digest.digest()
+
+
+def _request_digest(fields: Dict[str, Any]) -> bytes:
+    """Returns a canonical hash of the fields of a request but its instances.
+
+    Unset fields, as ``None`` or empty strings, are skipped, so a request
+    object and the same request passed as flattened fields hash alike.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for name in sorted(fields):
+        value = fields[name]
+        if name in ("endpoint", "instances") or value is None or value == "":
+            continue
+        if isinstance(value, str):
+            data = value.encode("utf-8")
+        else:
+            data = value.SerializeToString(deterministic=True)
+        digest.update(name.encode("utf-8"))
+        digest.update(len(data).to_bytes(8, "little"))
+        digest.update(data)
+    return digest.digest()
+
+
+def _copy(payload: tuple) -> tuple:
+    """Returns a deep copy of a tuple of messages."""
+    copies = []
+    for message in payload:
+        copy = type(message)()
+        copy.CopyFrom(message)
+        copies.append(copy)
+    return tuple(copies)
+
+
+class _Entry:
+    __slots__ = ("payload", "size", "expires", "generation")
+
+    def __init__(self, payload, size: int, expires: float, generation: int):
+        self.payload = payload
+        self.size = size
+        self.expires = expires
+        self.generation = generation
+
+
+class PredictionCache:
+    """A thread-safe LRU cache of per-instance prediction results.
+
+    Entries expire ``ttl`` seconds after they are stored, and the least
+    recently used entries are evicted once the cache holds more than
+    ``max_entries`` entries or ``max_bytes`` bytes of serialized results.
+
+    Every endpoint remembers the ``deployed_model_id`` of its last
+    response. When a response reports a different model, all entries
+    stored for that endpoint become stale.
+
+    Args:
+        max_entries (int): Maximum number of cached instances.
+        max_bytes (int): Maximum total serialized size of cached results.
+        ttl (float): Number of seconds an entry stays valid.
+        clock (Callable[[], float]): Monotonic time source, in seconds.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = (
+            collections.OrderedDict()
+        )  # type: collections.OrderedDict[Hashable, _Entry]
+        self._bytes = 0
+        self._models = {}  # type: Dict[str, Tuple[str, int]]
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def byte_size(self) -> int:
+        """The total serialized size of the cached results."""
+        return self._bytes
+
+    def deployed_model_id(self, endpoint: str) -> Optional[str]:
+        """Returns the last ``deployed_model_id`` seen for ``endpoint``."""
+        with self._lock:
+            model = self._models.get(endpoint)
+        return model[0] if model else None
+
+    def observe(self, endpoint: str, deployed_model_id: str) -> None:
+        """Records the model that served ``endpoint``'s latest response."""
+        with self._lock:
+            model = self._models.get(endpoint)
+            if model is None:
+                self._models[endpoint] = (deployed_model_id, 0)
+            elif model[0] != deployed_model_id:
+                self._models[endpoint] = (deployed_model_id, model[1] + 1)
+
+    def generation(self, endpoint: str) -> int:
+        """Returns how many times ``endpoint``'s model has changed."""
+        with self._lock:
+            model = self._models.get(endpoint)
+        return model[1] if model else 0
+
+    def get(self, endpoint: str, key: Hashable) -> Any:
+        """Returns a copy of the cached result for ``key``, or ``None``."""
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                model = self._models.get(endpoint)
+                generation = model[1] if model else 0
+                if entry.expires > now and entry.generation == generation:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    payload = entry.payload
+                else:
+                    self._remove(key)
+                    entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+        # Stored messages are never handed out, so callers cannot alter them.
+        return _copy(payload)
+
+    def put(
+        self,
+        endpoint: str,
+        key: Hashable,
+        payload: Any,
+        size: int,
+        generation: Optional[int] = None,
+    ) -> None:
+        """Stores a copy of ``payload`` for ``key``, evicting old entries.
+
+        Args:
+            endpoint (str): The endpoint that served ``payload``.
+            key (Hashable): The cache key.
+            payload (Tuple[google.protobuf.message.Message, ...]): The
+                messages to cache.
+            size (int): The serialized size of ``payload``.
+            generation (Optional[int]): The :meth:`generation` of
+                ``endpoint`` before the request was sent. If its model has
+                changed since, ``payload`` may be stale and is not stored.
+        """
+        if size > self._max_bytes:
+            return
+        payload = _copy(payload)
+        expires = self._clock() + self._ttl
+        with self._lock:
+            model = self._models.get(endpoint)
+            current = model[1] if model else 0
+            if generation is not None and generation != current:
+                return
+            generation = current
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _Entry(payload, size, expires, generation)
+            self._bytes += size
+            while (
+                len(self._entries) > self._max_entries or self._bytes > self._max_bytes
+            ):
+                self._remove(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        """Drops every entry."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, key: Hashable) -> None:
+        # Must be called with self._lock held.
+        self._bytes -= self._entries.pop(key).size
+
+
+class CachingPredictionClient:
+    """Serves repeated instances of ``predict``/``explain`` from a cache.
+
+    Each instance is looked up on its own, keyed by the endpoint, a hash of
+    the instance and a hash of the rest of the request. Only the instances
+    that miss are sent to the server; the response is stitched back
+    together in input order. Every other attribute is delegated to the
+    wrapped client.
+
+    Endpoints that split traffic between several DeployedModels report a
+    different ``deployed_model_id`` from call to call, which invalidates
+    their cached results each time; caching is only useful for endpoints
+    serving a single model.
+
+    Args:
+        client: A ``PredictionServiceClient`` (any API version).
+        cache (Optional[PredictionCache]): The cache to use. Several
+            clients may share one cache.
+    """
+
+    def __init__(self, client, cache: Optional[PredictionCache] = None):
+        self._client = client
+        self._cache = cache if cache is not None else PredictionCache()
+        self._response_types = {}  # type: Dict[str, type]
+
+    @property
+    def cache(self) -> PredictionCache:
+        """The cache backing this client."""
+        return self._cache
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+    def predict(
+        self,
+        request=None,
+        *,
+        endpoint: str = None,
+        instances: Sequence[Value] = None,
+        parameters: Value = None,
+        retry: retries.Retry = gapic_v1.method.DEFAULT,
+        timeout: float = None,
+        metadata: Sequence[Tuple[str, str]] = (),
+    ):
+        """Performs an online prediction, answering cached instances locally.
+
+        Takes the same arguments as ``PredictionServiceClient.predict``.
+        """
+        return self._call(
+            "predict",
+            request,
+            {"endpoint": endpoint, "instances": instances, "parameters": parameters},
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+    def explain(
+        self,
+        request=None,
+        *,
+        endpoint: str = None,
+        instances: Sequence[Value] = None,
+        parameters: Value = None,
+        deployed_model_id: str = None,
+        retry: retries.Retry = gapic_v1.method.DEFAULT,
+        timeout: float = None,
+        metadata: Sequence[Tuple[str, str]] = (),
+    ):
+        """Performs an online explanation, answering cached instances locally.
+
+        Takes the same arguments as ``PredictionServiceClient.explain``.
+        """
+        return self._call(
+            "explain",
+            request,
+            {
+                "endpoint": endpoint,
+                "instances": instances,
+                "parameters": parameters,
+                "deployed_model_id": deployed_model_id,
+            },
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+    def _call(self, method: str, request, fields: Dict[str, Any], **kwargs):
+        send = getattr(self._client, method)
+        if request is not None:
+            if any(value is not None for value in fields.values()):
+                raise ValueError(
+                    "If the `request` argument is set, then none of "
+                    "the individual field arguments should be set."
+                )
+            pb = getattr(request, "_pb", None)
+            if pb is None:
+                # Not a proto-plus request (e.g. a dict); pass it through.
+                return send(request, **kwargs)
+            endpoint = pb.endpoint
+            instances = list(pb.instances)
+            # Everything but the instances identifies the rest of the request.
+            template = type(pb)()
+            template.CopyFrom(pb)
+            template.ClearField("instances")
+            request_digest = _request_digest(
+                {field.name: value for field, value in template.ListFields()}
+            )
+        else:
+            endpoint = fields["endpoint"]
+            instances = [_as_value(instance) for instance in fields["instances"] or ()]
+            parameters = fields["parameters"]
+            request_digest = _request_digest(
+                dict(
+                    fields,
+                    parameters=None if parameters is None else _as_value(parameters),
+                )
+            )
+
+        keys = [
+            (method, endpoint, request_digest, _digest(instance))
+            for instance in instances
+        ]
+        # A model change observed while the request is in flight makes its
+        # response unsafe to cache.
+        generation = self._cache.generation(endpoint)
+        cached = [self._cache.get(endpoint, key) for key in keys]
+        missing = [i for i, payload in enumerate(cached) if payload is None]
+
+        if not missing:
+            response_type = self._response_types.get(method)
+            if response_type is not None and instances:
+                return self._assemble(
+                    method,
+                    response_type(),
+                    self._cache.deployed_model_id(endpoint) or "",
+                    cached,
+                )
+            missing = list(range(len(instances)))
+
+        missing_instances = [instances[i] for i in missing]
+        if request is not None:
+            partial = type(request)()
+            partial._pb.CopyFrom(template)
+            partial._pb.instances.extend(missing_instances)
+            response = send(request=partial, **kwargs)
+        else:
+            partial_fields = dict(fields, instances=missing_instances)
+            response = send(**partial_fields, **kwargs)
+
+        self._response_types[method] = type(response)
+        self._cache.observe(endpoint, response.deployed_model_id)
+        payloads = self._payloads(method, response, len(missing))
+        if payloads is None:
+            # The response cannot be split per instance; do not cache it.
+            return response
+        for i, payload in zip(missing, payloads):
+            cached[i] = payload
+            size = sum(part.ByteSize() for part in payload)
+            self._cache.put(endpoint, keys[i], payload, size, generation)
+
+        if len(missing) == len(instances):
+            return response
+        return self._assemble(
+            method, type(response)(), response.deployed_model_id, cached
+        )
+
+    @staticmethod
+    def _payloads(method: str, response, count: int) -> Optional[List[tuple]]:
+        pb = response._pb
+        predictions = list(pb.predictions)
+        if len(predictions) != count:
+            return None
+        if method == "predict":
+            return [(prediction,) for prediction in predictions]
+        explanations = list(pb.explanations)
+        if len(explanations) != count:
+            return None
+        return list(zip(predictions, explanations))
+
+    @staticmethod
+    def _assemble(method: str, response, deployed_model_id: str, payloads):
+        pb = response._pb
+        pb.deployed_model_id = deployed_model_id
+        pb.predictions.extend([payload[0] for payload in payloads])
+        if method == "explain":
+            pb.explanations.extend([payload[1] for payload in payloads])
+        return response
+
+
+__all__ = (
+    "CachingPredictionClient",
+    "PredictionCache",
+)
@@ -0,0 +1,495 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import absolute_import
+import threading
+import time
+from typing import Callable, List, Optional, Sequence
+
+from google import auth  # type: ignore
+from google.api_core import gapic_v1  # type: ignore
+from google.auth import credentials as auth_credentials  # type: ignore
+
+import grpc  # type: ignore
+from grpc.experimental import aio  # type: ignore
+
+ROUND_ROBIN = "round_robin"
+LEAST_OUTSTANDING = "least_outstanding"
+
+# Errors that say the connection, rather than the request, is at fault.
+_UNHEALTHY_CODES = frozenset([grpc.StatusCode.UNAVAILABLE])
+# The options the generated transports give their channels.
+_CHANNEL_OPTIONS = (
+    ("grpc.max_send_message_length", -1),
+    ("grpc.max_receive_message_length", -1),
+)
+
+
+class _ChannelState:
+    __slots__ = ("outstanding", "failures", "unhealthy_until")
+
+    def __init__(self):
+        self.outstanding = 0
+        self.failures = 0
+        self.unhealthy_until = 0.0
+
+
+class _Balancer:
+    """Chooses a channel for each call and tracks the health of each channel.
+
+    A channel that fails with ``UNAVAILABLE`` is skipped for a cooldown
+    that doubles with each consecutive failure, up to ``max_cooldown``
+    seconds. If every channel is cooling down, the one that recovers
+    first is used.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        selection: str,
+        cooldown: float,
+        max_cooldown: float,
+        clock: Callable[[], float],
+    ):
+        if selection not in (ROUND_ROBIN, LEAST_OUTSTANDING):
+            raise ValueError(
+                "selection must be {!r} or {!r}.".format(ROUND_ROBIN, LEAST_OUTSTANDING)
+            )
+        self._states = [_ChannelState() for _ in range(size)]
+        self._least_outstanding = selection == LEAST_OUTSTANDING
+        self._cooldown = cooldown
+        self._max_cooldown = max_cooldown
+        self._clock = clock
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> int:
+        now = self._clock()
+        with self._lock:
+            states = self._states
+            count = len(states)
+            start = self._next
+            self._next = (start + 1) % count
+            best = None
+            for offset in range(count):
+                index = (start + offset) % count
+                state = states[index]
+                if state.unhealthy_until > now:
+                    continue
+                if not self._least_outstanding:
+                    best = index
+                    break
+                if best is None or state.outstanding < states[best].outstanding:
+                    best = index
+            if best is None:
+                best = min(range(count), key=lambda i: states[i].unhealthy_until)
+            states[best].outstanding += 1
+            return best
+
+    def release(self, index: int, code: Optional[grpc.StatusCode]) -> None:
+        """Ends a call on channel ``index``.
+
+        ``code`` is the status of the call, or ``None`` if it has none (the
+        call was cancelled, or only a streaming stub was created), which
+        leaves the health of the channel as it is.
+        """
+        with self._lock:
+            state = self._states[index]
+            state.outstanding -= 1
+            if code in _UNHEALTHY_CODES:
+                state.failures += 1
+                cooldown = self._cooldown * 2 ** (state.failures - 1)
+                state.unhealthy_until = self._clock() + min(
+                    cooldown, self._max_cooldown
+                )
+            elif code == grpc.StatusCode.OK:
+                state.failures = 0
+                state.unhealthy_until = 0.0
+
+    def healthy(self) -> List[bool]:
+        now = self._clock()
+        with self._lock:
+            return [state.unhealthy_until <= now for state in self._states]
+
+    def outstanding(self) -> List[int]:
+        with self._lock:
+            return [state.outstanding for state in self._states]
+
+
+def _code(error: Exception) -> Optional[grpc.StatusCode]:
+    code = getattr(error, "code", None)
+    return code() if callable(code) else grpc.StatusCode.UNKNOWN
+
+
+class _PooledUnaryUnary(grpc.UnaryUnaryMultiCallable):
+    def __init__(self, balancer: _Balancer, callables: Sequence):
+        self._balancer = balancer
+        self._callables = callables
+
+    def _invoke(self, attr: str, request, kwargs):
+        index = self._balancer.acquire()
+        code = None
+        try:
+            result = getattr(self._callables[index], attr)(request, **kwargs)
+            code = grpc.StatusCode.OK
+            return result
+        except grpc.RpcError as exc:
+            code = _code(exc)
+            raise
+        finally:
+            self._balancer.release(index, code)
+
+    def __call__(self, request, **kwargs):
+        return self._invoke("__call__", request, kwargs)
+
+    def with_call(self, request, **kwargs):
+        return self._invoke("with_call", request, kwargs)
+
+    def future(self, request, **kwargs):
+        balancer = self._balancer
+        index = balancer.acquire()
+        try:
+            future = self._callables[index].future(request, **kwargs)
+        except grpc.RpcError as exc:
+            balancer.release(index, _code(exc))
+            raise
+
+        def done(call):
+            balancer.release(index, call.code())
+
+        future.add_done_callback(done)
+        return future
+
+
+class ChannelPool(grpc.Channel):
+    """A ``grpc.Channel`` spreading calls over several channels to one host.
+
+    Every unary-unary call (which covers ``Predict`` and ``Explain``) goes
+    to the channel chosen by ``selection``: ``"round_robin"`` rotates
+    through the channels, and ``"least_outstanding"`` picks the one with
+    the fewest calls in flight. Channels failing with ``UNAVAILABLE`` are
+    avoided for a while. Streaming stubs are bound to one channel, picked
+    round-robin, when they are created.
+
+    Pass the pool as the ``channel`` of any gRPC transport, or build one
+    with :func:`pooled_transport`.
+
+    Args:
+        channels (Sequence[grpc.Channel]): The channels to pool.
+        selection (str): ``"round_robin"`` or ``"least_outstanding"``.
+        cooldown (float): Seconds an unhealthy channel is first avoided.
+        max_cooldown (float): Upper bound of the cooldown.
+    """
+
+    def __init__(
+        self,
+        channels: Sequence[grpc.Channel],
+        selection: str = ROUND_ROBIN,
+        cooldown: float = 1.0,
+        max_cooldown: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not channels:
+            raise ValueError("At least one channel is required.")
+        self._channels = list(channels)
+        self._balancer = _Balancer(
+            len(self._channels), selection, cooldown, max_cooldown, clock
+        )
+
+    @property
+    def channels(self) -> List[grpc.Channel]:
+        """The pooled channels."""
+        return list(self._channels)
+
+    def healthy(self) -> List[bool]:
+        """Returns whether each channel is currently considered healthy."""
+        return self._balancer.healthy()
+
+    def outstanding(self) -> List[int]:
+        """Returns the number of calls in flight on each channel."""
+        return self._balancer.outstanding()
+
+    def unary_unary(
+        self, method, request_serializer=None, response_deserializer=None, **kwargs
+    ):
+        return _PooledUnaryUnary(
+            self._balancer,
+            [
+                channel.unary_unary(
+                    method, request_serializer, response_deserializer, **kwargs
+                )
+                for channel in self._channels
+            ],
+        )
+
+    def _sticky(self) -> grpc.Channel:
+        index = self._balancer.acquire()
+        self._balancer.release(index, None)
+        return self._channels[index]
+
+    def unary_stream(self, method, *args, **kwargs):
+        return self._sticky().unary_stream(method, *args, **kwargs)
+
+    def stream_unary(self, method, *args, **kwargs):
+        return self._sticky().stream_unary(method, *args, **kwargs)
+
+    def stream_stream(self, method, *args, **kwargs):
+        return self._sticky().stream_stream(method, *args, **kwargs)
+
+    def subscribe(self, callback, try_to_connect=False):
+        for channel in self._channels:
+            channel.subscribe(callback, try_to_connect=try_to_connect)
+
+    def unsubscribe(self, callback):
+        for channel in self._channels:
+            channel.unsubscribe(callback)
+
+    def close(self):
+        for channel in self._channels:
+            channel.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+
+class _TrackedCall:
+    """Proxies an ``aio.UnaryUnaryCall``, reporting its outcome when awaited."""
+
+    def __init__(self, call, balancer: _Balancer, index: int):
+        self._call = call
+        self._balancer = balancer
+        self._index = index
+
+    def __getattr__(self, name):
+        return getattr(self._call, name)
+
+    def __await__(self):
+        code = None
+        try:
+            response = yield from self._call.__await__()
+            code = grpc.StatusCode.OK
+        except grpc.RpcError as exc:
+            code = _code(exc)
+            raise
+        finally:
+            self._balancer.release(self._index, code)
+        return response
+
+
+class _PooledAsyncUnaryUnary(aio.UnaryUnaryMultiCallable):
+    def __init__(self, balancer: _Balancer, callables: Sequence):
+        self._balancer = balancer
+        self._callables = callables
+
+    def __call__(self, request, **kwargs):
+        index = self._balancer.acquire()
+        try:
+            call = self._callables[index](request, **kwargs)
+        except BaseException:
+            self._balancer.release(index, None)
+            raise
+        return _TrackedCall(call, self._balancer, index)
+
+
+class AsyncChannelPool(aio.Channel):
+    """The ``grpc.aio`` counterpart of :class:`ChannelPool`.
+
+    Calls are counted as outstanding until they are awaited, which the
+    generated async clients always do.
+
+    Args:
+        channels (Sequence[grpc.aio.Channel]): The channels to pool.
+        selection (str): ``"round_robin"`` or ``"least_outstanding"``.
+        cooldown (float): Seconds an unhealthy channel is first avoided.
+        max_cooldown (float): Upper bound of the cooldown.
+    """
+
+    def __init__(
+        self,
+        channels: Sequence[aio.Channel],
+        selection: str = ROUND_ROBIN,
+        cooldown: float = 1.0,
+        max_cooldown: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not channels:
+            raise ValueError("At least one channel is required.")
+        self._channels = list(channels)
+        self._balancer = _Balancer(
+            len(self._channels), selection, cooldown, max_cooldown, clock
+        )
+
+    @property
+    def channels(self) -> List[aio.Channel]:
+        """The pooled channels."""
+        return list(self._channels)
+
+    def healthy(self) -> List[bool]:
+        """Returns whether each channel is currently considered healthy."""
+        return self._balancer.healthy()
+
+    def outstanding(self) -> List[int]:
+        """Returns the number of calls in flight on each channel."""
+        return self._balancer.outstanding()
+
+    def unary_unary(
+        self, method, request_serializer=None, response_deserializer=None, **kwargs
+    ):
+        return _PooledAsyncUnaryUnary(
+            self._balancer,
+            [
+                channel.unary_unary(
+                    method, request_serializer, response_deserializer, **kwargs
+                )
+                for channel in self._channels
+            ],
+        )
+
+    def _sticky(self) -> aio.Channel:
+        index = self._balancer.acquire()
+        self._balancer.release(index, None)
+        return self._channels[index]
+
+    def unary_stream(self, method, *args, **kwargs):
+        return self._sticky().unary_stream(method, *args, **kwargs)
+
+    def stream_unary(self, method, *args, **kwargs):
+        return self._sticky().stream_unary(method, *args, **kwargs)
+
+    def stream_stream(self, method, *args, **kwargs):
+        return self._sticky().stream_stream(method, *args, **kwargs)
+
+    def get_state(self, try_to_connect: bool = False):
+        """Returns ``READY`` if any pooled channel is ready."""
+        states = [channel.get_state(try_to_connect) for channel in self._channels]
+        if grpc.ChannelConnectivity.READY in states:
+            return grpc.ChannelConnectivity.READY
+        return states[0]
+
+    async def wait_for_state_change(self, last_observed_state):
+        await self._channels[0].wait_for_state_change(last_observed_state)
+
+    async def channel_ready(self):
+        for channel in self._channels:
+            await channel.channel_ready()
+
+    async def close(self, grace: Optional[float] = None):
+        for channel in self._channels:
+            await channel.close(grace)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+
+def pooled_transport(
+    transport_class,
+    *,
+    pool_size: int = 4,
+    selection: str = ROUND_ROBIN,
+    host: str = "aiplatform.googleapis.com",
+    credentials: auth_credentials.Credentials = None,
+    scopes: Optional[Sequence[str]] = None,
+    quota_project_id: Optional[str] = None,
+    client_info: gapic_v1.client_info.ClientInfo = None,
+    **channel_kwargs,
+):
+    """Creates a gRPC transport whose calls are spread over ``pool_size`` channels.
+
+    Each channel gets its own subchannel pool, so it opens its own HTTP/2
+    connection instead of sharing one with the others. The credentials
+    are resolved once and shared by every channel.
+
+    Example::
+
+        transport = pooled_transport(
+            PredictionServiceGrpcTransport,
+            host="us-central1-prediction-aiplatform.googleapis.com",
+            pool_size=8,
+            selection="least_outstanding",
+        )
+        client = PredictionServiceClient(transport=transport)
+
+    Args:
+        transport_class: A gRPC transport class, sync or ``grpc_asyncio``,
+            of any service and API version, e.g.
+            ``PredictionServiceGrpcTransport`` or
+            ``PredictionServiceGrpcAsyncIOTransport``.
+        pool_size (int): Number of channels.
+        selection (str): ``"round_robin"`` or ``"least_outstanding"``.
+        host (str): The hostname to connect to.
+        credentials (google.auth.credentials.Credentials): The credentials
+            shared by all channels. Ascertained from the environment if not
+            set.
+        scopes (Optional[Sequence[str]]): The scopes for the default
+            credentials.
+        quota_project_id (Optional[str]): A project to use for billing and
+            quota.
+        client_info (google.api_core.gapic_v1.client_info.ClientInfo): The
+            client info sent with every request.
+        channel_kwargs: Passed to ``transport_class.create_channel`` for
+            each channel, e.g. ``ssl_credentials``.
+
+    Returns:
+        An instance of ``transport_class`` backed by a
+        :class:`ChannelPool` or :class:`AsyncChannelPool`.
+    """
+    if pool_size < 1:
+        raise ValueError("pool_size must be at least 1.")
+    host = host if ":" in host else host + ":443"
+    scopes = scopes or transport_class.AUTH_SCOPES
+    if credentials is None:
+        credentials, _ = auth.default(scopes=scopes, quota_project_id=quota_project_id)
+
+    channel = _create_pool(
+        transport_class,
+        host,
+        pool_size,
+        selection,
+        credentials=credentials,
+        scopes=scopes,
+        quota_project_id=quota_project_id,
+        **channel_kwargs,
+    )
+    kwargs = {} if client_info is None else {"client_info": client_info}
+    return transport_class(host=host, channel=channel, **kwargs)
+
+
+def _create_pool(transport_class, host, pool_size, selection, **channel_kwargs):
+    """Creates ``pool_size`` channels to ``host`` behind a channel pool."""
+    options = list(channel_kwargs.pop("options", ()))
+    options += _CHANNEL_OPTIONS
+    options.append(("grpc.use_local_subchannel_pool", 1))
+    channels = [
+        transport_class.create_channel(host, options=options, **channel_kwargs)
+        for _ in range(pool_size)
+    ]
+    pool_class = (
+        AsyncChannelPool if isinstance(channels[0], aio.Channel) else ChannelPool
+    )
+    return pool_class(channels, selection=selection)
+
+
+__all__ = (
+    "AsyncChannelPool",
+    "ChannelPool",
+    "LEAST_OUTSTANDING",
+    "ROUND_ROBIN",
+    "pooled_transport",
+)
@@ -0,0 +1,211 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import absolute_import
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from google import auth  # type: ignore
+from google.api_core import gapic_v1  # type: ignore
+from google.auth import credentials as auth_credentials  # type: ignore
+from google.cloud.aiplatform.helpers import channel_pool
+
+from grpc.experimental import aio  # type: ignore
+
+
+def _is_async(client_class) -> bool:
+    return client_class.__name__.endswith("AsyncClient")
+
+
+class ClientPool:
+    """Hands out clients that share channels and credentials.
+
+    Clients of any service and API version, sync or async, are built on
+    one gRPC channel per ``api_endpoint`` (one for sync clients and one
+    for async clients), and every channel uses the same credentials, so
+    they are resolved once rather than once per client. Clients are
+    cached, so asking twice for the same service and endpoint returns the
+    same client.
+
+    Example::
+
+        with ClientPool() as pool:
+            endpoint = "us-central1-aiplatform.googleapis.com"
+            jobs = pool.client(JobServiceClient, api_endpoint=endpoint)
+            models = pool.client(ModelServiceClient, api_endpoint=endpoint)
+            ...
+
+    Closing the pool closes its channels; clients handed out before then
+    can no longer make calls. :meth:`close` only closes the channels of
+    sync clients, use :meth:`aclose` or ``async with`` once async clients
+    have been handed out.
+
+    Args:
+        credentials (google.auth.credentials.Credentials): The credentials
+            shared by all clients. Ascertained from the environment on
+            first use if not set.
+        scopes (Optional[Sequence[str]]): The scopes for the default
+            credentials.
+        quota_project_id (Optional[str]): A project to use for billing and
+            quota.
+        client_info (google.api_core.gapic_v1.client_info.ClientInfo): The
+            client info sent with every request.
+        pool_size (int): Number of channels per ``api_endpoint``. With more
+            than one, calls are spread over a
+            :class:`~google.cloud.aiplatform.helpers.channel_pool.ChannelPool`.
+        selection (str): How a pool of channels picks one for each call,
+            ``"round_robin"`` or ``"least_outstanding"``.
+        channel_kwargs: Passed to ``create_channel`` of the transport for
+            each channel, e.g. ``ssl_credentials``.
+    """
+
+    def __init__(
+        self,
+        credentials: auth_credentials.Credentials = None,
+        *,
+        scopes: Optional[Sequence[str]] = None,
+        quota_project_id: Optional[str] = None,
+        client_info: gapic_v1.client_info.ClientInfo = None,
+        pool_size: int = 1,
+        selection: str = channel_pool.ROUND_ROBIN,
+        **channel_kwargs,
+    ):
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1.")
+        self._credentials = credentials
+        self._scopes = scopes
+        self._quota_project_id = quota_project_id
+        self._client_info = client_info
+        self._pool_size = pool_size
+        self._selection = selection
+        self._channel_kwargs = channel_kwargs
+
+        self._lock = threading.Lock()
+        self._channels: Dict[Tuple[str, bool], Any] = {}
+        self._clients: Dict[Tuple[type, str], Any] = {}
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        """Whether the pool has been closed."""
+        return self._closed
+
+    def client(self, client_class, *, api_endpoint: str = None, location: str = None):
+        """Returns a client of ``client_class`` using the shared channel.
+
+        Args:
+            client_class: A gRPC client class of any service and API
+                version, e.g. ``JobServiceClient`` or
+                ``PredictionServiceAsyncClient``.
+            api_endpoint (str): The endpoint to connect to. Defaults to the
+                client's ``DEFAULT_ENDPOINT``.
+            location (str): Shorthand for the regional endpoint
+                ``{location}-aiplatform.googleapis.com``.
+
+        Returns:
+            An instance of ``client_class``.
+
+        Raises:
+            RuntimeError: If the pool has been closed.
+            ValueError: If both ``api_endpoint`` and ``location`` are set.
+        """
+        if api_endpoint and location:
+            raise ValueError("api_endpoint and location are mutually exclusive.")
+        if location:
+            api_endpoint = "{}-aiplatform.googleapis.com".format(location)
+        host = api_endpoint or client_class.DEFAULT_ENDPOINT
+        host = host if ":" in host else host + ":443"
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Cannot get a client from a closed ClientPool.")
+            client = self._clients.get((client_class, host))
+            if client is None:
+                transport = self._transport(client_class, host)
+                client = self._clients[client_class, host] = client_class(
+                    transport=transport
+                )
+            return client
+
+    def _transport(self, client_class, host: str):
+        # Must be called with self._lock held.
+        is_async = _is_async(client_class)
+        transport_class = client_class.get_transport_class(
+            "grpc_asyncio" if is_async else "grpc"
+        )
+        channel = self._channels.get((host, is_async))
+        if channel is None:
+            channel = self._channels[host, is_async] = self._create_channel(
+                transport_class, host
+            )
+        kwargs = {} if self._client_info is None else {"client_info": self._client_info}
+        return transport_class(host=host, channel=channel, **kwargs)
+
+    def _create_channel(self, transport_class, host: str):
+        scopes = self._scopes or transport_class.AUTH_SCOPES
+        if self._credentials is None:
+            self._credentials, _ = auth.default(
+                scopes=scopes, quota_project_id=self._quota_project_id
+            )
+        kwargs = dict(
+            self._channel_kwargs,
+            credentials=self._credentials,
+            scopes=scopes,
+            quota_project_id=self._quota_project_id,
+        )
+        if self._pool_size > 1:
+            return channel_pool._create_pool(
+                transport_class, host, self._pool_size, self._selection, **kwargs
+            )
+        options = list(kwargs.pop("options", ()))
+        options += channel_pool._CHANNEL_OPTIONS
+        return transport_class.create_channel(host, options=options, **kwargs)
+
+    def _close(self, include_async: bool) -> List[Any]:
+        with self._lock:
+            self._closed = True
+            self._clients.clear()
+            keys = [key for key in self._channels if include_async or not key[1]]
+            return [self._channels.pop(key) for key in keys]
+
+    def close(self) -> None:
+        """Closes the channels of sync clients.
+
+        Clients can no longer be handed out afterwards. Channels of async
+        clients are left open; use :meth:`aclose` to close those too.
+        """
+        for channel in self._close(include_async=False):
+            channel.close()
+
+    async def aclose(self) -> None:
+        """Closes all channels, sync and async."""
+        for channel in self._close(include_async=True):
+            if isinstance(channel, aio.Channel):
+                await channel.close()
+            else:
+                channel.close()
+
+    def __enter__(self) -> "ClientPool":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    async def __aenter__(self) -> "ClientPool":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.aclose()
+
+
+__all__ = ("ClientPool",)
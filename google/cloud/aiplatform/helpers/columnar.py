@@ -0,0 +1,389 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import absolute_import
+import functools
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from google.protobuf.descriptor import FieldDescriptor
+from google.protobuf.struct_pb2 import Value
+from proto.message import MessageMeta
+
+try:
+    import numpy as np
+except ImportError:  # pragma: NO COVER
+    np = None
+
+try:
+    import pyarrow
+except ImportError:  # pragma: NO COVER
+    pyarrow = None
+
+
+class DictionaryArray:
+    """A string column stored as integer codes into a list of distinct values.
+
+    Attributes:
+        codes (numpy.ndarray): ``int32`` index into ``categories`` per item.
+        categories (numpy.ndarray): The distinct strings, in order of first
+            appearance.
+    """
+
+    def __init__(self, codes, categories):
+        self.codes = codes
+        self.categories = categories
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, key):
+        return self.categories[self.codes[key]]
+
+    def to_numpy(self):
+        """Returns the decoded strings as an object array."""
+        return self.categories[self.codes]
+
+
+class RaggedArray:
+    """Variable-length rows stored as one flat array and row offsets.
+
+    Row ``i`` is ``values[offsets[i]:offsets[i + 1]]``.
+
+    Attributes:
+        values: The flat values of all rows, either a
+            :class:`numpy.ndarray` or a :class:`DictionaryArray`.
+        offsets (numpy.ndarray): ``int64`` row boundaries, one longer than
+            the number of rows.
+    """
+
+    def __init__(self, values, offsets):
+        self.values = values
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int):
+        return self.values[self.offsets[index] : self.offsets[index + 1]]
+
+
+class _FieldPlan(NamedTuple):
+    name: str
+    keys: Tuple[str, ...]
+    kind: str
+    repeated: bool
+
+
+_KINDS = {
+    FieldDescriptor.TYPE_STRING: "string",
+    FieldDescriptor.TYPE_BOOL: "bool",
+    FieldDescriptor.TYPE_FLOAT: "float32",
+    FieldDescriptor.TYPE_DOUBLE: "float64",
+    FieldDescriptor.TYPE_INT32: "int64",
+    FieldDescriptor.TYPE_INT64: "int64",
+    FieldDescriptor.TYPE_SINT32: "int64",
+    FieldDescriptor.TYPE_SINT64: "int64",
+    FieldDescriptor.TYPE_UINT32: "int64",
+    FieldDescriptor.TYPE_UINT64: "int64",
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _plan(cls: MessageMeta) -> Tuple[_FieldPlan, ...]:
+    """Returns the decodable scalar fields of a prediction result class."""
+    plan = []
+    for field in cls.pb().DESCRIPTOR.fields:
+        kind = _KINDS.get(field.type)
+        if kind is None:
+            continue
+        keys = (field.json_name, field.name)
+        if keys[0] == keys[1]:
+            keys = keys[:1]
+        # Newer protobuf releases deprecate FieldDescriptor.label.
+        repeated = getattr(field, "is_repeated", None)
+        if repeated is None:
+            repeated = field.label == FieldDescriptor.LABEL_REPEATED
+        plan.append(_FieldPlan(field.name, keys, kind, repeated))
+    return tuple(plan)
+
+
+def _predictions(predictions: Any) -> Iterable[Value]:
+    pb = getattr(predictions, "_pb", predictions)
+    return getattr(pb, "predictions", pb)
+
+
+def _lookup(fields, keys: Tuple[str, ...]):
+    for key in keys:
+        if key in fields:
+            return fields[key]
+    return None
+
+
+def _item(value: Value, kind: str):
+    which = value.WhichOneof("kind")
+    if kind == "string":
+        return value.string_value if which == "string_value" else ""
+    if kind == "bool":
+        return value.bool_value
+    if which == "string_value":
+        # int64 values are strings in the JSON mapping.
+        if kind == "int64":
+            return int(value.string_value)
+        return float(value.string_value)
+    if which == "number_value":
+        return value.number_value
+    return float("nan") if kind != "int64" else 0
+
+
+def _dictionary_encode(strings: List[str]) -> DictionaryArray:
+    index = {}  # type: Dict[str, int]
+    codes = [index.setdefault(s, len(index)) for s in strings]
+    categories = np.empty(len(index), dtype=object)
+    categories[:] = list(index)
+    return DictionaryArray(np.array(codes, dtype=np.int32), categories)
+
+
+def _column(items: List[Any], kind: str):
+    if kind == "string":
+        return _dictionary_encode(items)
+    return np.array(items, dtype=kind)
+
+
+def to_numpy(cls: MessageMeta, predictions: Any) -> Dict[str, Any]:
+    """Decodes a batch of predictions of one result type into columns.
+
+    Repeated fields become :class:`RaggedArray` columns and string fields
+    are dictionary-encoded as :class:`DictionaryArray`. Missing scalar
+    numbers decode as NaN (or 0 for integers).
+
+    Args:
+      cls: the prediction result class, e.g.
+        ``ClassificationPredictionResult``
+      predictions: a ``PredictResponse`` (proto-plus or raw protobuf), its
+        raw ``predictions`` field, or any iterable of
+        :class:`~google.protobuf.struct_pb2.Value` objects
+
+    Returns:
+      a dict mapping each field name of ``cls`` to its column
+    """
+    if np is None:
+        raise ImportError(
+            "numpy is required for columnar decoding. "
+            "Install it with `pip install numpy`."
+        )
+
+    plan = _plan(cls)
+    items = {field.name: [] for field in plan}  # type: Dict[str, List[Any]]
+    offsets = {field.name: [0] for field in plan if field.repeated}
+
+    for prediction in _predictions(predictions):
+        fields = prediction.struct_value.fields
+        for field in plan:
+            value = _lookup(fields, field.keys)
+            column = items[field.name]
+            if field.repeated:
+                if value is not None:
+                    kind = field.kind
+                    column.extend(_item(v, kind) for v in value.list_value.values)
+                offsets[field.name].append(len(column))
+            elif value is not None:
+                column.append(_item(value, field.kind))
+            else:
+                column.append(_item(Value(), field.kind))
+
+    columns = {}  # type: Dict[str, Any]
+    for field in plan:
+        column = _column(items[field.name], field.kind)
+        if field.repeated:
+            column = RaggedArray(column, np.array(offsets[field.name], dtype=np.int64))
+        columns[field.name] = column
+    return columns
+
+
+def _to_arrow_array(column):
+    if isinstance(column, RaggedArray):
+        return pyarrow.ListArray.from_arrays(
+            pyarrow.array(column.offsets.astype(np.int32)),
+            _to_arrow_array(column.values),
+        )
+    if isinstance(column, DictionaryArray):
+        return pyarrow.DictionaryArray.from_arrays(
+            pyarrow.array(column.codes),
+            pyarrow.array(column.categories, type=pyarrow.string()),
+        )
+    return pyarrow.array(column)
+
+
+def to_arrow(cls: MessageMeta, predictions: Any):
+    """Decodes a batch of predictions of one result type into an Arrow table.
+
+    String fields become dictionary arrays and repeated fields become list
+    arrays.
+
+    Args:
+      cls: the prediction result class, e.g.
+        ``TabularClassificationPredictionResult``
+      predictions: anything accepted by :func:`to_numpy`
+
+    Returns:
+      a :class:`pyarrow.Table` with one column per field of ``cls``
+    """
+    if pyarrow is None:
+        raise ImportError(
+            "pyarrow is required for Arrow decoding. "
+            "Install it with `pip install pyarrow`."
+        )
+
+    columns = to_numpy(cls, predictions)
+    return pyarrow.Table.from_arrays(
+        [_to_arrow_array(column) for column in columns.values()], names=list(columns),
+    )
+
+
+class AttributionMatrix(NamedTuple):
+    """Feature attributions of a batch of explanations as dense arrays.
+
+    ``N`` is the number of explanations, ``O`` the largest number of
+    attributions (outputs) in any of them and ``F`` the number of
+    features. Outputs an explanation does not have, and features an
+    attribution does not mention, are NaN.
+
+    Attributes:
+        feature_names (Tuple[str, ...]): The feature of each index along
+            the last axis of ``attributions``.
+        attributions (numpy.ndarray): ``float64`` array of shape
+            ``(N, O, F)``.
+        baseline_output_values (numpy.ndarray): ``(N, O)`` baseline
+            outputs.
+        instance_output_values (numpy.ndarray): ``(N, O)`` outputs for the
+            explained instances.
+        approximation_errors (numpy.ndarray): ``(N, O)`` approximation
+            errors.
+        output_display_names (numpy.ndarray): ``(N, O)`` object array of
+            output display names; ``None`` for missing outputs.
+    """
+
+    feature_names: Tuple[str, ...]
+    attributions: Any
+    baseline_output_values: Any
+    instance_output_values: Any
+    approximation_errors: Any
+    output_display_names: Any
+
+
+def _explanations(explanations: Any) -> Sequence[Any]:
+    pb = getattr(explanations, "_pb", explanations)
+    if hasattr(pb, "attributions"):
+        return [pb]
+    return [getattr(e, "_pb", e) for e in getattr(pb, "explanations", pb)]
+
+
+def _attribution_total(value: Value) -> float:
+    """Reduces one feature's attribution to a number, summing any tensors."""
+    which = value.WhichOneof("kind")
+    if which == "number_value":
+        return value.number_value
+    if which == "list_value":
+        return sum(_attribution_total(v) for v in value.list_value.values)
+    return float("nan")
+
+
+def attributions_to_numpy(
+    explanations: Any,
+    metadata: Any = None,
+    feature_names: Optional[Sequence[str]] = None,
+) -> AttributionMatrix:
+    """Decodes the feature attributions of many explanations at once.
+
+    Features whose attribution is a tensor (for example image or
+    embedding inputs) are reduced to the sum of their elements, which is
+    the attribution of the feature as a whole.
+
+    Args:
+      explanations: an ``ExplainResponse`` (proto-plus or raw protobuf),
+        its ``explanations`` field, a single ``Explanation``, or any
+        iterable of ``Explanation`` messages
+      metadata: the ``ExplanationMetadata`` of the Model; the keys of its
+        ``inputs`` map, sorted, give the features
+      feature_names: the feature order; overrides ``metadata``. When
+        neither is given, every feature found is used, sorted by name.
+
+    Returns:
+      an :class:`AttributionMatrix`
+    """
+    if np is None:
+        raise ImportError(
+            "numpy is required for columnar decoding. "
+            "Install it with `pip install numpy`."
+        )
+
+    explanations = _explanations(explanations)
+    if feature_names is None and metadata is not None:
+        feature_names = sorted(getattr(metadata, "_pb", metadata).inputs)
+    discover = feature_names is None
+    index = {name: i for i, name in enumerate(feature_names or ())}
+
+    n = len(explanations)
+    o = max((len(e.attributions) for e in explanations), default=0)
+    outputs = [[float("nan")] * (n * o) for _ in range(3)]
+    baselines, instance_outputs, errors = outputs
+    display_names = [None] * (n * o)
+    cells = []  # type: List[Tuple[int, int, float]]
+
+    for i, explanation in enumerate(explanations):
+        for j, attribution in enumerate(explanation.attributions):
+            row = i * o + j
+            baselines[row] = attribution.baseline_output_value
+            instance_outputs[row] = attribution.instance_output_value
+            errors[row] = attribution.approximation_error
+            display_names[row] = attribution.output_display_name
+            fields = attribution.feature_attributions.struct_value.fields
+            for name, value in fields.items():
+                k = index.get(name)
+                if k is None:
+                    if not discover:
+                        continue
+                    k = index[name] = len(index)
+                cells.append((row, k, _attribution_total(value)))
+
+    f = len(index)
+    attributions = np.full((n * o, f), np.nan)
+    if cells:
+        rows, columns, values = zip(*cells)
+        attributions[rows, columns] = values
+    if discover:
+        # Struct fields come in no particular order.
+        ordered = sorted(index)
+        attributions = attributions[:, [index[name] for name in ordered]]
+        index = dict.fromkeys(ordered)
+
+    names = np.empty(n * o, dtype=object)
+    names[:] = display_names
+    return AttributionMatrix(
+        feature_names=tuple(index),
+        attributions=attributions.reshape(n, o, f),
+        baseline_output_values=np.array(baselines).reshape(n, o),
+        instance_output_values=np.array(instance_outputs).reshape(n, o),
+        approximation_errors=np.array(errors).reshape(n, o),
+        output_display_names=names.reshape(n, o),
+    )
+
+
+__all__ = (
+    "AttributionMatrix",
+    "DictionaryArray",
+    "RaggedArray",
+    "attributions_to_numpy",
+    "to_arrow",
+    "to_numpy",
+)
@@ -0,0 +1,289 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import absolute_import
+import asyncio
+import collections
+from concurrent import futures
+import threading
+from typing import (
+    Any,
+    AsyncIterator,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from google.api_core import gapic_v1  # type: ignore
+from google.api_core import retry as retries  # type: ignore
+from google.cloud.aiplatform.helpers import client_pool
+from google.cloud.aiplatform.helpers import prefetch
+from google.cloud.aiplatform.helpers import resource_names
+
+
+class ListedItem(NamedTuple):
+    """One resource listed by :func:`list_across`, or one failed parent.
+
+    Attributes:
+        parent (str): The parent the resource was listed under.
+        item (Any): The resource, or ``None`` if listing failed.
+        error (Optional[Exception]): Why listing ``parent`` failed.
+    """
+
+    parent: str
+    item: Any
+    error: Optional[Exception]
+
+
+def _regional_endpoint(parent: str) -> Optional[str]:
+    """Returns the regional api_endpoint serving ``parent``, if any."""
+    location = getattr(resource_names.parse(parent), "location", None)
+    if not location or location == "global":
+        return None
+    return "{}-aiplatform.googleapis.com".format(location)
+
+
+def _targets(
+    parents: Iterable[Union[str, Tuple[str, str]]]
+) -> List[Tuple[str, Optional[str]]]:
+    targets = []
+    for parent in parents:
+        if isinstance(parent, str):
+            targets.append((parent, _regional_endpoint(parent)))
+        else:
+            parent, api_endpoint = parent
+            targets.append((parent, api_endpoint))
+    return targets
+
+
+class _Merger:
+    """Merges pages listed by worker threads into one bounded stream."""
+
+    def __init__(self, workers: int, max_pages: int):
+        self._cond = threading.Condition()
+        self._pages = collections.deque()  # type: collections.deque
+        self._running = workers
+        self._max_pages = max_pages
+        self.stopped = False
+
+    def put(self, entry: Tuple[str, Optional[Sequence[Any]], Any]) -> bool:
+        """Queues a page or an error; returns False once the consumer stopped."""
+        with self._cond:
+            while len(self._pages) >= self._max_pages and not self.stopped:
+                self._cond.wait()
+            if self.stopped:
+                return False
+            self._pages.append(entry)
+            self._cond.notify_all()
+            return True
+
+    def done(self) -> None:
+        with self._cond:
+            self._running -= 1
+            self._cond.notify_all()
+
+    def get(self):
+        """Returns the next page or error, or ``None`` once all workers are done."""
+        with self._cond:
+            while not self._pages and self._running:
+                self._cond.wait()
+            if not self._pages:
+                return None
+            self._cond.notify_all()
+            return self._pages.popleft()
+
+    def stop(self) -> None:
+        with self._cond:
+            self.stopped = True
+            self._pages.clear()
+            self._cond.notify_all()
+
+
+def _expand(entry) -> Iterator[ListedItem]:
+    parent, items, error = entry
+    if items is None:
+        yield ListedItem(parent, None, error)
+    else:
+        for item in items:
+            yield ListedItem(parent, item, None)
+
+
+def _list_sync(pool, client_class, method, targets, max_concurrency, call):
+    merger = _Merger(len(targets), max_pages=2 * max_concurrency)
+
+    def work(parent: str, api_endpoint: Optional[str]) -> None:
+        try:
+            if merger.stopped:
+                return
+            client = pool.client(client_class, api_endpoint=api_endpoint)
+            pager = getattr(client, method)(request=call.request(parent), **call.kwargs)
+            field = prefetch._items_field(pager._response)
+            for page in pager.pages:
+                if not merger.put((parent, getattr(page, field), None)):
+                    return
+        except Exception as exc:
+            merger.put((parent, None, exc))
+        finally:
+            merger.done()
+
+    executor = futures.ThreadPoolExecutor(
+        max_workers=max_concurrency, thread_name_prefix="list_across"
+    )
+    for target in targets:
+        executor.submit(work, *target)
+    try:
+        while True:
+            entry = merger.get()
+            if entry is None:
+                return
+            yield from _expand(entry)
+    finally:
+        merger.stop()
+        executor.shutdown(wait=False)
+
+
+_DONE = object()
+
+
+async def _list_async(pool, client_class, method, targets, max_concurrency, call):
+    queue = asyncio.Queue(maxsize=2 * max_concurrency)  # type: asyncio.Queue
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def work(parent: str, api_endpoint: Optional[str]) -> None:
+        try:
+            async with semaphore:
+                client = pool.client(client_class, api_endpoint=api_endpoint)
+                pager = await getattr(client, method)(
+                    request=call.request(parent), **call.kwargs
+                )
+                field = prefetch._items_field(pager._response)
+                async for page in pager.pages:
+                    await queue.put((parent, getattr(page, field), None))
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            await queue.put((parent, None, exc))
+        await queue.put(_DONE)
+
+    tasks = [asyncio.ensure_future(work(*target)) for target in targets]
+    remaining = len(tasks)
+    try:
+        while remaining:
+            entry = await queue.get()
+            if entry is _DONE:
+                remaining -= 1
+                continue
+            for listed in _expand(entry):
+                yield listed
+    finally:
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+class _Call:
+    """The request fields and call options shared by every parent."""
+
+    def __init__(self, request, retry, timeout, metadata):
+        self._request = dict(request or {})
+        self.kwargs = {"retry": retry, "timeout": timeout, "metadata": metadata}
+
+    def request(self, parent: str) -> Mapping[str, Any]:
+        return dict(self._request, parent=parent)
+
+
+def list_across(
+    pool: client_pool.ClientPool,
+    client_class,
+    method: str,
+    parents: Iterable[Union[str, Tuple[str, str]]],
+    *,
+    max_concurrency: int = 8,
+    request: Optional[Mapping[str, Any]] = None,
+    retry: retries.Retry = gapic_v1.method.DEFAULT,
+    timeout: float = None,
+    metadata: Sequence[Tuple[str, str]] = (),
+) -> Union[Iterator[ListedItem], AsyncIterator[ListedItem]]:
+    """Lists resources under many parents concurrently, as one stream.
+
+    Calls ``method`` of ``client_class`` once per parent, at most
+    ``max_concurrency`` parents at a time, and yields every resource of
+    every page as soon as it arrives, tagged with its parent. Resources of
+    one parent keep their order; those of different parents interleave.
+
+    Each parent is listed through a client from ``pool`` for its regional
+    endpoint, e.g. ``us-central1-aiplatform.googleapis.com`` for
+    ``projects/p/locations/us-central1``; pass ``(parent, api_endpoint)``
+    pairs to choose the endpoint. Clients of the same endpoint share a
+    channel.
+
+    A parent that fails yields one :class:`ListedItem` with the error,
+    after any resources listed before the failure, and does not stop the
+    other parents. At most about ``2 * max_concurrency`` pages are
+    buffered; stopping the iteration stops the remaining work.
+
+    Example::
+
+        parents = [
+            "projects/p/locations/us-central1",
+            "projects/p/locations/europe-west4",
+        ]
+        with ClientPool() as pool:
+            for listed in list_across(
+                pool, ModelServiceClient, "list_models", parents
+            ):
+                if listed.error is None:
+                    print(listed.parent, listed.item.display_name)
+
+    Args:
+        pool (google.cloud.aiplatform.helpers.client_pool.ClientPool): The
+            pool handing out the clients.
+        client_class: A sync or async client class of any service and API
+            version, e.g. ``ModelServiceClient`` or
+            ``JobServiceAsyncClient``.
+        method (str): The list method to call, e.g. ``"list_models"``.
+        parents (Iterable[Union[str, Tuple[str, str]]]): The parents, each
+            a name or a ``(parent, api_endpoint)`` pair.
+        max_concurrency (int): Maximum number of parents listed at once.
+        request (Mapping[str, Any]): Other fields of every list request,
+            e.g. ``{"filter": 'display_name="x"', "page_size": 100}``.
+        retry (google.api_core.retry.Retry): Designation of what errors, if
+            any, should be retried for each request.
+        timeout (float): The timeout for each request.
+        metadata (Sequence[Tuple[str, str]]): Strings which should be sent
+            along with each request as metadata.
+
+    Returns:
+        An iterator of :class:`ListedItem`, or an async iterator for an
+        async ``client_class``.
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1.")
+    targets = _targets(parents)
+    call = _Call(request, retry, timeout, tuple(metadata))
+    if client_pool._is_async(client_class):
+        return _list_async(pool, client_class, method, targets, max_concurrency, call)
+    return _list_sync(pool, client_class, method, targets, max_concurrency, call)
+
+
+__all__ = (
+    "ListedItem",
+    "list_across",
+)
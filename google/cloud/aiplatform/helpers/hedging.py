@@ -0,0 +1,357 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import absolute_import
+import asyncio
+import collections
+from concurrent import futures
+import threading
+import time
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from google.api_core import gapic_v1  # type: ignore
+from google.api_core import retry as retries  # type: ignore
+from google.protobuf.struct_pb2 import Value
+
+
+class HedgePolicy:
+    """Decides when to hedge a request and caps how often it happens.
+
+    The hedge delay is the ``percentile`` of recently observed primary
+    latencies, counting cancelled primaries as taking as long as they
+    ran, once ``min_samples`` have been recorded, and ``delay``
+    before that (or always, if ``percentile`` is not set).
+
+    The extra load is capped with a token bucket: every request earns
+    ``budget`` tokens, up to ``burst``, and every hedge spends one. With
+    the default budget of 0.05 at most about 5% of requests are hedged.
+
+    Args:
+        delay (float): Seconds to wait before hedging when no percentile
+            is available.
+        percentile (Optional[float]): Percentile (0-100) of observed
+            latency after which to hedge.
+        budget (float): Hedges earned per request.
+        burst (float): Maximum number of hedges that can be saved up.
+        window (int): Number of recent latencies kept for the percentile.
+        min_samples (int): Latencies needed before the percentile is used.
+    """
+
+    def __init__(
+        self,
+        delay: float = 0.05,
+        percentile: Optional[float] = None,
+        budget: float = 0.05,
+        burst: float = 10.0,
+        window: int = 1000,
+        min_samples: int = 20,
+    ):
+        if percentile is not None and not 0 < percentile < 100:
+            raise ValueError("percentile must be between 0 and 100.")
+        self._delay = delay
+        self._percentile = percentile
+        self._budget = budget
+        self._burst = burst
+        self._min_samples = min_samples
+        self._latencies = collections.deque(maxlen=window)
+        self._tokens = burst
+        self._lock = threading.Lock()
+        self.hedges_sent = 0
+        self.hedges_won = 0
+
+    def record(self, latency: float) -> None:
+        """Records the latency of a primary attempt.
+
+        For an attempt cancelled after losing to its hedge, this is the
+        time until it was cancelled, a lower bound of its latency. Leaving
+        the slow attempts out would drive the percentile, and with it the
+        hedge delay, ever lower.
+        """
+        with self._lock:
+            self._latencies.append(latency)
+
+    def hedge_delay(self) -> float:
+        """Returns the number of seconds to wait before hedging a request."""
+        with self._lock:
+            self._tokens = min(self._burst, self._tokens + self._budget)
+            if self._percentile is None or len(self._latencies) < self._min_samples:
+                return self._delay
+            ordered = sorted(self._latencies)
+        index = int(round(self._percentile / 100 * (len(ordered) - 1)))
+        return ordered[index]
+
+    def try_acquire(self) -> bool:
+        """Spends a hedge token; returns False if the budget is exhausted."""
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            self.hedges_sent += 1
+            return True
+
+    def record_hedge_win(self) -> None:
+        with self._lock:
+            self.hedges_won += 1
+
+
+class _HedgingBase:
+    def __init__(
+        self,
+        client,
+        endpoint: str,
+        hedge_client=None,
+        hedge_endpoint: Optional[str] = None,
+        policy: Optional[HedgePolicy] = None,
+    ):
+        if hedge_client is None and hedge_endpoint is None:
+            raise ValueError(
+                "At least one of hedge_client or hedge_endpoint must be set."
+            )
+        self._targets = (
+            (client, endpoint),
+            (hedge_client or client, hedge_endpoint or endpoint),
+        )
+        self._policy = policy if policy is not None else HedgePolicy()
+
+    @property
+    def policy(self) -> HedgePolicy:
+        """The policy deciding when to hedge."""
+        return self._policy
+
+    def _attempt(self, target: int, method: str, fields: Dict[str, Any], kwargs):
+        client, endpoint = self._targets[target]
+        return getattr(client, method)(endpoint=endpoint, **fields, **kwargs)
+
+
+class HedgingPredictionClient(_HedgingBase):
+    """Sends a duplicate request to a second endpoint when the first is slow.
+
+    Each call goes to the primary ``client``/``endpoint``. If no answer
+    arrives within the policy's hedge delay, and the hedge budget allows,
+    the same request is sent to ``hedge_client``/``hedge_endpoint`` (for
+    example another region's ``api_endpoint``) and the first successful
+    answer is returned.
+
+    Synchronous gRPC calls cannot be interrupted once started: a losing
+    attempt that has not started yet is cancelled, and one that is in
+    flight runs to completion in the background with its result
+    discarded. Use :class:`HedgingPredictionAsyncClient` to cancel losers
+    on the wire.
+
+    Args:
+        client: The primary ``PredictionServiceClient``.
+        endpoint (str): The primary Endpoint name.
+        hedge_client: The client for hedged requests. Defaults to
+            ``client``.
+        hedge_endpoint (str): The Endpoint name for hedged requests.
+            Defaults to ``endpoint``.
+        policy (Optional[HedgePolicy]): When and how often to hedge.
+        max_workers (int): Threads available for attempts in flight.
+    """
+
+    def __init__(
+        self,
+        client,
+        endpoint: str,
+        hedge_client=None,
+        hedge_endpoint: Optional[str] = None,
+        policy: Optional[HedgePolicy] = None,
+        max_workers: int = 16,
+    ):
+        super().__init__(client, endpoint, hedge_client, hedge_endpoint, policy)
+        self._executor = futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="HedgingPredictionClient"
+        )
+
+    def predict(
+        self,
+        instances: Sequence[Value],
+        parameters: Value = None,
+        *,
+        retry: retries.Retry = gapic_v1.method.DEFAULT,
+        timeout: float = None,
+        metadata: Sequence[Tuple[str, str]] = (),
+    ):
+        """Performs a hedged online prediction.
+
+        Returns:
+            The ``PredictResponse`` of whichever attempt answered first.
+        """
+        return self._hedged(
+            "predict",
+            {"instances": instances, "parameters": parameters},
+            {"retry": retry, "timeout": timeout, "metadata": metadata},
+        )
+
+    def explain(
+        self,
+        instances: Sequence[Value],
+        parameters: Value = None,
+        deployed_model_id: str = None,
+        *,
+        retry: retries.Retry = gapic_v1.method.DEFAULT,
+        timeout: float = None,
+        metadata: Sequence[Tuple[str, str]] = (),
+    ):
+        """Performs a hedged online explanation.
+
+        Returns:
+            The ``ExplainResponse`` of whichever attempt answered first.
+        """
+        return self._hedged(
+            "explain",
+            {
+                "instances": instances,
+                "parameters": parameters,
+                "deployed_model_id": deployed_model_id,
+            },
+            {"retry": retry, "timeout": timeout, "metadata": metadata},
+        )
+
+    def close(self) -> None:
+        """Releases the worker threads once attempts in flight finish."""
+        self._executor.shutdown(wait=False)
+
+    def _hedged(self, method: str, fields: Dict[str, Any], kwargs):
+        policy = self._policy
+        start = time.monotonic()
+        primary = self._executor.submit(self._attempt, 0, method, fields, kwargs)
+
+        def record(future):
+            # A cancelled primary lost to the hedge, so it was slow too.
+            if future.cancelled() or future.exception() is None:
+                policy.record(time.monotonic() - start)
+
+        primary.add_done_callback(record)
+
+        done, _ = futures.wait([primary], timeout=policy.hedge_delay())
+        if done or not policy.try_acquire():
+            return primary.result()
+
+        hedge = self._executor.submit(self._attempt, 1, method, fields, kwargs)
+        pending = {primary, hedge}
+        while pending:
+            done, pending = futures.wait(pending, return_when=futures.FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    for loser in pending:
+                        loser.cancel()
+                    if future is hedge:
+                        policy.record_hedge_win()
+                    return future.result()
+        # Both attempts failed; report the primary's error.
+        return primary.result()
+
+
+class HedgingPredictionAsyncClient(_HedgingBase):
+    """Hedged predictions for ``PredictionServiceAsyncClient``.
+
+    Behaves like :class:`HedgingPredictionClient`, except that the losing
+    attempt is cancelled, which cancels its RPC.
+
+    Args:
+        client: The primary ``PredictionServiceAsyncClient``.
+        endpoint (str): The primary Endpoint name.
+        hedge_client: The async client for hedged requests. Defaults to
+            ``client``.
+        hedge_endpoint (str): The Endpoint name for hedged requests.
+            Defaults to ``endpoint``.
+        policy (Optional[HedgePolicy]): When and how often to hedge.
+    """
+
+    async def predict(
+        self,
+        instances: Sequence[Value],
+        parameters: Value = None,
+        *,
+        retry: retries.Retry = gapic_v1.method.DEFAULT,
+        timeout: float = None,
+        metadata: Sequence[Tuple[str, str]] = (),
+    ):
+        """Performs a hedged online prediction.
+
+        Returns:
+            The ``PredictResponse`` of whichever attempt answered first.
+        """
+        return await self._hedged(
+            "predict",
+            {"instances": instances, "parameters": parameters},
+            {"retry": retry, "timeout": timeout, "metadata": metadata},
+        )
+
+    async def explain(
+        self,
+        instances: Sequence[Value],
+        parameters: Value = None,
+        deployed_model_id: str = None,
+        *,
+        retry: retries.Retry = gapic_v1.method.DEFAULT,
+        timeout: float = None,
+        metadata: Sequence[Tuple[str, str]] = (),
+    ):
+        """Performs a hedged online explanation.
+
+        Returns:
+            The ``ExplainResponse`` of whichever attempt answered first.
+        """
+        return await self._hedged(
+            "explain",
+            {
+                "instances": instances,
+                "parameters": parameters,
+                "deployed_model_id": deployed_model_id,
+            },
+            {"retry": retry, "timeout": timeout, "metadata": metadata},
+        )
+
+    async def _hedged(self, method: str, fields: Dict[str, Any], kwargs):
+        policy = self._policy
+        start = time.monotonic()
+        primary = asyncio.ensure_future(self._attempt(0, method, fields, kwargs))
+
+        def record(task):
+            # A cancelled primary lost to the hedge, so it was slow too.
+            if task.cancelled() or task.exception() is None:
+                policy.record(time.monotonic() - start)
+
+        primary.add_done_callback(record)
+
+        pending = {primary}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=policy.hedge_delay())
+            if done or not policy.try_acquire():
+                return await primary
+
+            hedge = asyncio.ensure_future(self._attempt(1, method, fields, kwargs))
+            pending.add(hedge)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            policy.record_hedge_win()
+                        return task.result()
+            # Both attempts failed; report the primary's error.
+            return primary.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+
+__all__ = (
+    "HedgePolicy",
+    "HedgingPredictionAsyncClient",
+    "HedgingPredictionClient",
+)
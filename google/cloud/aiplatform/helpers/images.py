@@ -0,0 +1,199 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import absolute_import
+import binascii
+import collections
+from concurrent import futures
+import mimetypes
+import os
+from typing import Any, Callable, Deque, Iterable, Iterator, Optional, Tuple, Union
+
+from google.protobuf.struct_pb2 import Value
+from proto.message import MessageMeta
+
+ImageSource = Union[str, "os.PathLike[str]", bytes]
+
+# A multiple of 3, so that chunks encode to base64 without padding and
+# their encodings can be concatenated.
+_CHUNK_SIZE = 3 * 256 * 1024
+
+
+def _b64encode_chunks(chunks: Iterable[bytes], size: int) -> bytearray:
+    """Base64-encodes the concatenation of ``chunks`` into one buffer.
+
+    Every chunk but the last must have a length that is a multiple of 3.
+    The buffer is allocated once for ``size`` bytes of input, and adjusted
+    if the chunks add up to a different size.
+    """
+    encoded = bytearray(4 * ((size + 2) // 3))
+    end = 0
+    for chunk in chunks:
+        piece = binascii.b2a_base64(chunk, newline=False)
+        encoded[end : end + len(piece)] = piece
+        end += len(piece)
+    del encoded[end:]
+    return encoded
+
+
+def _keys(instance_type: Optional[MessageMeta]) -> Tuple[str, str]:
+    """Returns the JSON names of the content and MIME type fields."""
+    if instance_type is None:
+        return "content", "mimeType"
+    fields = instance_type.pb().DESCRIPTOR.fields_by_name
+    if "content" not in fields or "mime_type" not in fields:
+        raise TypeError(
+            "{} has no content and mime_type fields.".format(instance_type.__name__)
+        )
+    return fields["content"].json_name, fields["mime_type"].json_name
+
+
+def _encoder(
+    instance_type: Optional[MessageMeta], mime_type: Optional[str]
+) -> Callable[[ImageSource], Value]:
+    content_key, mime_type_key = _keys(instance_type)
+
+    def encode(image: ImageSource) -> Value:
+        # Files are read one chunk at a time, so the raw image and its
+        # encoding are never both held in full.
+        if isinstance(image, bytes):
+            view = memoryview(image)
+            encoded = _b64encode_chunks(
+                (
+                    view[start : start + _CHUNK_SIZE]
+                    for start in range(0, len(view), _CHUNK_SIZE)
+                ),
+                len(view),
+            )
+            guessed = None
+        else:
+            with open(image, "rb") as f:
+                encoded = _b64encode_chunks(
+                    iter(lambda: f.read(_CHUNK_SIZE), b""), os.fstat(f.fileno()).st_size
+                )
+            guessed = mimetypes.guess_type(os.fspath(image))[0]
+
+        value = Value()
+        fields = value.struct_value.fields
+        fields[content_key].string_value = bytes(encoded)
+        del encoded
+        if mime_type or guessed:
+            fields[mime_type_key].string_value = mime_type or guessed
+        return value
+
+    return encode
+
+
+def encode_images(
+    images: Iterable[ImageSource],
+    instance_type: Optional[MessageMeta] = None,
+    *,
+    mime_type: Optional[str] = None,
+    max_workers: int = 4,
+    max_pending: Optional[int] = None,
+) -> Iterator[Value]:
+    """Reads and base64-encodes images into prediction instances in parallel.
+
+    Files are read and encoded by a pool of ``max_workers`` threads. At
+    most ``max_pending`` images are being encoded or waiting to be
+    consumed at any time, so memory stays bounded however many images
+    there are. Each file is read and encoded in chunks, so a whole raw
+    image is never held next to its encoding. Instances are yielded in
+    input order.
+
+    Args:
+      images: paths of image files, or raw image bytes
+      instance_type: the instance class, e.g.
+        ``ImageClassificationPredictionInstance``,
+        ``ImageObjectDetectionPredictionInstance`` or
+        ``ImageSegmentationPredictionInstance``. All three share the same
+        fields, which are used when this is not set.
+      mime_type: the MIME type of every image. By default it is guessed
+        from each file name, and left unset for raw bytes.
+      max_workers: number of encoding threads
+      max_pending: maximum number of images encoded ahead of the consumer;
+        defaults to twice ``max_workers``
+
+    Yields:
+      a :class:`~google.protobuf.struct_pb2.Value` instance per image
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1.")
+    if max_pending is None:
+        max_pending = 2 * max_workers
+    if max_pending < 1:
+        raise ValueError("max_pending must be at least 1.")
+
+    encode = _encoder(instance_type, mime_type)
+    pending: Deque[futures.Future] = collections.deque()
+    with futures.ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="encode_images"
+    ) as executor:
+        try:
+            for image in images:
+                if len(pending) >= max_pending:
+                    yield pending.popleft().result()
+                pending.append(executor.submit(encode, image))
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def predict_images(
+    predictor,
+    images: Iterable[ImageSource],
+    instance_type: Optional[MessageMeta] = None,
+    *,
+    mime_type: Optional[str] = None,
+    max_workers: int = 4,
+    max_in_flight: int = 256,
+) -> Iterator[Any]:
+    """Encodes images in parallel and predicts them through a batching predictor.
+
+    Args:
+      predictor: a
+        :class:`~google.cloud.aiplatform.helpers.batching.BatchingPredictor`
+      images: paths of image files, or raw image bytes
+      instance_type: the instance class; see :func:`encode_images`
+      mime_type: the MIME type of every image; see :func:`encode_images`
+      max_workers: number of encoding threads
+      max_in_flight: maximum number of encoded images submitted to
+        ``predictor`` whose predictions have not been consumed yet
+
+    Yields:
+      the prediction for each image, in input order
+    """
+    if max_in_flight < 1:
+        raise ValueError("max_in_flight must be at least 1.")
+
+    pending: Deque[futures.Future] = collections.deque()
+    try:
+        for instance in encode_images(
+            images, instance_type, mime_type=mime_type, max_workers=max_workers
+        ):
+            if len(pending) >= max_in_flight:
+                yield pending.popleft().result()
+            pending.append(predictor.submit(instance))
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+__all__ = (
+    "encode_images",
+    "predict_images",
+)
@@ -0,0 +1,111 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import absolute_import
+import sys
+from typing import Any, Iterable, Optional, Sequence, Tuple
+
+from google.api_core import gapic_v1  # type: ignore
+from google.api_core import retry as retries  # type: ignore
+from google.cloud.aiplatform.helpers.value_converter import _as_value
+
+
+class EndpointPredictor:
+    """Sends predictions to one endpoint with no per-call request setup.
+
+    ``PredictionServiceClient.predict`` validates its arguments, builds and
+    coerces a ``PredictRequest``, looks up the wrapped RPC and builds the
+    routing header on every call. This predictor does all of that once:
+    each call only copies a prebuilt request template, adds the instances
+    and sends it through the same wrapped RPC, so retries, timeouts and
+    error mapping behave exactly as with the client.
+
+    Args:
+        client: A ``PredictionServiceClient`` (any API version).
+        endpoint (str): The name of the Endpoint serving the predictions.
+        parameters: The parameters sent with every request, as a
+            :class:`~google.protobuf.struct_pb2.Value` or an enhanced
+            schema type.
+        metadata (Sequence[Tuple[str, str]]): Strings which should be sent
+            along with every request as metadata.
+    """
+
+    def __init__(
+        self,
+        client,
+        endpoint: str,
+        parameters: Any = None,
+        *,
+        metadata: Sequence[Tuple[str, str]] = (),
+    ):
+        transport = client._transport
+        self._rpc = transport._wrapped_methods[transport.predict]
+        # The types module of the client's API version.
+        types = sys.modules[type(client).__module__].prediction_service
+        self._request_type = types.PredictRequest
+        self._pb_type = types.PredictRequest.pb()
+        self._template = self._pb_type(endpoint=endpoint)
+        if parameters is not None:
+            self._template.parameters.CopyFrom(_as_value(parameters))
+        self._metadata = tuple(metadata) + (
+            gapic_v1.routing_header.to_grpc_metadata((("endpoint", endpoint),)),
+        )
+
+    @property
+    def endpoint(self) -> str:
+        """The name of the Endpoint this predictor sends to."""
+        return self._template.endpoint
+
+    def predict(
+        self,
+        instances: Iterable[Any],
+        *,
+        retry: retries.Retry = gapic_v1.method.DEFAULT,
+        timeout: float = None,
+        metadata: Optional[Sequence[Tuple[str, str]]] = None,
+    ):
+        """Performs an online prediction.
+
+        Args:
+            instances: The instances, as
+                :class:`~google.protobuf.struct_pb2.Value` objects or
+                enhanced schema types.
+            retry (google.api_core.retry.Retry): Designation of what errors,
+                if any, should be retried.
+            timeout (float): The timeout for this request.
+            metadata (Sequence[Tuple[str, str]]): Additional strings to send
+                along with this request as metadata.
+
+        Returns:
+            The ``PredictResponse`` of the client's API version.
+        """
+        if not isinstance(instances, (list, tuple)):
+            instances = list(instances)
+        pb = self._pb_type()
+        pb.CopyFrom(self._template)
+        try:
+            pb.instances.extend(instances)
+        except TypeError:
+            # Not all Values; convert the enhanced schema types.
+            del pb.instances[:]
+            pb.instances.extend([_as_value(instance) for instance in instances])
+        request = self._request_type.wrap(pb)
+
+        if metadata:
+            metadata = tuple(metadata) + self._metadata
+        else:
+            metadata = self._metadata
+        return self._rpc(request, retry=retry, timeout=timeout, metadata=metadata)
+
+
+__all__ = ("EndpointPredictor",)
@@ -0,0 +1,304 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import absolute_import
+import asyncio
+import collections
+import threading
+from typing import Any, AsyncIterator, Iterator, Optional, Union
+
+
+def _items_field(response) -> str:
+    """Returns the name of the repeated field a List response pages over."""
+    fields = [
+        name for name, field in type(response).meta.fields.items() if field.repeated
+    ]
+    if len(fields) != 1:
+        raise ValueError(
+            "{} does not have exactly one repeated field.".format(
+                type(response).__name__
+            )
+        )
+    return fields[0]
+
+
+class _PageFetcher:
+    """Fetches the remaining pages of a pager in a background thread.
+
+    At most ``depth`` pages are fetched ahead of the consumer, counting
+    the one in flight.
+    """
+
+    def __init__(self, pager, depth: int):
+        self._method = pager._method
+        self._request = pager._request
+        self._metadata = pager._metadata
+        self._token = pager._response.next_page_token
+
+        self._cond = threading.Condition()
+        self._pages = collections.deque()  # type: collections.deque
+        self._free = depth
+        self._error: Optional[Exception] = None
+        self._done = False
+        self._cancelled = False
+        self._thread = threading.Thread(
+            target=self._run, name="PageFetcher", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        token = self._token
+        try:
+            while token:
+                with self._cond:
+                    while not self._free and not self._cancelled:
+                        self._cond.wait()
+                    if self._cancelled:
+                        return
+                    self._free -= 1
+                self._request.page_token = token
+                response = self._method(self._request, metadata=self._metadata)
+                token = response.next_page_token
+                with self._cond:
+                    if self._cancelled:
+                        return
+                    self._pages.append(response)
+                    self._cond.notify_all()
+        except Exception as exc:
+            with self._cond:
+                self._error = exc
+        finally:
+            with self._cond:
+                self._done = True
+                self._cond.notify_all()
+
+    def next_page(self):
+        """Returns the next page, or ``None`` after the last one."""
+        with self._cond:
+            while not self._pages and not self._done:
+                self._cond.wait()
+            if self._pages:
+                self._free += 1
+                self._cond.notify_all()
+                return self._pages.popleft()
+            if self._error is not None:
+                raise self._error
+            return None
+
+    def cancel(self) -> None:
+        """Stops fetching; a request already in flight is left to finish."""
+        with self._cond:
+            self._cancelled = True
+            self._pages.clear()
+            self._cond.notify_all()
+
+
+class PrefetchingPager:
+    """Wraps a pager to fetch its next pages while the current one is used.
+
+    Iterating over ``pages``, or over the items, starts a background
+    thread that requests the following pages as soon as each page token
+    is known, keeping at most ``depth`` pages ahead of the consumer.
+
+    An error fetching a page is raised when the consumer reaches that
+    page. Closing the pager, or stopping the iteration early, stops the
+    prefetching; the request in flight, if any, completes in the
+    background and its response is dropped.
+
+    Args:
+        pager: A sync ``List*Pager`` of any service and API version.
+        depth (int): Maximum number of pages fetched ahead.
+    """
+
+    def __init__(self, pager, depth: int = 1):
+        if depth < 1:
+            raise ValueError("depth must be at least 1.")
+        self._pager = pager
+        self._depth = depth
+        self._response = pager._response
+        self._fetcher: Optional[_PageFetcher] = None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._response, name)
+
+    @property
+    def pages(self) -> Iterator[Any]:
+        if self._fetcher is not None:
+            raise RuntimeError("The pages of a pager can only be iterated once.")
+        first = self._response
+        if not first.next_page_token:
+            yield first
+            return
+        fetcher = self._fetcher = _PageFetcher(self._pager, self._depth)
+        try:
+            yield first
+            while True:
+                page = fetcher.next_page()
+                if page is None:
+                    return
+                self._response = page
+                yield page
+        finally:
+            fetcher.cancel()
+
+    def __iter__(self) -> Iterator[Any]:
+        field = _items_field(self._response)
+        for page in self.pages:
+            yield from getattr(page, field)
+
+    def close(self) -> None:
+        """Stops prefetching."""
+        if self._fetcher is not None:
+            self._fetcher.cancel()
+
+    def __enter__(self) -> "PrefetchingPager":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return "{0}<{1!r}>".format(self.__class__.__name__, self._response)
+
+
+_END = object()
+
+
+class AsyncPrefetchingPager:
+    """The asyncio counterpart of :class:`PrefetchingPager`.
+
+    The next pages are fetched by a task running alongside the consumer.
+    Closing the pager, stopping the iteration early or cancelling the
+    consumer cancels that task, including the request in flight.
+
+    Args:
+        pager: An async ``List*AsyncPager`` of any service and API version.
+        depth (int): Maximum number of pages fetched ahead.
+    """
+
+    def __init__(self, pager, depth: int = 1):
+        if depth < 1:
+            raise ValueError("depth must be at least 1.")
+        self._pager = pager
+        self._depth = depth
+        self._response = pager._response
+        self._task: Optional[asyncio.Future] = None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._response, name)
+
+    async def _fetch(self, queue: asyncio.Queue, slots: asyncio.Semaphore) -> None:
+        pager = self._pager
+        token = self._response.next_page_token
+        try:
+            while token:
+                await slots.acquire()
+                pager._request.page_token = token
+                response = await pager._method(pager._request, metadata=pager._metadata)
+                token = response.next_page_token
+                queue.put_nowait(response)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            queue.put_nowait(exc)
+        queue.put_nowait(_END)
+
+    @property
+    async def pages(self) -> AsyncIterator[Any]:
+        if self._task is not None:
+            raise RuntimeError("The pages of a pager can only be iterated once.")
+        first = self._response
+        if not first.next_page_token:
+            yield first
+            return
+        queue = asyncio.Queue()  # type: asyncio.Queue
+        slots = asyncio.Semaphore(self._depth)
+        task = self._task = asyncio.ensure_future(self._fetch(queue, slots))
+        try:
+            yield first
+            while True:
+                page = await queue.get()
+                if page is _END:
+                    return
+                if isinstance(page, Exception):
+                    raise page
+                slots.release()
+                self._response = page
+                yield page
+        finally:
+            await self._cancel(task)
+
+    @staticmethod
+    async def _cancel(task: asyncio.Future) -> None:
+        if not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def __aiter__(self) -> AsyncIterator[Any]:
+        field = _items_field(self._response)
+
+        async def async_generator():
+            async for page in self.pages:
+                for item in getattr(page, field):
+                    yield item
+
+        return async_generator()
+
+    async def aclose(self) -> None:
+        """Stops prefetching and cancels the request in flight."""
+        if self._task is not None:
+            await self._cancel(self._task)
+
+    async def __aenter__(self) -> "AsyncPrefetchingPager":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.aclose()
+
+    def __repr__(self) -> str:
+        return "{0}<{1!r}>".format(self.__class__.__name__, self._response)
+
+
+def prefetch(pager, depth: int = 1) -> Union[PrefetchingPager, AsyncPrefetchingPager]:
+    """Makes a pager fetch its next pages in the background.
+
+    Example::
+
+        jobs = prefetch(client.list_custom_jobs(parent=parent), depth=2)
+        for job in jobs:
+            ...
+
+    Args:
+        pager: A ``List*Pager`` or ``List*AsyncPager`` of any service and
+            API version, as returned by the ``list_*`` methods.
+        depth (int): Maximum number of pages fetched ahead of the one
+            being consumed; this bounds the memory held by prefetched
+            pages.
+
+    Returns:
+        A :class:`PrefetchingPager` for a sync pager, or an
+        :class:`AsyncPrefetchingPager` for an async one.
+    """
+    if hasattr(pager, "__aiter__"):
+        return AsyncPrefetchingPager(pager, depth)
+    return PrefetchingPager(pager, depth)
+
+
+__all__ = (
+    "AsyncPrefetchingPager",
+    "PrefetchingPager",
+    "prefetch",
+)
@@ -0,0 +1,242 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import absolute_import
+import copy
+import sys
+from typing import Optional, Sequence, Tuple
+
+from google.api_core import gapic_v1  # type: ignore
+from google.api_core import grpc_helpers  # type: ignore
+from google.api_core import grpc_helpers_async  # type: ignore
+from google.api_core import retry as retries  # type: ignore
+
+BYTES = "bytes"
+PB = "pb"
+
+_LENGTH_DELIMITED = 2
+# Wire types 1 (64-bit) and 5 (32-bit).
+_FIXED_SIZES = {1: 8, 5: 4}
+
+
+def _varint(data: bytes, pos: int) -> Tuple[int, int]:
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+def _endpoint(data: bytes) -> str:
+    """Reads ``PredictRequest.endpoint`` (field 1) without parsing the rest.
+
+    Other fields, such as the instances, are skipped over by their length.
+    """
+    pos, end = 0, len(data)
+    while pos < end:
+        tag, pos = _varint(data, pos)
+        field, wire_type = tag >> 3, tag & 7
+        if wire_type == _LENGTH_DELIMITED:
+            size, pos = _varint(data, pos)
+            if field == 1:
+                return bytes(data[pos : pos + size]).decode("utf-8")
+            pos += size
+        elif wire_type in _FIXED_SIZES:
+            pos += _FIXED_SIZES[wire_type]
+        elif wire_type == 0:
+            _, pos = _varint(data, pos)
+        else:
+            break
+    return ""
+
+
+class LazyMessage:
+    """A serialized message that is only parsed when it is first used.
+
+    Attributes of the parsed message are available directly on this
+    object.
+
+    Args:
+        data (bytes): The serialized message.
+        pb_type: The protobuf message class of ``data``.
+    """
+
+    __slots__ = ("_data", "_pb_type", "_pb")
+
+    def __init__(self, data: bytes, pb_type):
+        self._data = data
+        self._pb_type = pb_type
+        self._pb = None
+
+    @property
+    def raw(self) -> bytes:
+        """The serialized message."""
+        return self._data
+
+    @property
+    def pb(self):
+        """The parsed protobuf message."""
+        if self._pb is None:
+            self._pb = self._pb_type.FromString(self._data)
+        return self._pb
+
+    def __getattr__(self, name):
+        return getattr(self.pb, name)
+
+
+def _identity(data: bytes) -> bytes:
+    return data
+
+
+def _wrapped_predict(transport):
+    """Returns the transport's own wrapped ``predict`` method."""
+    # The asyncio transports wrap the stubs cached on their class, before
+    # they get stubs of their own.
+    for stubs in (transport._stubs, getattr(type(transport), "_stubs", {})):
+        wrapped = transport._wrapped_methods.get(stubs.get("predict"))
+        if wrapped is not None:
+            return wrapped
+    raise ValueError("{!r} has no wrapped predict method.".format(transport))
+
+
+class _RawBase:
+    def __init__(self, transport, response_format: str, wrap_errors):
+        if response_format not in (BYTES, PB):
+            raise ValueError("response_format must be {!r} or {!r}.".format(BYTES, PB))
+        transport = getattr(transport, "_transport", transport)
+        # The transport module imports the types of its API version.
+        types = sys.modules[type(transport).__module__].prediction_service
+        package = types.PredictRequest.pb().DESCRIPTOR.file.package
+        stub = transport.grpc_channel.unary_unary(
+            "/{}.PredictionService/Predict".format(package),
+            request_serializer=_identity,
+            response_deserializer=_identity,
+        )
+        # A copy of the transport's own wrapped predict, calling the raw
+        # stub instead, keeps the retry, timeout and user-agent the
+        # transport was configured with.
+        self._rpc = copy.copy(_wrapped_predict(transport))
+        self._rpc._target = wrap_errors(stub)
+        self._response_pb_type = types.PredictResponse.pb()
+        self._lazy = response_format == PB
+
+    def _prepare(self, request: bytes, endpoint: Optional[str], metadata):
+        if endpoint is None:
+            endpoint = _endpoint(request)
+        return tuple(metadata) + (
+            gapic_v1.routing_header.to_grpc_metadata((("endpoint", endpoint),)),
+        )
+
+    def _result(self, response: bytes):
+        if self._lazy:
+            return LazyMessage(response, self._response_pb_type)
+        return response
+
+
+class RawPredictor(_RawBase):
+    """Sends pre-serialized ``PredictRequest`` bytes over a gRPC transport.
+
+    Requests and responses skip proto-plus entirely: the request bytes go
+    on the wire as they are, and the response comes back as bytes or as a
+    :class:`LazyMessage` parsed on first use. The RPC is wrapped the same
+    way as the transport's own ``predict``, so retries, the default
+    timeout, the user-agent and the ``endpoint`` routing header are kept.
+
+    Args:
+        transport: A ``PredictionServiceGrpcTransport`` (any API version),
+            or a ``PredictionServiceClient`` using one.
+        response_format (str): ``"bytes"`` to return the serialized
+            ``PredictResponse``, or ``"pb"`` to return a
+            :class:`LazyMessage`.
+    """
+
+    def __init__(self, transport, response_format: str = BYTES):
+        super().__init__(transport, response_format, grpc_helpers.wrap_errors)
+
+    def predict(
+        self,
+        request: bytes,
+        *,
+        endpoint: str = None,
+        retry: retries.Retry = gapic_v1.method.DEFAULT,
+        timeout: float = gapic_v1.method.DEFAULT,
+        metadata: Sequence[Tuple[str, str]] = (),
+    ):
+        """Performs an online prediction from a serialized request.
+
+        Args:
+            request (bytes): A serialized ``PredictRequest``.
+            endpoint (str): The request's endpoint, for the routing header.
+                Read from ``request`` if not set.
+            retry (google.api_core.retry.Retry): Designation of what errors,
+                if any, should be retried.
+            timeout (float): The timeout for this request. Defaults to the
+                transport's default timeout for ``predict``: none in v1,
+                5 seconds in v1beta1.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the request as metadata.
+
+        Returns:
+            The serialized ``PredictResponse``, or a :class:`LazyMessage`.
+        """
+        metadata = self._prepare(request, endpoint, metadata)
+        response = self._rpc(request, retry=retry, timeout=timeout, metadata=metadata)
+        return self._result(response)
+
+
+class AsyncRawPredictor(_RawBase):
+    """The ``grpc_asyncio`` counterpart of :class:`RawPredictor`.
+
+    Args:
+        transport: A ``PredictionServiceGrpcAsyncIOTransport`` (any API
+            version), or a ``PredictionServiceAsyncClient`` using one.
+        response_format (str): ``"bytes"`` or ``"pb"``.
+    """
+
+    def __init__(self, transport, response_format: str = BYTES):
+        transport = getattr(transport, "_client", transport)
+        super().__init__(transport, response_format, grpc_helpers_async.wrap_errors)
+
+    async def predict(
+        self,
+        request: bytes,
+        *,
+        endpoint: str = None,
+        retry: retries.Retry = gapic_v1.method.DEFAULT,
+        timeout: float = gapic_v1.method.DEFAULT,
+        metadata: Sequence[Tuple[str, str]] = (),
+    ):
+        """Performs an online prediction from a serialized request.
+
+        Takes the same arguments as :meth:`RawPredictor.predict`.
+
+        Returns:
+            The serialized ``PredictResponse``, or a :class:`LazyMessage`.
+        """
+        metadata = self._prepare(request, endpoint, metadata)
+        response = await self._rpc(
+            request, retry=retry, timeout=timeout, metadata=metadata
+        )
+        return self._result(response)
+
+
+__all__ = (
+    "AsyncRawPredictor",
+    "BYTES",
+    "LazyMessage",
+    "PB",
+    "RawPredictor",
+)
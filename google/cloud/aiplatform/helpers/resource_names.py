@@ -0,0 +1,282 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import absolute_import
+import collections
+import functools
+import re
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
+
+_FIELD = re.compile(r"\{(\w+)\}")
+
+
+class ResourceName(tuple):
+    """Base class of the parsed resource names.
+
+    Each resource type has its own subclass, a named tuple of the ids in
+    its name, e.g. ``ModelName(project, location, model)``. Names of
+    different types never compare equal, so they can share a dict, and
+    ``str(name)`` gives back the resource name.
+    """
+
+    __slots__ = ()
+
+    kind = ""  # type: str
+    template = ""  # type: str
+
+    def __eq__(self, other):
+        return type(self) is type(other) and tuple.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.kind) ^ tuple.__hash__(self)
+
+    def __str__(self):
+        return self.template.format(**self._asdict())
+
+    def __reduce__(self):
+        return (type(self), tuple(self))
+
+
+def _name_type(kind: str, template: str) -> Type[ResourceName]:
+    fields = _FIELD.findall(template)
+    class_name = "".join(word.capitalize() for word in kind.split("_")) + "Name"
+    base = collections.namedtuple(class_name, fields)
+    return type(
+        class_name,
+        (ResourceName, base),
+        {
+            "__slots__": (),
+            "__doc__": "The name ``{}``.".format(template),
+            "__module__": __name__,
+            "kind": kind,
+            "template": template,
+        },
+    )
+
+
+# The templates of the *_path methods of the v1 and v1beta1 clients.
+AnnotatedDatasetName = _name_type(
+    "annotated_dataset",
+    "projects/{project}/datasets/{dataset}/annotatedDatasets/{annotated_dataset}",
+)
+AnnotationName = _name_type(
+    "annotation",
+    "projects/{project}/locations/{location}/datasets/{dataset}"
+    "/dataItems/{data_item}/annotations/{annotation}",
+)
+AnnotationSpecName = _name_type(
+    "annotation_spec",
+    "projects/{project}/locations/{location}/datasets/{dataset}"
+    "/annotationSpecs/{annotation_spec}",
+)
+BatchPredictionJobName = _name_type(
+    "batch_prediction_job",
+    "projects/{project}/locations/{location}"
+    "/batchPredictionJobs/{batch_prediction_job}",
+)
+BillingAccountName = _name_type("billing_account", "billingAccounts/{billing_account}")
+CustomJobName = _name_type(
+    "custom_job", "projects/{project}/locations/{location}/customJobs/{custom_job}"
+)
+DataItemName = _name_type(
+    "data_item",
+    "projects/{project}/locations/{location}/datasets/{dataset}/dataItems/{data_item}",
+)
+DataLabelingJobName = _name_type(
+    "data_labeling_job",
+    "projects/{project}/locations/{location}/dataLabelingJobs/{data_labeling_job}",
+)
+DatasetName = _name_type(
+    "dataset", "projects/{project}/locations/{location}/datasets/{dataset}"
+)
+# A Data Labeling dataset, as named by MigrationService.
+DatalabelingDatasetName = _name_type(
+    "datalabeling_dataset", "projects/{project}/datasets/{dataset}"
+)
+EndpointName = _name_type(
+    "endpoint", "projects/{project}/locations/{location}/endpoints/{endpoint}"
+)
+FolderName = _name_type("folder", "folders/{folder}")
+HyperparameterTuningJobName = _name_type(
+    "hyperparameter_tuning_job",
+    "projects/{project}/locations/{location}"
+    "/hyperparameterTuningJobs/{hyperparameter_tuning_job}",
+)
+LocationName = _name_type("location", "projects/{project}/locations/{location}")
+ModelName = _name_type(
+    "model", "projects/{project}/locations/{location}/models/{model}"
+)
+ModelEvaluationName = _name_type(
+    "model_evaluation",
+    "projects/{project}/locations/{location}/models/{model}/evaluations/{evaluation}",
+)
+ModelEvaluationSliceName = _name_type(
+    "model_evaluation_slice",
+    "projects/{project}/locations/{location}/models/{model}"
+    "/evaluations/{evaluation}/slices/{slice}",
+)
+OrganizationName = _name_type("organization", "organizations/{organization}")
+ProjectName = _name_type("project", "projects/{project}")
+SpecialistPoolName = _name_type(
+    "specialist_pool",
+    "projects/{project}/locations/{location}/specialistPools/{specialist_pool}",
+)
+TrainingPipelineName = _name_type(
+    "training_pipeline",
+    "projects/{project}/locations/{location}/trainingPipelines/{training_pipeline}",
+)
+TrialName = _name_type(
+    "trial", "projects/{project}/locations/{location}/studies/{study}/trials/{trial}"
+)
+# A legacy AI Platform model version, as named by MigrationService.
+VersionName = _name_type(
+    "version", "projects/{project}/models/{model}/versions/{version}"
+)
+
+TYPES: Dict[str, Type[ResourceName]] = {
+    cls.kind: cls
+    for cls in (
+        AnnotatedDatasetName,
+        AnnotationName,
+        AnnotationSpecName,
+        BatchPredictionJobName,
+        BillingAccountName,
+        CustomJobName,
+        DataItemName,
+        DataLabelingJobName,
+        DatasetName,
+        DatalabelingDatasetName,
+        EndpointName,
+        FolderName,
+        HyperparameterTuningJobName,
+        LocationName,
+        ModelName,
+        ModelEvaluationName,
+        ModelEvaluationSliceName,
+        OrganizationName,
+        ProjectName,
+        SpecialistPoolName,
+        TrainingPipelineName,
+        TrialName,
+        VersionName,
+    )
+}
+
+
+# Names alternate collection ids and resource ids, and every type has its
+# own sequence of collection ids, so one lookup finds the type of a name.
+_BY_COLLECTIONS: Dict[Tuple[str, ...], Type[ResourceName]] = {
+    tuple(cls.template.split("/")[::2]): cls for cls in TYPES.values()
+}
+_intern = sys.intern
+
+
+def _parse(name: str) -> Optional[ResourceName]:
+    segments = name.split("/")
+    cls = _BY_COLLECTIONS.get(tuple(segments[::2]))
+    ids = segments[1::2]
+    if cls is None or len(ids) != len(cls._fields) or "" in ids:
+        return None
+    return tuple.__new__(cls, map(_intern, ids))
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def parse(name: str) -> Optional[ResourceName]:
+    """Parses any AI Platform resource name in a single pass.
+
+    Unlike the ``parse_*_path`` methods of the clients, which each try one
+    pattern, this recognises every resource type at once from the
+    collection ids of the name (``projects``, ``locations``,
+    ``endpoints``...). Ids are single path segments.
+
+    Example::
+
+        >>> parse("projects/p/locations/us-central1/models/123")
+        ModelName(project='p', location='us-central1', model='123')
+        >>> parse("projects/p/locations/us-central1/models/123").kind
+        'model'
+
+    Args:
+        name (str): A resource name.
+
+    Returns:
+        The :class:`ResourceName` subclass instance for the name, or
+        ``None`` if it is not a known resource name. Parsing the same name
+        again returns the same instance while it is cached, and ids are
+        interned strings.
+    """
+    return _parse(name)
+
+
+def parse_many(names: Iterable[str]) -> List[Optional[ResourceName]]:
+    """Parses a batch of resource names, such as a page of list results.
+
+    Each distinct name in the batch is parsed once, and equal names get
+    the same key. The names are not added to the cache of :func:`parse`,
+    so a large listing does not evict the names parsed elsewhere.
+
+    Args:
+        names (Iterable[str]): The resource names.
+
+    Returns:
+        List[Optional[ResourceName]]: The parsed names, ``None`` for names
+        that are not known resource names.
+    """
+    seen: Dict[str, Optional[ResourceName]] = {}
+    parsed = []
+    append = parsed.append
+    for name in names:
+        key = seen.get(name, seen)
+        if key is seen:
+            key = seen[name] = _parse(name)
+        append(key)
+    return parsed
+
+
+def index(resources: Iterable[Any], field: str = "name") -> Dict[ResourceName, Any]:
+    """Maps the parsed names of resources, such as a page of models, to them.
+
+    Args:
+        resources (Iterable[Any]): Messages or other objects with a
+            resource name attribute.
+        field (str): The attribute holding the resource name.
+
+    Returns:
+        Dict[ResourceName, Any]: The resources keyed by parsed name.
+
+    Raises:
+        ValueError: If a resource name is not a known resource name.
+    """
+    resources = list(resources)
+    keys = parse_many([getattr(resource, field) for resource in resources])
+    result = {}
+    for resource, key in zip(resources, keys):
+        if key is None:
+            raise ValueError(
+                "Unknown resource name: {!r}".format(getattr(resource, field))
+            )
+        result[key] = resource
+    return result
+
+
+__all__ = tuple(sorted(cls.__name__ for cls in TYPES.values())) + (
+    "ResourceName",
+    "TYPES",
+    "index",
+    "parse",
+    "parse_many",
+)
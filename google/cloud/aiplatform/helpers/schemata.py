@@ -0,0 +1,699 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import absolute_import
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+from urllib import parse as urlparse
+from urllib import request as urlrequest
+
+from google.cloud.aiplatform.helpers.value_converter import (
+    _as_value,
+    _python_to_value,
+)
+from google.protobuf.struct_pb2 import Value
+
+try:
+    import yaml
+except ImportError:  # pragma: NO COVER
+    yaml = None
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "google-cloud-aiplatform",
+    "schemata",
+)
+DEFAULT_TIMEOUT = 60.0
+
+_REMOTE_SCHEMES = ("gs", "http", "https")
+
+# OpenAPI types and the Value kind each one must have.
+_KINDS = {
+    "array": "list_value",
+    "boolean": "bool_value",
+    "integer": "number_value",
+    "number": "number_value",
+    "object": "struct_value",
+    "string": "string_value",
+}
+# Keywords that make an untyped schema check objects.
+_OBJECT_KEYWORDS = frozenset(("additionalProperties", "properties", "required"))
+_TYPE_NAMES = {
+    "bool_value": "boolean",
+    "list_value": "array",
+    "number_value": "number",
+    "string_value": "string",
+    "struct_value": "object",
+}
+
+# A check appends ``(path, message)`` pairs for every violation it finds.
+# Paths are nested ``(parent, key)`` tuples, formatted only on failure.
+_Path = Optional[Tuple[Any, Any]]
+_Check = Callable[[Value, _Path, List[Tuple[_Path, str]]], None]
+
+
+class Violation(NamedTuple):
+    """One way an instance or parameters value breaks its schema.
+
+    Attributes:
+        index (int): Position of the instance in the batch, or ``None``
+            for parameters.
+        path (str): Where in the value the violation is, e.g.
+            ``"mimeType"`` or ``"boxes[2]"``. Empty for the value itself.
+        message (str): What is wrong.
+    """
+
+    index: Optional[int]
+    path: str
+    message: str
+
+    def __str__(self) -> str:
+        where = "parameters" if self.index is None else "instance {}".format(self.index)
+        if self.path:
+            where += " at " + self.path
+        return "{}: {}".format(where, self.message)
+
+
+class SchemaValidationError(ValueError):
+    """Raised when a batch does not match its schema.
+
+    Attributes:
+        violations (List[Violation]): Every violation found in the batch.
+    """
+
+    def __init__(self, violations: List[Violation]):
+        self.violations = violations
+        shown = "\n".join("  " + str(violation) for violation in violations[:10])
+        more = len(violations) - 10
+        if more > 0:
+            shown += "\n  ... and {} more".format(more)
+        super().__init__("{} schema violation(s):\n{}".format(len(violations), shown))
+
+
+def _format_path(path: _Path) -> str:
+    keys = []
+    while path is not None:
+        path, key = path
+        keys.append(key)
+    formatted = ""
+    for key in reversed(keys):
+        if isinstance(key, int):
+            formatted += "[{}]".format(key)
+        else:
+            formatted += "." + key if formatted else key
+    return formatted
+
+
+def _scalar(value: Value):
+    return getattr(value, value.WhichOneof("kind") or "null_value")
+
+
+# --- schema compilation -------------------------------------------------
+
+
+class _Compiler:
+    """Compiles an OpenAPI schema object into a tree of checks.
+
+    Supports the subset of OpenAPI 3.0 used by PredictSchemata: types,
+    ``nullable``, ``enum``, numeric and length bounds, ``pattern``,
+    ``properties``, ``required``, ``additionalProperties``, ``items``,
+    ``allOf``/``anyOf``/``oneOf`` and local ``$ref``. Annotations such as
+    ``description`` or ``format`` are ignored.
+    """
+
+    def __init__(self, root: Dict[str, Any]):
+        self._root = root
+        self._refs = {}  # type: Dict[str, List[_Check]]
+
+    def compile(self, schema: Dict[str, Any]) -> _Check:
+        if not isinstance(schema, dict):
+            raise ValueError("Expected a schema object, got {!r}.".format(schema))
+        if "$ref" in schema:
+            return self._ref(schema["$ref"])
+
+        type_ = schema.get("type")
+        if type_ is not None and type_ not in _KINDS:
+            raise ValueError("Unsupported schema type {!r}.".format(type_))
+        expected = _KINDS.get(type_)
+        nullable = schema.get("nullable", False) or type_ is None
+        checks = self._keyword_checks(schema, type_)
+
+        def check(value, path, errors):
+            kind = value.WhichOneof("kind")
+            if kind == expected or expected is None and kind in _TYPE_NAMES:
+                for keyword_check in checks:
+                    keyword_check(value, path, errors)
+            elif kind is None or kind == "null_value":
+                if not nullable:
+                    errors.append((path, "expected {}, got null".format(type_)))
+            else:
+                errors.append(
+                    (path, "expected {}, got {}".format(type_, _TYPE_NAMES[kind]))
+                )
+
+        return check
+
+    def _ref(self, ref: str) -> _Check:
+        # Refs are compiled once; a cell lets recursive schemas refer to
+        # themselves before they are done compiling.
+        cell = self._refs.get(ref)
+        if cell is None:
+            if ref != "#" and not ref.startswith("#/"):
+                raise ValueError("Only local $ref are supported, got {!r}.".format(ref))
+            cell = self._refs[ref] = []
+            target = self._root
+            for part in ref[2:].split("/") if ref != "#" else ():
+                target = target[part.replace("~1", "/").replace("~0", "~")]
+            cell.append(self.compile(target))
+
+        def check(value, path, errors):
+            cell[0](value, path, errors)
+
+        return check
+
+    def _keyword_checks(self, schema, type_) -> List[_Check]:
+        checks = []
+        if "enum" in schema:
+            checks.append(self._enum(schema["enum"], _KINDS.get(type_)))
+        if type_ == "integer":
+            checks.append(_integer)
+        if type_ in ("integer", "number"):
+            checks.extend(_bounds(schema))
+        if type_ == "string":
+            checks.extend(_string_checks(schema))
+        if type_ == "array":
+            checks.extend(self._array_checks(schema))
+        if type_ == "object":
+            checks.extend(self._object_checks(schema))
+        elif type_ is None and _OBJECT_KEYWORDS & schema.keys():
+            # Without a type, the object keywords only constrain objects.
+            checks.extend(_objects_only(check) for check in self._object_checks(schema))
+        for keyword in ("allOf", "anyOf", "oneOf"):
+            if keyword in schema:
+                checks.append(
+                    self._combinator(
+                        keyword, [self.compile(sub) for sub in schema[keyword]]
+                    )
+                )
+        return checks
+
+    def _enum(self, options, kind: Optional[str]) -> _Check:
+        allowed = frozenset(
+            option for option in options if not isinstance(option, (dict, list))
+        )
+
+        def check(value, path, errors):
+            if kind:
+                item = getattr(value, kind)
+            else:
+                found = value.WhichOneof("kind")
+                if found in ("list_value", "struct_value"):
+                    # Only scalar options are kept in ``allowed``.
+                    message = "an {} is not one of {}"
+                    errors.append((path, message.format(_TYPE_NAMES[found], options)))
+                    return
+                item = _scalar(value)
+            if item not in allowed:
+                errors.append((path, "{!r} is not one of {}".format(item, options)))
+
+        return check
+
+    def _array_checks(self, schema) -> List[_Check]:
+        checks = []
+        min_items = schema.get("minItems")
+        max_items = schema.get("maxItems")
+        if min_items is not None or max_items is not None:
+
+            def check_size(value, path, errors):
+                size = len(value.list_value.values)
+                if min_items is not None and size < min_items:
+                    errors.append(
+                        (path, "expected at least {} items".format(min_items))
+                    )
+                if max_items is not None and size > max_items:
+                    errors.append((path, "expected at most {} items".format(max_items)))
+
+            checks.append(check_size)
+
+        if "items" in schema:
+            check_item = self.compile(schema["items"])
+
+            def check_items(value, path, errors):
+                for index, item in enumerate(value.list_value.values):
+                    check_item(item, (path, index), errors)
+
+            checks.append(check_items)
+        return checks
+
+    def _object_checks(self, schema) -> List[_Check]:
+        properties = {
+            name: self.compile(sub)
+            for name, sub in (schema.get("properties") or {}).items()
+        }
+        required = tuple(schema.get("required") or ())
+        additional = schema.get("additionalProperties", True)
+        check_additional = (
+            self.compile(additional) if isinstance(additional, dict) else None
+        )
+
+        def check(value, path, errors):
+            fields = value.struct_value.fields
+            for name in required:
+                if name not in fields:
+                    errors.append((path, "missing required property {!r}".format(name)))
+            # Properties are checked in schema order, so that violations
+            # come out in a stable order.
+            matched = 0
+            for name, check_property in properties.items():
+                if name in fields:
+                    matched += 1
+                    check_property(fields[name], (path, name), errors)
+            if additional is True or matched == len(fields):
+                return
+            for name in sorted(fields):
+                if name in properties:
+                    continue
+                if check_additional is not None:
+                    check_additional(fields[name], (path, name), errors)
+                else:
+                    errors.append((path, "unexpected property {!r}".format(name)))
+
+        return [check]
+
+    def _combinator(self, keyword, subschemas: List[_Check]) -> _Check:
+        def check(value, path, errors):
+            if keyword == "allOf":
+                for subschema in subschemas:
+                    subschema(value, path, errors)
+                return
+            matches = 0
+            for subschema in subschemas:
+                sub_errors = []
+                subschema(value, path, sub_errors)
+                matches += not sub_errors
+            if keyword == "anyOf" and not matches:
+                errors.append((path, "does not match any of the anyOf schemas"))
+            elif keyword == "oneOf" and matches != 1:
+                errors.append(
+                    (path, "matches {} of the oneOf schemas, not 1".format(matches))
+                )
+
+        return check
+
+
+def _objects_only(check_object: _Check) -> _Check:
+    def check(value, path, errors):
+        if value.WhichOneof("kind") == "struct_value":
+            check_object(value, path, errors)
+
+    return check
+
+
+def _integer(value, path, errors):
+    if not value.number_value.is_integer():
+        errors.append((path, "{!r} is not an integer".format(value.number_value)))
+
+
+def _bounds(schema) -> List[_Check]:
+    minimum = schema.get("minimum")
+    maximum = schema.get("maximum")
+    if minimum is None and maximum is None:
+        return []
+    # OpenAPI 3.0 exclusive bounds are booleans next to minimum/maximum.
+    exclusive_minimum = bool(schema.get("exclusiveMinimum"))
+    exclusive_maximum = bool(schema.get("exclusiveMaximum"))
+
+    def check(value, path, errors):
+        number = value.number_value
+        if minimum is not None and (
+            number < minimum or exclusive_minimum and number == minimum
+        ):
+            errors.append(
+                (path, "{!r} is below the minimum {}".format(number, minimum))
+            )
+        if maximum is not None and (
+            number > maximum or exclusive_maximum and number == maximum
+        ):
+            errors.append(
+                (path, "{!r} is above the maximum {}".format(number, maximum))
+            )
+
+    return [check]
+
+
+def _string_checks(schema) -> List[_Check]:
+    checks = []
+    min_length = schema.get("minLength")
+    max_length = schema.get("maxLength")
+    if min_length is not None or max_length is not None:
+
+        def check_length(value, path, errors):
+            length = len(value.string_value)
+            if min_length is not None and length < min_length:
+                errors.append((path, "shorter than {} characters".format(min_length)))
+            if max_length is not None and length > max_length:
+                errors.append((path, "longer than {} characters".format(max_length)))
+
+        checks.append(check_length)
+
+    if "pattern" in schema:
+        pattern = re.compile(schema["pattern"])
+
+        def check_pattern(value, path, errors):
+            if not pattern.search(value.string_value):
+                errors.append(
+                    (path, "does not match pattern {!r}".format(pattern.pattern))
+                )
+
+        checks.append(check_pattern)
+    return checks
+
+
+def _to_value(item) -> Value:
+    if isinstance(item, Value) or callable(getattr(item, "to_value", None)):
+        return _as_value(item)
+    return _python_to_value(item)
+
+
+class SchemaValidator:
+    """Validates values against one compiled OpenAPI schema.
+
+    The schema is compiled into plain Python checks once; validating a
+    value walks the ``google.protobuf.Value`` directly without converting
+    it.
+
+    Args:
+        schema (Dict[str, Any]): A parsed OpenAPI schema object, such as
+            the content of a PredictSchemata YAML file.
+    """
+
+    def __init__(self, schema: Dict[str, Any]):
+        self.schema = schema
+        self._check = _Compiler(schema).compile(schema)
+
+    def iter_violations(
+        self, values: Iterable[Any], *, index_offset: int = 0
+    ) -> Iterator[Violation]:
+        """Yields the violations of every value, in order.
+
+        Args:
+            values: :class:`~google.protobuf.struct_pb2.Value` objects,
+                enhanced schema types or plain Python values.
+            index_offset (int): Added to the index of every violation.
+        """
+        check = self._check
+        errors = []
+        for index, value in enumerate(values, index_offset):
+            if type(value) is not Value:
+                value = _to_value(value)
+            check(value, None, errors)
+            if errors:
+                for path, message in errors:
+                    yield Violation(index, _format_path(path), message)
+                del errors[:]
+
+    def validate(self, values: Iterable[Any]) -> None:
+        """Checks a whole batch and raises if any value is invalid.
+
+        Raises:
+            SchemaValidationError: with every violation in the batch.
+        """
+        violations = list(self.iter_violations(values))
+        if violations:
+            raise SchemaValidationError(violations)
+
+    def is_valid(self, value: Any) -> bool:
+        """Returns whether a single value matches the schema."""
+        errors = []
+        self._check(_to_value(value), None, errors)
+        return not errors
+
+
+# --- schema loading -----------------------------------------------------
+
+
+def _parse(data: bytes, uri: str) -> Dict[str, Any]:
+    if yaml is not None:
+        return yaml.safe_load(data)
+    try:
+        return json.loads(data.decode("utf-8"))
+    except ValueError:
+        raise ImportError(
+            "PyYAML is required to read the schema {}. "
+            "Install it with `pip install pyyaml`.".format(uri)
+        )
+
+
+class SchemaLoader:
+    """Fetches, caches and compiles PredictSchemata schema files.
+
+    A schema URI is resolved in order from:
+
+    1. ``local_dir``: ``<local_dir>/<bucket>/<object>`` for ``gs://`` URIs,
+       then ``<local_dir>/<file name>``.
+    2. A local path, read as is.
+    3. ``cache_dir``, where every file fetched from ``gs://`` or
+       ``http(s)://`` is stored.
+    4. The URI itself, through Cloud Storage or HTTP.
+
+    Compiled validators are kept in memory, so each URI is fetched and
+    compiled at most once per loader; a local file is compiled again
+    once its modification time changes.
+
+    Args:
+        cache_dir (str): Directory caching fetched schema files, or
+            ``None`` to not cache on disk.
+        local_dir (str): Directory holding schema files to use instead of
+            fetching them.
+        storage_client (google.cloud.storage.Client): Client for ``gs://``
+            URIs. Created on first use if not set.
+        timeout (float): Seconds to wait for a ``gs://`` or ``http(s)://``
+            download.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+        local_dir: Optional[str] = None,
+        storage_client=None,
+        timeout: float = DEFAULT_TIMEOUT,
+    ):
+        self.cache_dir = cache_dir
+        self.local_dir = local_dir
+        self.timeout = timeout
+        self._storage_client = storage_client
+        # Maps each URI to the modification time of its local file, if
+        # any, and its validator.
+        self._validators = {}  # type: Dict[str, Tuple[Optional[int], SchemaValidator]]
+        self._lock = threading.Lock()
+
+    def validator(self, uri: str) -> SchemaValidator:
+        """Returns the compiled validator of the schema at ``uri``."""
+        path = _local_path(uri)
+        stamp = os.stat(path).st_mtime_ns if path is not None else None
+        entry = self._validators.get(uri)
+        if entry is None or entry[0] != stamp:
+            with self._lock:
+                entry = self._validators.get(uri)
+                if entry is None or entry[0] != stamp:
+                    entry = self._validators[uri] = (
+                        stamp,
+                        SchemaValidator(self.load(uri)),
+                    )
+        return entry[1]
+
+    def load(self, uri: str) -> Dict[str, Any]:
+        """Returns the parsed schema file at ``uri``."""
+        return _parse(self.read(uri), uri)
+
+    def read(self, uri: str) -> bytes:
+        """Returns the content of the schema file at ``uri``."""
+        for path in self._local_paths(uri):
+            if os.path.isfile(path):
+                with open(path, "rb") as f:
+                    return f.read()
+
+        path = _local_path(uri)
+        if path is not None:
+            with open(path, "rb") as f:
+                return f.read()
+
+        cache_path = self._cache_path(uri)
+        if cache_path is not None and os.path.isfile(cache_path):
+            with open(cache_path, "rb") as f:
+                return f.read()
+
+        data = self._fetch(uri)
+        if cache_path is not None:
+            _write_atomically(cache_path, data)
+        return data
+
+    def _local_paths(self, uri: str) -> List[str]:
+        if not self.local_dir:
+            return []
+        parsed = urlparse.urlparse(uri)
+        paths = []
+        if parsed.scheme == "gs":
+            paths.append(
+                os.path.join(self.local_dir, parsed.netloc, *parsed.path.split("/"))
+            )
+        paths.append(os.path.join(self.local_dir, os.path.basename(parsed.path)))
+        return paths
+
+    def _cache_path(self, uri: str) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        digest = hashlib.sha256(uri.encode("utf-8")).hexdigest()[:16]
+        name = os.path.basename(urlparse.urlparse(uri).path)
+        return os.path.join(self.cache_dir, "{}-{}".format(digest, name))
+
+    def _fetch(self, uri: str) -> bytes:
+        parsed = urlparse.urlparse(uri)
+        if parsed.scheme == "gs":
+            if self._storage_client is None:
+                from google.cloud import storage
+
+                self._storage_client = storage.Client()
+            blob = self._storage_client.bucket(parsed.netloc).blob(
+                parsed.path.lstrip("/")
+            )
+            download = getattr(blob, "download_as_bytes", None) or (
+                blob.download_as_string
+            )
+            return download(timeout=self.timeout)
+        with urlrequest.urlopen(uri, timeout=self.timeout) as response:
+            return response.read()
+
+
+def _local_path(uri: str) -> Optional[str]:
+    """Returns the path of a URI naming a local file, else ``None``."""
+    parsed = urlparse.urlparse(uri)
+    if parsed.scheme in _REMOTE_SCHEMES:
+        return None
+    return parsed.path if parsed.scheme == "file" else uri
+
+
+def _write_atomically(path: str, data: bytes) -> None:
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    # Concurrent writers each rename a complete file into place.
+    fd, tmp_path = tempfile.mkstemp(dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+_default_loader = None  # type: Optional[SchemaLoader]
+
+
+def _get_default_loader() -> SchemaLoader:
+    global _default_loader
+    if _default_loader is None:
+        _default_loader = SchemaLoader()
+    return _default_loader
+
+
+class PredictSchemataValidator:
+    """Validates prediction inputs against a model's PredictSchemata.
+
+    Use it to reject bad instances before calling ``predict`` or before
+    submitting a batch prediction job, instead of waiting for the server
+    to fail the request.
+
+    Args:
+        predict_schemata: A ``Model`` or its ``PredictSchemata`` (any API
+            version).
+        loader (SchemaLoader): Loads the schema files. A process-wide
+            loader caching to :data:`DEFAULT_CACHE_DIR` is used if not set.
+
+    Attributes:
+        instances (SchemaValidator): The instance schema validator, or
+            ``None`` if the model has no instance schema.
+        parameters (SchemaValidator): The parameters schema validator, or
+            ``None`` if the model has no parameters schema.
+    """
+
+    def __init__(self, predict_schemata, *, loader: Optional[SchemaLoader] = None):
+        predict_schemata = getattr(
+            predict_schemata, "predict_schemata", predict_schemata
+        )
+        loader = loader or _get_default_loader()
+        self.instances = self._validator(loader, predict_schemata.instance_schema_uri)
+        self.parameters = self._validator(
+            loader, predict_schemata.parameters_schema_uri
+        )
+
+    @staticmethod
+    def _validator(loader: SchemaLoader, uri: str) -> Optional[SchemaValidator]:
+        return loader.validator(uri) if uri else None
+
+    def iter_violations(
+        self, instances: Iterable[Any], parameters: Any = None
+    ) -> Iterator[Violation]:
+        """Yields the violations of the parameters, then of every instance.
+
+        Takes the same arguments as :meth:`validate`.
+        """
+        if parameters is not None and self.parameters is not None:
+            for violation in self.parameters.iter_violations([parameters]):
+                yield violation._replace(index=None)
+        if self.instances is not None:
+            for violation in self.instances.iter_violations(instances):
+                yield violation
+
+    def validate(self, instances: Iterable[Any], parameters: Any = None) -> None:
+        """Checks a whole batch and raises if anything is invalid.
+
+        Args:
+            instances: The instances, as
+                :class:`~google.protobuf.struct_pb2.Value` objects,
+                enhanced schema types or plain Python values (e.g. the
+                records of a batch prediction input file).
+            parameters: The parameters, in any of the same forms.
+
+        Raises:
+            SchemaValidationError: with every violation found.
+        """
+        violations = list(self.iter_violations(instances, parameters))
+        if violations:
+            raise SchemaValidationError(violations)
+
+
+__all__ = (
+    "DEFAULT_CACHE_DIR",
+    "DEFAULT_TIMEOUT",
+    "PredictSchemataValidator",
+    "SchemaLoader",
+    "SchemaValidationError",
+    "SchemaValidator",
+    "Violation",
+)
@@ -0,0 +1,176 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import absolute_import
+import base64
+from concurrent import futures
+import io
+from typing import Any, List, Optional, Tuple
+
+from google.protobuf.struct_pb2 import Value
+
+try:
+    import numpy as np
+except ImportError:  # pragma: NO COVER
+    np = None
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: NO COVER
+    Image = None
+
+_CATEGORY_KEYS = ("categoryMask", "category_mask")
+_CONFIDENCE_KEYS = ("confidenceMask", "confidence_mask")
+
+
+def _decode_png(data: memoryview):
+    if np is None or Image is None:
+        raise ImportError(
+            "numpy and Pillow are required to decode segmentation masks. "
+            "Install them with `pip install numpy Pillow`."
+        )
+    with Image.open(io.BytesIO(data)) as image:
+        return np.asarray(image)
+
+
+class SegmentationMasks:
+    """Lazily decoded masks of one ``ImageSegmentationPredictionResult``.
+
+    Nothing is decoded until it is first accessed. The PNG bytes of each
+    mask are base64-decoded once and exposed as a read-only
+    :class:`memoryview`; the pixel arrays are decoded from that buffer
+    and cached.
+
+    Args:
+        prediction: one prediction of a ``PredictResponse`` (a
+            :class:`~google.protobuf.struct_pb2.Value`), or an
+            ``ImageSegmentationPredictionResult`` (proto-plus or raw
+            protobuf).
+    """
+
+    __slots__ = ("_prediction", "_png", "_arrays")
+
+    def __init__(self, prediction: Any):
+        self._prediction = getattr(prediction, "_pb", prediction)
+        self._png = {}
+        self._arrays = {}
+
+    def _png_view(self, keys: Tuple[str, ...]) -> Optional[memoryview]:
+        name = keys[1]
+        if name not in self._png:
+            prediction = self._prediction
+            data = None
+            if isinstance(prediction, Value):
+                fields = prediction.struct_value.fields
+                for key in keys:
+                    if key in fields:
+                        data = base64.b64decode(fields[key].string_value)
+                        break
+            else:
+                # Raw bytes fields are returned without another copy.
+                data = getattr(prediction, name) or None
+            self._png[name] = memoryview(data) if data else None
+        return self._png[name]
+
+    def _array(self, keys: Tuple[str, ...]):
+        name = keys[1]
+        if name not in self._arrays:
+            data = self._png_view(keys)
+            self._arrays[name] = None if data is None else _decode_png(data)
+        return self._arrays[name]
+
+    @property
+    def category_mask_png(self) -> Optional[memoryview]:
+        """The PNG-encoded category mask, or ``None`` if absent."""
+        return self._png_view(_CATEGORY_KEYS)
+
+    @property
+    def confidence_mask_png(self) -> Optional[memoryview]:
+        """The PNG-encoded confidence mask, or ``None`` if absent."""
+        return self._png_view(_CONFIDENCE_KEYS)
+
+    @property
+    def category_mask(self):
+        """The category mask as a ``(height, width[, channels])`` array."""
+        return self._array(_CATEGORY_KEYS)
+
+    @property
+    def confidence_mask(self):
+        """The confidence mask as a ``(height, width)`` ``uint8`` array."""
+        return self._array(_CONFIDENCE_KEYS)
+
+
+def _predictions(predictions: Any):
+    pb = getattr(predictions, "_pb", predictions)
+    return getattr(pb, "predictions", pb)
+
+
+def masks(predictions: Any) -> List[SegmentationMasks]:
+    """Wraps every prediction of a segmentation response without decoding it.
+
+    Args:
+      predictions: a ``PredictResponse`` (proto-plus or raw protobuf), its
+        raw ``predictions`` field, or any iterable of predictions accepted
+        by :class:`SegmentationMasks`
+
+    Returns:
+      a :class:`SegmentationMasks` per prediction
+    """
+    return [SegmentationMasks(prediction) for prediction in _predictions(predictions)]
+
+
+def decode_masks(
+    predictions: Any,
+    *,
+    category: bool = True,
+    confidence: bool = True,
+    max_workers: int = 4,
+) -> List[SegmentationMasks]:
+    """Decodes the masks of a whole segmentation response in a thread pool.
+
+    Pillow releases the GIL while inflating PNG data, so the masks of a
+    response decode in parallel.
+
+    Args:
+      predictions: anything accepted by :func:`masks`
+      category: whether to decode the category masks
+      confidence: whether to decode the confidence masks
+      max_workers: number of decoding threads
+
+    Returns:
+      a :class:`SegmentationMasks` per prediction, with the requested
+      masks already decoded
+    """
+    results = masks(predictions)
+    keys = []
+    if category:
+        keys.append(_CATEGORY_KEYS)
+    if confidence:
+        keys.append(_CONFIDENCE_KEYS)
+
+    with futures.ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="decode_masks"
+    ) as executor:
+        pending = [
+            executor.submit(result._array, key) for result in results for key in keys
+        ]
+        for future in pending:
+            future.result()
+    return results
+
+
+__all__ = (
+    "SegmentationMasks",
+    "decode_masks",
+    "masks",
+)
@@ -0,0 +1,229 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import absolute_import
+import re
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from google.api_core import exceptions
+from google.api_core import gapic_v1  # type: ignore
+from google.api_core import retry as retries  # type: ignore
+from google.protobuf.struct_pb2 import Value
+
+_MESSAGE_TOO_LARGE = re.compile(r"larger than max", re.IGNORECASE)
+# Only messages about the instance count or the payload size: other
+# INVALID_ARGUMENT errors may mention a limit too, e.g. a field value.
+_TOO_MANY_INSTANCES = re.compile(
+    r"too many instances|number of instances|instances count"
+    r"|(?:payload|request) size (?:is too large|exceeds)"
+    r"|(?:payload|request) (?:is )?too large",
+    re.IGNORECASE,
+)
+
+
+def is_payload_too_large(error: Exception) -> bool:
+    """Returns whether ``error`` reports a batch that is too large.
+
+    gRPC reports oversized messages as ``RESOURCE_EXHAUSTED`` ("... larger
+    than max ..."), and a deployed model rejects too many instances or a
+    too large payload with ``INVALID_ARGUMENT``. Quota errors, which are
+    also ``RESOURCE_EXHAUSTED``, and other invalid arguments do not match.
+    """
+    if isinstance(error, exceptions.ResourceExhausted):
+        return bool(_MESSAGE_TOO_LARGE.search(error.message or ""))
+    if isinstance(error, exceptions.InvalidArgument):
+        return bool(_TOO_MANY_INSTANCES.search(error.message or ""))
+    # HTTP 413 Payload Too Large, e.g. from a proxy in front of the endpoint.
+    return isinstance(error, exceptions.GoogleAPICallError) and error.code == 413
+
+
+class AdaptivePredictionClient:
+    """Splits ``predict``/``explain`` batches that exceed server limits.
+
+    When a request fails because it holds too many or too large instances,
+    its instances are split in half, each half is sent again (and split
+    further if needed) and the results are stitched back together in
+    input order.
+
+    Once the halves of a split request went through, the endpoint
+    remembers that batch size, so later calls are split into batches of
+    that size up front instead of failing first. After ``grow_after``
+    full batches of the learned size succeed in a row, the limit is
+    doubled again, so an endpoint whose limit was raised, or whose
+    instances got smaller, recovers larger batches. Every other attribute
+    is delegated to the wrapped client.
+
+    Args:
+        client: A ``PredictionServiceClient`` (any API version).
+        max_batch_size (Optional[int]): The initial batch size limit for
+            every endpoint; unlimited by default. Learned limits never
+            grow past it.
+        is_too_large (Callable[[Exception], bool]): Decides whether an
+            error calls for splitting the request. Defaults to
+            :func:`is_payload_too_large`.
+        grow_after (int): Number of successful batches of the learned
+            size after which the limit of an endpoint is doubled.
+    """
+
+    def __init__(
+        self,
+        client,
+        max_batch_size: Optional[int] = None,
+        is_too_large: Callable[[Exception], bool] = is_payload_too_large,
+        grow_after: int = 100,
+    ):
+        if max_batch_size is not None and max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1.")
+        if grow_after < 1:
+            raise ValueError("grow_after must be at least 1.")
+        self._client = client
+        self._default_batch_size = max_batch_size
+        self._is_too_large = is_too_large
+        self._grow_after = grow_after
+        self._batch_sizes = {}  # type: Dict[str, int]
+        self._successes = {}  # type: Dict[str, int]
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+    def batch_size(self, endpoint: str) -> Optional[int]:
+        """Returns the batch size limit learned for ``endpoint``, if any."""
+        with self._lock:
+            return self._batch_sizes.get(endpoint, self._default_batch_size)
+
+    def predict(
+        self,
+        *,
+        endpoint: str = None,
+        instances: Sequence[Value] = None,
+        parameters: Value = None,
+        retry: retries.Retry = gapic_v1.method.DEFAULT,
+        timeout: float = None,
+        metadata: Sequence[Tuple[str, str]] = (),
+    ):
+        """Performs an online prediction, splitting the batch as needed.
+
+        Takes the same flattened arguments as
+        ``PredictionServiceClient.predict``.
+        """
+        return self._call(
+            "predict",
+            endpoint,
+            list(instances or ()),
+            {"parameters": parameters},
+            {"retry": retry, "timeout": timeout, "metadata": metadata},
+        )
+
+    def explain(
+        self,
+        *,
+        endpoint: str = None,
+        instances: Sequence[Value] = None,
+        parameters: Value = None,
+        deployed_model_id: str = None,
+        retry: retries.Retry = gapic_v1.method.DEFAULT,
+        timeout: float = None,
+        metadata: Sequence[Tuple[str, str]] = (),
+    ):
+        """Performs an online explanation, splitting the batch as needed.
+
+        Takes the same flattened arguments as
+        ``PredictionServiceClient.explain``.
+        """
+        return self._call(
+            "explain",
+            endpoint,
+            list(instances or ()),
+            {"parameters": parameters, "deployed_model_id": deployed_model_id},
+            {"retry": retry, "timeout": timeout, "metadata": metadata},
+        )
+
+    def _call(
+        self,
+        method: str,
+        endpoint: str,
+        instances: List[Any],
+        fields: Dict[str, Any],
+        kwargs: Dict[str, Any],
+    ):
+        send = getattr(self._client, method)
+
+        def attempt(chunk: List[Any]) -> List[Any]:
+            try:
+                response = send(endpoint=endpoint, instances=chunk, **fields, **kwargs)
+            except exceptions.GoogleAPICallError as exc:
+                if len(chunk) < 2 or not self._is_too_large(exc):
+                    raise
+            else:
+                self._succeeded(endpoint, len(chunk))
+                return [response]
+            half = (len(chunk) + 1) // 2
+            responses = attempt(chunk[:half]) + attempt(chunk[half:])
+            # Only learn the size once batches of it went through.
+            self._learn(endpoint, half)
+            return responses
+
+        responses = []
+        start = 0
+        while start < len(instances) or not responses:
+            # Limits learned while sending one chunk apply to the next.
+            size = self.batch_size(endpoint) or len(instances)
+            chunk = instances[start : start + size]
+            responses.extend(attempt(chunk))
+            start += len(chunk)
+
+        if len(responses) == 1:
+            return responses[0]
+        return self._stitch(method, responses)
+
+    def _learn(self, endpoint: str, size: int) -> None:
+        with self._lock:
+            current = self._batch_sizes.get(endpoint, self._default_batch_size)
+            if current is None or size < current:
+                self._batch_sizes[endpoint] = size
+                self._successes[endpoint] = 0
+
+    def _succeeded(self, endpoint: str, size: int) -> None:
+        with self._lock:
+            limit = self._batch_sizes.get(endpoint)
+            if limit is None or size < limit:
+                # Smaller batches say nothing about the limit.
+                return
+            successes = self._successes.get(endpoint, 0) + 1
+            if successes < self._grow_after:
+                self._successes[endpoint] = successes
+                return
+            self._successes[endpoint] = 0
+            limit *= 2
+            if self._default_batch_size is not None:
+                limit = min(limit, self._default_batch_size)
+            self._batch_sizes[endpoint] = limit
+
+    @staticmethod
+    def _stitch(method: str, responses: List[Any]):
+        response = type(responses[0])()
+        pb = response._pb
+        pb.deployed_model_id = responses[0].deployed_model_id
+        for part in responses:
+            pb.predictions.extend(part._pb.predictions)
+            if method == "explain":
+                pb.explanations.extend(part._pb.explanations)
+        return response
+
+
+__all__ = (
+    "AdaptivePredictionClient",
+    "is_payload_too_large",
+)
@@ -0,0 +1,172 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import absolute_import
+import asyncio
+import collections
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from google.api_core import gapic_v1  # type: ignore
+from google.api_core import retry as retries  # type: ignore
+from google.protobuf.struct_pb2 import Value
+
+
+class ChunkResult(NamedTuple):
+    """The outcome of predicting one chunk of instances.
+
+    Attributes:
+        start (int): Position of the chunk's first instance in the input.
+        size (int): Number of instances in the chunk.
+        predictions (List[Any]): The predictions for the chunk, in input
+            order. Empty if ``error`` is set.
+        deployed_model_id (str): ID of the DeployedModel that served the
+            chunk.
+        error (Optional[Exception]): The exception raised while predicting
+            the chunk, if any.
+    """
+
+    start: int
+    size: int
+    predictions: List[Any]
+    deployed_model_id: str
+    error: Optional[Exception]
+
+
+async def _chunks(
+    instances: Union[Iterable[Value], AsyncIterable[Value]], chunk_size: int
+) -> AsyncIterator[List[Value]]:
+    chunk = []  # type: List[Value]
+    if hasattr(instances, "__aiter__"):
+        async for instance in instances:  # type: ignore
+            chunk.append(instance)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+    else:
+        for instance in instances:  # type: ignore
+            chunk.append(instance)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+async def predict_many(
+    client,
+    endpoint: str,
+    instances: Union[Iterable[Value], AsyncIterable[Value]],
+    parameters: Optional[Value] = None,
+    *,
+    chunk_size: int = 100,
+    max_concurrency: int = 8,
+    retry: retries.Retry = gapic_v1.method.DEFAULT,
+    timeout: float = None,
+    metadata: Sequence[Tuple[str, str]] = (),
+) -> AsyncIterator[ChunkResult]:
+    """Predicts a stream of instances with a bounded number of requests in flight.
+
+    ``instances`` is consumed lazily: a new chunk is only read once a slot
+    among the ``max_concurrency`` in-flight requests is free and the oldest
+    result has been taken by the caller, so memory use does not grow with
+    the size of the input.
+
+    Args:
+        client: A ``PredictionServiceAsyncClient`` (any API version).
+        endpoint (str): The name of the Endpoint serving the predictions.
+        instances (Union[Iterable[Value], AsyncIterable[Value]]): The
+            instances to predict.
+        parameters (Optional[google.protobuf.struct_pb2.Value]): The
+            parameters sent with every request.
+        chunk_size (int): Number of instances per request.
+        max_concurrency (int): Maximum number of requests in flight.
+        retry (google.api_core.retry.Retry): Designation of what errors, if
+            any, should be retried for each request.
+        timeout (float): The timeout for each request.
+        metadata (Sequence[Tuple[str, str]]): Strings which should be sent
+            along with each request as metadata.
+
+    Yields:
+        ChunkResult: One result per chunk, in input order. A failed chunk
+        has its exception in ``error`` and does not stop the stream.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1.")
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1.")
+
+    metadata = tuple(metadata)
+
+    async def predict_chunk(start: int, chunk: List[Value]) -> ChunkResult:
+        try:
+            response = await client.predict(
+                endpoint=endpoint,
+                instances=chunk,
+                parameters=parameters,
+                retry=retry,
+                timeout=timeout,
+                metadata=metadata,
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            return ChunkResult(start, len(chunk), [], "", exc)
+        return ChunkResult(
+            start,
+            len(chunk),
+            list(response.predictions),
+            response.deployed_model_id,
+            None,
+        )
+
+    in_flight = collections.deque()  # type: collections.deque
+    chunks = _chunks(instances, chunk_size)
+    start = 0
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(in_flight) < max_concurrency:
+                try:
+                    chunk = await chunks.__anext__()
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                in_flight.append(asyncio.ensure_future(predict_chunk(start, chunk)))
+                start += len(chunk)
+
+            if not in_flight:
+                return
+            yield await in_flight.popleft()
+    finally:
+        for task in in_flight:
+            task.cancel()
+        if in_flight:
+            await asyncio.gather(*in_flight, return_exceptions=True)
+        await chunks.aclose()
+
+
+__all__ = (
+    "ChunkResult",
+    "predict_many",
+)
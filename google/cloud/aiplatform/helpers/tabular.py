@@ -0,0 +1,165 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import absolute_import
+import sys
+from typing import Any, List, Mapping, Tuple
+
+from google.protobuf.struct_pb2 import NULL_VALUE
+
+try:
+    import numpy as np
+except ImportError:  # pragma: NO COVER
+    np = None
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError(
+            "numpy is required to encode tabular instances. "
+            "Install it with `pip install numpy`."
+        )
+
+
+def _columns(data: Any) -> List[Tuple[str, Any]]:
+    """Returns ``(name, ndarray)`` pairs for each column of ``data``."""
+    if hasattr(data, "columns") and hasattr(data, "__getitem__"):
+        # pandas.DataFrame
+        return [(str(name), data[name].to_numpy()) for name in data.columns]
+    if isinstance(data, np.ndarray) and data.dtype.names:
+        # NumPy structured or record array
+        return [(name, data[name]) for name in data.dtype.names]
+    if isinstance(data, Mapping):
+        return [(str(name), np.asarray(column)) for name, column in data.items()]
+    raise TypeError(
+        "Expected a pandas.DataFrame, a NumPy structured array or a mapping of "
+        "column names to arrays, got {!r}.".format(type(data))
+    )
+
+
+def _is_pandas_missing(item) -> bool:
+    # pd.NA and pd.NaT fill the gaps of nullable and tz-aware columns; if
+    # pandas is not loaded, ``item`` cannot be one of them.
+    pd = sys.modules.get("pandas")
+    return pd is not None and (item is pd.NA or item is pd.NaT)
+
+
+def _set_object(value, item) -> None:
+    if (
+        item is None
+        or (isinstance(item, (float, np.floating)) and np.isnan(item))
+        or _is_pandas_missing(item)
+    ):
+        value.null_value = NULL_VALUE
+    elif isinstance(item, (bool, np.bool_)):
+        value.bool_value = bool(item)
+    elif isinstance(item, (int, float, np.integer, np.floating)):
+        value.number_value = item
+    elif isinstance(item, str):
+        value.string_value = item
+    elif isinstance(item, bytes):
+        value.string_value = item.decode("utf-8")
+    elif isinstance(item, Mapping):
+        value.struct_value.update(item)
+    elif isinstance(item, (list, tuple, np.ndarray)):
+        value.list_value.extend(list(item))
+    elif isinstance(item, np.datetime64):
+        _set_object(value, item.astype("datetime64[us]").item())
+    elif hasattr(item, "isoformat"):
+        # datetime.date and datetime.datetime, pd.Timestamp included.
+        value.string_value = item.isoformat()
+    else:
+        value.string_value = str(item)
+
+
+def _encode_column(rows, name: str, column) -> None:
+    kind = column.dtype.kind
+
+    if kind == "f":
+        nulls = np.isnan(column)
+        for fields, item, null in zip(rows, column.tolist(), nulls.tolist()):
+            if null:
+                fields[name].null_value = NULL_VALUE
+            else:
+                fields[name].number_value = item
+    elif kind in "iu":
+        for fields, item in zip(rows, column.tolist()):
+            fields[name].number_value = item
+    elif kind == "b":
+        for fields, item in zip(rows, column.tolist()):
+            fields[name].bool_value = item
+    elif kind == "U":
+        for fields, item in zip(rows, column.tolist()):
+            fields[name].string_value = item
+    elif kind == "S":
+        for fields, item in zip(rows, column.tolist()):
+            fields[name].string_value = item.decode("utf-8")
+    elif kind == "M":
+        # tolist() gives datetime.date or datetime.datetime objects, and
+        # None for NaT, except for units below microseconds.
+        if np.datetime_data(column.dtype)[0] in ("ns", "ps", "fs", "as"):
+            column = column.astype("datetime64[us]")
+        for fields, item in zip(rows, column.tolist()):
+            if item is None:
+                fields[name].null_value = NULL_VALUE
+            else:
+                fields[name].string_value = item.isoformat()
+    else:
+        for fields, item in zip(rows, column.tolist()):
+            _set_object(fields[name], item)
+
+
+def encode_instances(data: Any, request: Any) -> Any:
+    """Appends one struct instance per row of ``data`` to ``request.instances``.
+
+    Values are written column by column straight into the underlying
+    protobuf repeated field, without building a dict per row or going
+    through proto-plus marshalling. NaN, NaT, ``pd.NA`` and ``None`` cells
+    become ``null``; numbers, booleans and strings keep their type;
+    datetimes, naive or not, are written as ISO 8601 strings by
+    ``isoformat()``, to the microsecond.
+
+    The filled request can be sent with ``client.predict(request=request)``
+    or ``client.explain(request=request)``.
+
+    Args:
+      data: a pandas DataFrame, a NumPy structured/record array, or a mapping
+        of column names to array-likes of equal length
+      request: a ``PredictRequest`` or ``ExplainRequest`` of any API version,
+        either proto-plus or raw protobuf
+
+    Returns:
+      ``request``, with the instances appended
+    """
+    _require_numpy()
+    columns = _columns(data)
+    instances = getattr(request, "_pb", request).instances
+
+    if not columns:
+        return request
+    num_rows = len(columns[0][1])
+    for name, column in columns:
+        if len(column) != num_rows:
+            raise ValueError(
+                "Column {!r} has {} rows, expected {}.".format(
+                    name, len(column), num_rows
+                )
+            )
+
+    rows = [instances.add().struct_value.fields for _ in range(num_rows)]
+    for name, column in columns:
+        _encode_column(rows, name, column)
+    return request
+
+
+__all__ = ("encode_instances",)
@@ -12,13 +12,741 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from __future__ import absolute_import
-from google.protobuf.struct_pb2 import Value
+import base64
+import collections.abc
+import math
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Sequence, Tuple
+
+from google.protobuf.descriptor import Descriptor, FieldDescriptor
+from google.protobuf.internal import type_checkers
+from google.protobuf.message import Message as PbMessage
+from google.protobuf.struct_pb2 import NULL_VALUE, Value
 from google.protobuf import json_format
 from proto.marshal.collections.maps import MapComposite
-from proto.marshal import Marshal
 from proto import Message
 from proto.message import MessageMeta
 
+# Writers copy one field value of a message into a Value; readers set one
+# field of a message from a Value. Both are planned once per message type.
+_Writer = Callable[[object, Value], None]
+_Reader = Callable[[Value, object], None]
+
+_to_value_plans: Dict[str, Dict[FieldDescriptor, Tuple[str, _Writer]]] = {}
+_from_value_plans: Dict[str, Dict[str, Tuple[str, _Reader, bool]]] = {}
+
+_INT64_TYPES = frozenset(
+    (FieldDescriptor.CPPTYPE_INT64, FieldDescriptor.CPPTYPE_UINT64)
+)
+_INT_TYPES = frozenset(
+    (
+        FieldDescriptor.CPPTYPE_INT32,
+        FieldDescriptor.CPPTYPE_UINT32,
+        FieldDescriptor.CPPTYPE_INT64,
+        FieldDescriptor.CPPTYPE_UINT64,
+    )
+)
+_FLOAT_TYPES = frozenset(
+    (FieldDescriptor.CPPTYPE_FLOAT, FieldDescriptor.CPPTYPE_DOUBLE)
+)
+_WRAPPER_TYPES = frozenset(
+    (
+        "google.protobuf.BoolValue",
+        "google.protobuf.BytesValue",
+        "google.protobuf.DoubleValue",
+        "google.protobuf.FloatValue",
+        "google.protobuf.Int32Value",
+        "google.protobuf.Int64Value",
+        "google.protobuf.StringValue",
+        "google.protobuf.UInt32Value",
+        "google.protobuf.UInt64Value",
+    )
+)
+_STRING_TYPES = frozenset(
+    (
+        "google.protobuf.Duration",
+        "google.protobuf.FieldMask",
+        "google.protobuf.Timestamp",
+    )
+)
+_STRUCT_TYPES = frozenset(
+    ("google.protobuf.ListValue", "google.protobuf.Struct", "google.protobuf.Value",)
+)
+_SPECIAL_FLOATS = {"NaN": math.nan, "Infinity": math.inf, "-Infinity": -math.inf}
+
+
+def _is_map(field: FieldDescriptor) -> bool:
+    return (
+        field.type == FieldDescriptor.TYPE_MESSAGE
+        and field.message_type.GetOptions().map_entry
+    )
+
+
+def _is_repeated(field: FieldDescriptor) -> bool:
+    # Newer protobuf releases deprecate FieldDescriptor.label.
+    is_repeated = getattr(field, "is_repeated", None)
+    if is_repeated is not None:
+        return is_repeated
+    return field.label == FieldDescriptor.LABEL_REPEATED
+
+
+# --- message -> Value ---------------------------------------------------
+
+
+def _scalar_writer(field: FieldDescriptor) -> _Writer:
+    cpp_type = field.cpp_type
+
+    if cpp_type == FieldDescriptor.CPPTYPE_MESSAGE:
+        return _message_writer(field.message_type)
+
+    if cpp_type == FieldDescriptor.CPPTYPE_ENUM:
+        enum_type = field.enum_type
+        if enum_type.full_name == "google.protobuf.NullValue":
+
+            def write_null(value, out):
+                out.null_value = NULL_VALUE
+
+            return write_null
+
+        def write_enum(value, out):
+            enum_value = enum_type.values_by_number.get(value)
+            if enum_value is None:
+                out.number_value = value
+            else:
+                out.string_value = enum_value.name
+
+        return write_enum
+
+    if field.type == FieldDescriptor.TYPE_BYTES:
+
+        def write_bytes(value, out):
+            out.string_value = base64.b64encode(value).decode("utf-8")
+
+        return write_bytes
+
+    if cpp_type == FieldDescriptor.CPPTYPE_STRING:
+
+        def write_string(value, out):
+            out.string_value = value
+
+        return write_string
+
+    if cpp_type == FieldDescriptor.CPPTYPE_BOOL:
+
+        def write_bool(value, out):
+            out.bool_value = value
+
+        return write_bool
+
+    if cpp_type in _INT64_TYPES:
+        # int64 values are strings in the proto3 JSON mapping.
+        def write_int64(value, out):
+            out.string_value = str(value)
+
+        return write_int64
+
+    if cpp_type in _FLOAT_TYPES:
+        shorten = cpp_type == FieldDescriptor.CPPTYPE_FLOAT
+
+        def write_float(value, out):
+            if math.isinf(value):
+                out.string_value = "-Infinity" if value < 0 else "Infinity"
+            elif math.isnan(value):
+                out.string_value = "NaN"
+            elif shorten:
+                out.number_value = type_checkers.ToShortestFloat(value)
+            else:
+                out.number_value = value
+
+        return write_float
+
+    def write_number(value, out):
+        out.number_value = value
+
+    return write_number
+
+
+def _message_writer(descriptor: Descriptor) -> _Writer:
+    full_name = descriptor.full_name
+
+    if full_name == "google.protobuf.Value":
+
+        def write_value(value, out):
+            out.CopyFrom(value)
+
+        return write_value
+
+    if full_name == "google.protobuf.Struct":
+
+        def write_struct(value, out):
+            out.struct_value.CopyFrom(value)
+
+        return write_struct
+
+    if full_name == "google.protobuf.ListValue":
+
+        def write_list(value, out):
+            out.list_value.CopyFrom(value)
+
+        return write_list
+
+    if full_name in _STRING_TYPES:
+
+        def write_json_string(value, out):
+            out.string_value = value.ToJsonString()
+
+        return write_json_string
+
+    if full_name in _WRAPPER_TYPES:
+        write_wrapped = _scalar_writer(descriptor.fields_by_name["value"])
+
+        def write_wrapper(value, out):
+            write_wrapped(value.value, out)
+
+        return write_wrapper
+
+    if full_name.startswith("google.protobuf."):
+        # Remaining well-known types (e.g. Any) have bespoke JSON forms.
+        def write_via_json(value, out):
+            json_format.ParseDict(json_format.MessageToDict(value), out)
+
+        return write_via_json
+
+    def write_message(value, out):
+        _message_to_struct(value, out)
+
+    return write_message
+
+
+def _field_writer(
+    field: FieldDescriptor,
+    item_writer: Callable[[FieldDescriptor], _Writer] = _scalar_writer,
+) -> _Writer:
+    if _is_map(field):
+        key_field = field.message_type.fields_by_name["key"]
+        write_item = item_writer(field.message_type.fields_by_name["value"])
+        is_bool_key = key_field.cpp_type == FieldDescriptor.CPPTYPE_BOOL
+
+        def write_map(value, out):
+            fields = out.struct_value.fields
+            for key, item in value.items():
+                if is_bool_key:
+                    key = "true" if key else "false"
+                write_item(item, fields[str(key)])
+
+        return write_map
+
+    write_item = item_writer(field)
+    if not _is_repeated(field):
+        return write_item
+
+    def write_repeated(value, out):
+        values = out.list_value.values
+        for item in value:
+            write_item(item, values.add())
+
+    return write_repeated
+
+
+def _to_value_plan(descriptor: Descriptor):
+    plan = _to_value_plans.get(descriptor.full_name)
+    if plan is None:
+        # Writers of nested messages look up their own plan when called, so
+        # building a plan never recurses. Only publish complete plans: other
+        # threads may be converting the same type.
+        plan = {
+            field: (field.json_name, _field_writer(field))
+            for field in descriptor.fields
+        }
+        plan = _to_value_plans.setdefault(descriptor.full_name, plan)
+    return plan
+
+
+def _message_to_struct(pb, out: Value) -> Value:
+    plan = _to_value_plan(pb.DESCRIPTOR)
+    fields = out.struct_value.fields
+    for field, value in pb.ListFields():
+        json_name, write = plan[field]
+        write(value, fields[json_name])
+    if out.WhichOneof("kind") is None:
+        out.struct_value.SetInParent()
+    return out
+
+
+def _python_item_writer(field: FieldDescriptor) -> _Writer:
+    """Writes one item of ``field`` given as a Python value.
+
+    Message items may also be proto-plus messages, or the Python values
+    proto-plus returns for well-known types (e.g. a float for FloatValue).
+    """
+    if field.cpp_type != FieldDescriptor.CPPTYPE_MESSAGE:
+        write = _scalar_writer(field)
+        if field.cpp_type != FieldDescriptor.CPPTYPE_FLOAT:
+            return write
+
+        # ToShortestFloat only terminates for values that fit a float.
+        def write_float(value, out):
+            write(type_checkers.TruncateToFourByteFloat(value), out)
+
+        return write_float
+
+    descriptor = field.message_type
+    full_name = descriptor.full_name
+    write_message = _message_writer(descriptor)
+
+    if full_name in _WRAPPER_TYPES:
+        write_python = _python_item_writer(descriptor.fields_by_name["value"])
+    elif full_name in _STRUCT_TYPES:
+
+        def write_python(value, out):
+            if isinstance(value, collections.abc.Sequence) and not isinstance(
+                value, str
+            ):
+                value = list(value)
+            out.CopyFrom(_python_to_value(value))
+
+    else:
+        write_python = None
+
+    def write_item(value, out):
+        if isinstance(value, PbMessage):
+            write_message(value, out)
+        elif isinstance(value, Message):
+            write_message(value._pb, out)
+        elif write_python is not None:
+            write_python(value, out)
+        else:
+            raise TypeError(
+                "Expected a {} message, got {!r}.".format(full_name, type(value))
+            )
+
+    return write_item
+
+
+def _column_default(field: FieldDescriptor):
+    # Items equal to this are left unset, as to_value() omits them.
+    if _is_map(field):
+        return {}
+    if _is_repeated(field):
+        return []
+    if field.cpp_type == FieldDescriptor.CPPTYPE_MESSAGE:
+        return None
+    return field.default_value
+
+
+def _column_plan(descriptor: Descriptor, names: Iterable[str]):
+    """Returns ``(name, json_name, default, writer)`` for the named columns."""
+    fields = _from_value_plan(descriptor)
+    plan = []
+    for name in names:
+        if name not in fields:
+            raise ValueError(
+                'Message type "{}" has no field named "{}".'.format(
+                    descriptor.full_name, name
+                )
+            )
+        field = descriptor.fields_by_name[fields[name][0]]
+        plan.append(
+            (
+                name,
+                field.json_name,
+                _column_default(field),
+                _field_writer(field, _python_item_writer),
+            )
+        )
+    return plan
+
+
+def _as_column(column) -> Sequence:
+    # numpy arrays and pandas Series convert to Python scalars in one call.
+    tolist = getattr(column, "tolist", None)
+    if tolist is not None:
+        return tolist()
+    if isinstance(column, (list, tuple)):
+        return column
+    return list(column)
+
+
+# --- Value -> message ---------------------------------------------------
+
+
+def _parse_error(message: str, *args) -> json_format.ParseError:
+    return json_format.ParseError(message.format(*args))
+
+
+def _value_to_python(value: Value, field: FieldDescriptor):
+    kind = value.WhichOneof("kind")
+    if kind == "number_value":
+        return value.number_value
+    if kind == "string_value":
+        return value.string_value
+    if kind == "bool_value":
+        return value.bool_value
+    raise _parse_error(
+        "Invalid value for field {0}: expected a scalar, got {1}.",
+        field.full_name,
+        kind,
+    )
+
+
+def _scalar_converter(field: FieldDescriptor) -> Callable[[Value], object]:
+    cpp_type = field.cpp_type
+
+    if cpp_type in _INT_TYPES:
+
+        def convert_int(value):
+            item = _value_to_python(value, field)
+            if isinstance(item, bool):
+                raise _parse_error("Couldn't parse integer: {0}.", item)
+            if isinstance(item, float):
+                if not item.is_integer():
+                    raise _parse_error("Couldn't parse integer: {0}.", item)
+                return int(item)
+            try:
+                return int(item)
+            except ValueError:
+                raise _parse_error("Couldn't parse integer: {0!r}.", item)
+
+        return convert_int
+
+    if cpp_type in _FLOAT_TYPES:
+
+        def convert_float(value):
+            item = _value_to_python(value, field)
+            if isinstance(item, bool):
+                raise _parse_error("Couldn't parse float: {0}.", item)
+            if isinstance(item, str):
+                if item in _SPECIAL_FLOATS:
+                    return _SPECIAL_FLOATS[item]
+                try:
+                    return float(item)
+                except ValueError:
+                    raise _parse_error("Couldn't parse float: {0!r}.", item)
+            return item
+
+        return convert_float
+
+    if cpp_type == FieldDescriptor.CPPTYPE_BOOL:
+
+        def convert_bool(value):
+            if value.WhichOneof("kind") != "bool_value":
+                raise _parse_error(
+                    "Expected true or false without quotes for {0}.", field.full_name
+                )
+            return value.bool_value
+
+        return convert_bool
+
+    if cpp_type == FieldDescriptor.CPPTYPE_ENUM:
+        enum_type = field.enum_type
+
+        def convert_enum(value):
+            item = _value_to_python(value, field)
+            enum_value = enum_type.values_by_name.get(item)
+            if enum_value is not None:
+                return enum_value.number
+            try:
+                return int(item)
+            except ValueError:
+                raise _parse_error(
+                    "Invalid enum value {0} for enum type {1}.",
+                    item,
+                    enum_type.full_name,
+                )
+
+        return convert_enum
+
+    if field.type == FieldDescriptor.TYPE_BYTES:
+
+        def convert_bytes(value):
+            encoded = _value_to_python(value, field).encode("utf-8")
+            return base64.urlsafe_b64decode(encoded + b"=" * (4 - len(encoded) % 4))
+
+        return convert_bytes
+
+    def convert_string(value):
+        if value.WhichOneof("kind") != "string_value":
+            raise _parse_error(
+                "Invalid value for field {0}: expected a string.", field.full_name
+            )
+        return value.string_value
+
+    return convert_string
+
+
+def _message_filler(descriptor: Descriptor) -> Callable[[Value, object], None]:
+    full_name = descriptor.full_name
+
+    if full_name == "google.protobuf.Value":
+        return lambda value, message: message.CopyFrom(value)
+
+    if full_name == "google.protobuf.Struct":
+        return lambda value, message: message.CopyFrom(value.struct_value)
+
+    if full_name == "google.protobuf.ListValue":
+        return lambda value, message: message.CopyFrom(value.list_value)
+
+    if full_name in _STRING_TYPES:
+        return lambda value, message: message.FromJsonString(value.string_value)
+
+    if full_name in _WRAPPER_TYPES:
+        convert = _scalar_converter(descriptor.fields_by_name["value"])
+
+        def fill_wrapper(value, message):
+            message.value = convert(value)
+
+        return fill_wrapper
+
+    if full_name.startswith("google.protobuf."):
+
+        def fill_via_json(value, message):
+            json_format.ParseDict(json_format.MessageToDict(value), message)
+
+        return fill_via_json
+
+    return _struct_to_message
+
+
+def _field_reader(field: FieldDescriptor) -> _Reader:
+    name = field.name
+
+    if _is_map(field):
+        key_field = field.message_type.fields_by_name["key"]
+        value_field = field.message_type.fields_by_name["value"]
+        convert_key = str
+        if key_field.cpp_type == FieldDescriptor.CPPTYPE_BOOL:
+            convert_key = {"true": True, "false": False}.__getitem__
+        elif key_field.cpp_type in _INT_TYPES:
+            convert_key = int
+
+        if value_field.cpp_type == FieldDescriptor.CPPTYPE_MESSAGE:
+            fill = _message_filler(value_field.message_type)
+
+            def read_message_map(value, message):
+                target = getattr(message, name)
+                for key, item in value.struct_value.fields.items():
+                    fill(item, target[convert_key(key)])
+
+            return read_message_map
+
+        convert = _scalar_converter(value_field)
+
+        def read_scalar_map(value, message):
+            target = getattr(message, name)
+            for key, item in value.struct_value.fields.items():
+                target[convert_key(key)] = convert(item)
+
+        return read_scalar_map
+
+    if field.cpp_type == FieldDescriptor.CPPTYPE_MESSAGE:
+        fill = _message_filler(field.message_type)
+
+        if _is_repeated(field):
+
+            def read_repeated_message(value, message):
+                target = getattr(message, name)
+                for item in value.list_value.values:
+                    fill(item, target.add())
+
+            return read_repeated_message
+
+        def read_message(value, message):
+            target = getattr(message, name)
+            target.SetInParent()
+            fill(value, target)
+
+        return read_message
+
+    convert = _scalar_converter(field)
+
+    if _is_repeated(field):
+
+        def read_repeated_scalar(value, message):
+            getattr(message, name).extend(
+                [convert(item) for item in value.list_value.values]
+            )
+
+        return read_repeated_scalar
+
+    def read_scalar(value, message):
+        setattr(message, name, convert(value))
+
+    return read_scalar
+
+
+def _accepts_null(field: FieldDescriptor) -> bool:
+    if field.message_type is not None:
+        return field.message_type.full_name == "google.protobuf.Value"
+    if field.enum_type is not None:
+        return field.enum_type.full_name == "google.protobuf.NullValue"
+    return False
+
+
+def _from_value_plan(descriptor: Descriptor):
+    plan = _from_value_plans.get(descriptor.full_name)
+    if plan is None:
+        # As in _to_value_plan, only complete plans are published.
+        plan = {}
+        for field in descriptor.fields:
+            entry = (field.name, _field_reader(field), _accepts_null(field))
+            plan[field.json_name] = entry
+            plan[field.name] = entry
+        plan = _from_value_plans.setdefault(descriptor.full_name, plan)
+    return plan
+
+
+def _fill_fields(items, message, descriptor: Descriptor) -> None:
+    """Sets the fields of ``message`` from ``(key, Value)`` pairs."""
+    plan = _from_value_plan(descriptor)
+    for key, item in items:
+        entry = plan.get(key)
+        if entry is None:
+            raise _parse_error(
+                'Message type "{0}" has no field named "{1}".',
+                descriptor.full_name,
+                key,
+            )
+        name, read, accepts_null = entry
+        if not accepts_null and item.WhichOneof("kind") == "null_value":
+            # null means "not set" for every other field type.
+            message.ClearField(name)
+            continue
+        read(item, message)
+
+
+def _struct_to_message(value: Value, message) -> None:
+    descriptor = message.DESCRIPTOR
+    if value.WhichOneof("kind") != "struct_value":
+        raise _parse_error(
+            "Expected an object for message type {0}.", descriptor.full_name
+        )
+    _fill_fields(value.struct_value.fields.items(), message, descriptor)
+
+
+def _python_to_value(item) -> Value:
+    value = Value()
+    if item is None:
+        value.null_value = NULL_VALUE
+    elif isinstance(item, bool):
+        value.bool_value = item
+    elif isinstance(item, (int, float)):
+        value.number_value = item
+    elif isinstance(item, str):
+        value.string_value = item
+    elif isinstance(item, Mapping):
+        value.struct_value.update(item)
+    elif isinstance(item, (list, tuple)):
+        value.list_value.extend(item)
+    elif isinstance(item, PbMessage):
+        _message_to_struct(item, value)
+    else:
+        raise _parse_error("Unsupported map value {0!r}.", item)
+    return value
+
+
+def _map_items(map_):
+    """Yields ``(key, Value)`` pairs of a MapComposite or a plain mapping."""
+    pb = getattr(map_, "pb", map_)
+    for key, item in pb.items():
+        if not isinstance(item, Value):
+            item = _python_to_value(item)
+        yield key, item
+
+
+def _as_value(instance) -> Value:
+    """Returns ``instance`` as a :class:`~google.protobuf.struct_pb2.Value`.
+
+    Enhanced schema types are converted with their ``to_value()`` method.
+    """
+    if isinstance(instance, Value):
+        return instance
+    if callable(getattr(instance, "to_value", None)):
+        return instance.to_value()
+    raise TypeError(
+        "Expected a google.protobuf.struct_pb2.Value or an enhanced schema "
+        "type, got {!r}.".format(type(instance))
+    )
+
+
+class _Converter:
+    """Converts between one message class and ``Value``.
+
+    Instances are created once per class by :func:`_get_converter`; the
+    field plan of the class is built on first use.
+    """
+
+    __slots__ = ("_pb_type", "_descriptor")
+
+    def __init__(self, cls: MessageMeta):
+        self._pb_type = cls.pb()
+        self._descriptor = self._pb_type.DESCRIPTOR
+
+    def from_value(self, value: Value):
+        message = self._pb_type()
+        _struct_to_message(value, message)
+        return message
+
+    def from_map(self, map_):
+        message = self._pb_type()
+        _fill_fields(_map_items(map_), message, self._descriptor)
+        return message
+
+    def to_values(self, messages: Iterable) -> List[Value]:
+        plan = _to_value_plan(self._descriptor)
+        values = []
+        for message in messages:
+            out = Value()
+            fields = out.struct_value.fields
+            for field, value in getattr(message, "_pb", message).ListFields():
+                json_name, write = plan[field]
+                write(value, fields[json_name])
+            if not fields:
+                out.struct_value.SetInParent()
+            values.append(out)
+        return values
+
+    def from_values(self, values: Iterable[Value]) -> list:
+        pb_type = self._pb_type
+        messages = []
+        for value in values:
+            message = pb_type()
+            _struct_to_message(value, message)
+            messages.append(message)
+        return messages
+
+    def columns_to_values(self, columns: Mapping[str, Any]) -> List[Value]:
+        columns = {name: _as_column(column) for name, column in columns.items()}
+        lengths = {len(column) for column in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(
+                "Columns must all have the same length, got {}.".format(
+                    {name: len(column) for name, column in columns.items()}
+                )
+            )
+        values = [Value() for _ in range(lengths.pop() if lengths else 0)]
+        structs = []
+        for value in values:
+            value.struct_value.SetInParent()
+            structs.append(value.struct_value.fields)
+        for name, json_name, default, write in _column_plan(self._descriptor, columns):
+            for item, fields in zip(columns[name], structs):
+                if item is not None and item != default:
+                    write(item, fields[json_name])
+        return values
+
+
+_converters: Dict[MessageMeta, _Converter] = {}
+
+
+def _get_converter(cls: MessageMeta) -> _Converter:
+    """Returns the process-wide converter for ``cls``."""
+    converter = _converters.get(cls)
+    if converter is None:
+        converter = _converters.setdefault(cls, _Converter(cls))
+    return converter
+
+
+# --- public API ---------------------------------------------------------
+
 
 def to_value(self: Message) -> Value:
     """Converts a message type to a :class:`~google.protobuf.struct_pb2.Value` object.
@@ -29,8 +757,7 @@ def to_value(self: Message) -> Value:
     Returns:
       the message as a :class:`~google.protobuf.struct_pb2.Value` object
     """
-    tmp_dict = json_format.MessageToDict(self._pb)
-    return json_format.ParseDict(tmp_dict, Value())
+    return _message_to_struct(getattr(self, "_pb", self), Value())
 
 
 def from_value(cls: MessageMeta, value: Value) -> Message:
@@ -42,8 +769,7 @@ def from_value(cls: MessageMeta, value: Value) -> Message:
     Returns:
       Instance of class
     """
-    value_dict = json_format.MessageToDict(value)
-    return json_format.ParseDict(value_dict, cls()._pb)
+    return _get_converter(cls).from_value(value)
 
 
 def from_map(cls: MessageMeta, map_: MapComposite) -> Message:
@@ -55,6 +781,48 @@ def from_map(cls: MessageMeta, map_: MapComposite) -> Message:
     Returns:
       Instance of class
     """
-    marshal = Marshal(name="marshal")
-    pb = marshal.to_proto(Value, map_)
-    return from_value(cls, pb)
+    return _get_converter(cls).from_map(map_)
+
+
+def to_values(cls: MessageMeta, messages: Iterable[Message]) -> List[Value]:
+    """Converts many messages of a class to :class:`~google.protobuf.struct_pb2.Value` objects.
+
+    The conversion plan of the class is looked up once for all messages.
+
+    Args:
+      messages: an iterable of messages of the class
+
+    Returns:
+      a list of :class:`~google.protobuf.struct_pb2.Value` objects, in order
+    """
+    return _get_converter(cls).to_values(messages)
+
+
+def from_values(cls: MessageMeta, values: Iterable[Value]) -> List[Message]:
+    """Creates instances of class from :class:`~google.protobuf.struct_pb2.Value` objects.
+
+    Args:
+      values: an iterable of :class:`~google.protobuf.struct_pb2.Value` objects
+
+    Returns:
+      a list of instances of class, in order
+    """
+    return _get_converter(cls).from_values(values)
+
+
+def columns_to_values(cls: MessageMeta, columns: Mapping[str, Any]) -> List[Value]:
+    """Builds :class:`~google.protobuf.struct_pb2.Value` objects from columns of field values.
+
+    No message is created: each column is written straight into the
+    values, one field at a time. Columns are keyed by field name (or its
+    JSON name) and may be lists, tuples, numpy arrays or pandas Series of
+    equal length. A ``None`` or default item leaves the field unset for
+    that row, as :meth:`to_value` does.
+
+    Args:
+      columns: a mapping of field name to a column of field values
+
+    Returns:
+      one :class:`~google.protobuf.struct_pb2.Value` object per row
+    """
+    return _get_converter(cls).columns_to_values(columns)
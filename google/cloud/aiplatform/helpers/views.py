@@ -0,0 +1,152 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import absolute_import
+import collections.abc
+from typing import Any, Callable, Iterator
+
+from google.protobuf.struct_pb2 import Value
+from proto.message import MessageMeta
+
+
+def _identity(item: Any) -> Any:
+    return item
+
+
+def _value_to_python(value: Value) -> Any:
+    """Converts one ``Value``; structs and lists become lazy views."""
+    kind = value.WhichOneof("kind")
+    if kind == "struct_value":
+        return StructView(value.struct_value)
+    if kind == "list_value":
+        return SequenceView(value.list_value.values, _value_to_python)
+    if kind is None or kind == "null_value":
+        return None
+    return getattr(value, kind)
+
+
+class SequenceView(collections.abc.Sequence):
+    """A read-only view converting the items of a repeated field on access.
+
+    Nothing is converted or cached up front: every access converts the
+    item it returns, and slicing returns another view.
+
+    Args:
+        items: A raw protobuf repeated field.
+        convert (Callable[[Any], Any]): Converts one raw item.
+    """
+
+    __slots__ = ("_items", "_convert")
+
+    def __init__(self, items, convert: Callable[[Any], Any] = _identity):
+        self._items = items
+        self._convert = convert
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return SequenceView(self._items[index], self._convert)
+        return self._convert(self._items[index])
+
+    def __iter__(self) -> Iterator[Any]:
+        convert = self._convert
+        for item in self._items:
+            yield convert(item)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, collections.abc.Sequence) or isinstance(other, str):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return "<SequenceView of {} items>".format(len(self))
+
+
+class StructView(collections.abc.Mapping):
+    """A read-only view of a ``Struct`` converting its values on access.
+
+    Args:
+        struct (google.protobuf.struct_pb2.Struct): The struct to view.
+    """
+
+    __slots__ = ("_fields",)
+
+    def __init__(self, struct):
+        self._fields = struct.fields
+
+    def __getitem__(self, key: str) -> Any:
+        # Indexing a protobuf map inserts missing keys; check first.
+        if key not in self._fields:
+            raise KeyError(key)
+        return _value_to_python(self._fields[key])
+
+    def __contains__(self, key) -> bool:
+        return key in self._fields
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._fields)
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def __repr__(self) -> str:
+        return "<StructView of {} fields>".format(len(self))
+
+
+def repeated_view(message: Any, name: str) -> SequenceView:
+    """Returns a lazy view of the repeated field ``name`` of ``message``.
+
+    ``google.protobuf.Value`` items are converted to Python values, with
+    structs and lists as nested views. Other message items are wrapped
+    in their proto-plus class without copying. Scalars are returned as
+    they are.
+
+    Args:
+      message: a proto-plus message, e.g. a ``PredictResponse`` or a
+        ``ListDataItemsResponse``
+      name: the name of a repeated field of ``message``
+
+    Returns:
+      a :class:`SequenceView` over the field
+    """
+    field = type(message).meta.fields[name]
+    if not field.repeated:
+        raise ValueError("{} is not a repeated field.".format(name))
+    items = getattr(message._pb, name)
+    if field.message is Value:
+        return SequenceView(items, _value_to_python)
+    if isinstance(field.message, MessageMeta):
+        return SequenceView(items, field.message.wrap)
+    return SequenceView(items)
+
+
+def predictions(response: Any) -> SequenceView:
+    """Returns a lazy view of ``response.predictions``.
+
+    Args:
+      response: a ``PredictResponse`` or ``ExplainResponse``
+
+    Returns:
+      a :class:`SequenceView` of Python values
+    """
+    return repeated_view(response, "predictions")
+
+
+__all__ = (
+    "SequenceView",
+    "StructView",
+    "predictions",
+    "repeated_view",
+)
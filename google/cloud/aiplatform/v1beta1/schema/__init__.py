@@ -15,11 +15,17 @@
 # limitations under the License.
 
 
-from google.cloud.aiplatform.v1beta1.schema import predict
-from google.cloud.aiplatform.v1beta1.schema import trainingjob
-
+from google.cloud.aiplatform.helpers import _lazy
 
 __all__ = (
     "predict",
     "trainingjob",
 )
+
+__getattr__, __dir__ = _lazy.attach(
+    globals(),
+    {
+        "predict": "google.cloud.aiplatform.v1beta1.schema.predict",
+        "trainingjob": "google.cloud.aiplatform.v1beta1.schema.trainingjob",
+    },
+)
@@ -15,6 +15,7 @@
 # limitations under the License.
 
 
+from google.cloud.aiplatform.helpers import _decorators
 from google.cloud.aiplatform.v1beta1.schema.predict import instance
 from google.cloud.aiplatform.v1beta1.schema.predict import params
 from google.cloud.aiplatform.v1beta1.schema.predict import prediction
@@ -24,3 +25,7 @@ __all__ = (
     "params",
     "prediction",
 )
+
+# Every import of an enhanced type runs this package first.
+for pkg in (instance, params, prediction):
+    _decorators._add_methods_to_classes_in_package(pkg)
@@ -15,6 +15,10 @@
 # limitations under the License.
 
 
+from google.cloud.aiplatform.helpers import _decorators
 from google.cloud.aiplatform.v1beta1.schema.trainingjob import definition
 
 __all__ = ("definition",)
+
+# Every import of an enhanced type runs this package first.
+_decorators._add_methods_to_classes_in_package(definition)
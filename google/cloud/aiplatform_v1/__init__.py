@@ -15,168 +15,354 @@
 # limitations under the License.
 #
 
-from .services.dataset_service import DatasetServiceClient
-from .services.endpoint_service import EndpointServiceClient
-from .services.job_service import JobServiceClient
-from .services.migration_service import MigrationServiceClient
-from .services.model_service import ModelServiceClient
-from .services.pipeline_service import PipelineServiceClient
-from .services.prediction_service import PredictionServiceClient
-from .services.specialist_pool_service import SpecialistPoolServiceClient
-from .types.accelerator_type import AcceleratorType
-from .types.annotation import Annotation
-from .types.annotation_spec import AnnotationSpec
-from .types.batch_prediction_job import BatchPredictionJob
-from .types.completion_stats import CompletionStats
-from .types.custom_job import ContainerSpec
-from .types.custom_job import CustomJob
-from .types.custom_job import CustomJobSpec
-from .types.custom_job import PythonPackageSpec
-from .types.custom_job import Scheduling
-from .types.custom_job import WorkerPoolSpec
-from .types.data_item import DataItem
-from .types.data_labeling_job import ActiveLearningConfig
-from .types.data_labeling_job import DataLabelingJob
-from .types.data_labeling_job import SampleConfig
-from .types.data_labeling_job import TrainingConfig
-from .types.dataset import Dataset
-from .types.dataset import ExportDataConfig
-from .types.dataset import ImportDataConfig
-from .types.dataset_service import CreateDatasetOperationMetadata
-from .types.dataset_service import CreateDatasetRequest
-from .types.dataset_service import DeleteDatasetRequest
-from .types.dataset_service import ExportDataOperationMetadata
-from .types.dataset_service import ExportDataRequest
-from .types.dataset_service import ExportDataResponse
-from .types.dataset_service import GetAnnotationSpecRequest
-from .types.dataset_service import GetDatasetRequest
-from .types.dataset_service import ImportDataOperationMetadata
-from .types.dataset_service import ImportDataRequest
-from .types.dataset_service import ImportDataResponse
-from .types.dataset_service import ListAnnotationsRequest
-from .types.dataset_service import ListAnnotationsResponse
-from .types.dataset_service import ListDataItemsRequest
-from .types.dataset_service import ListDataItemsResponse
-from .types.dataset_service import ListDatasetsRequest
-from .types.dataset_service import ListDatasetsResponse
-from .types.dataset_service import UpdateDatasetRequest
-from .types.deployed_model_ref import DeployedModelRef
-from .types.encryption_spec import EncryptionSpec
-from .types.endpoint import DeployedModel
-from .types.endpoint import Endpoint
-from .types.endpoint_service import CreateEndpointOperationMetadata
-from .types.endpoint_service import CreateEndpointRequest
-from .types.endpoint_service import DeleteEndpointRequest
-from .types.endpoint_service import DeployModelOperationMetadata
-from .types.endpoint_service import DeployModelRequest
-from .types.endpoint_service import DeployModelResponse
-from .types.endpoint_service import GetEndpointRequest
-from .types.endpoint_service import ListEndpointsRequest
-from .types.endpoint_service import ListEndpointsResponse
-from .types.endpoint_service import UndeployModelOperationMetadata
-from .types.endpoint_service import UndeployModelRequest
-from .types.endpoint_service import UndeployModelResponse
-from .types.endpoint_service import UpdateEndpointRequest
-from .types.env_var import EnvVar
-from .types.hyperparameter_tuning_job import HyperparameterTuningJob
-from .types.io import BigQueryDestination
-from .types.io import BigQuerySource
-from .types.io import ContainerRegistryDestination
-from .types.io import GcsDestination
-from .types.io import GcsSource
-from .types.job_service import CancelBatchPredictionJobRequest
-from .types.job_service import CancelCustomJobRequest
-from .types.job_service import CancelDataLabelingJobRequest
-from .types.job_service import CancelHyperparameterTuningJobRequest
-from .types.job_service import CreateBatchPredictionJobRequest
-from .types.job_service import CreateCustomJobRequest
-from .types.job_service import CreateDataLabelingJobRequest
-from .types.job_service import CreateHyperparameterTuningJobRequest
-from .types.job_service import DeleteBatchPredictionJobRequest
-from .types.job_service import DeleteCustomJobRequest
-from .types.job_service import DeleteDataLabelingJobRequest
-from .types.job_service import DeleteHyperparameterTuningJobRequest
-from .types.job_service import GetBatchPredictionJobRequest
-from .types.job_service import GetCustomJobRequest
-from .types.job_service import GetDataLabelingJobRequest
-from .types.job_service import GetHyperparameterTuningJobRequest
-from .types.job_service import ListBatchPredictionJobsRequest
-from .types.job_service import ListBatchPredictionJobsResponse
-from .types.job_service import ListCustomJobsRequest
-from .types.job_service import ListCustomJobsResponse
-from .types.job_service import ListDataLabelingJobsRequest
-from .types.job_service import ListDataLabelingJobsResponse
-from .types.job_service import ListHyperparameterTuningJobsRequest
-from .types.job_service import ListHyperparameterTuningJobsResponse
-from .types.job_state import JobState
-from .types.machine_resources import AutomaticResources
-from .types.machine_resources import BatchDedicatedResources
-from .types.machine_resources import DedicatedResources
-from .types.machine_resources import DiskSpec
-from .types.machine_resources import MachineSpec
-from .types.machine_resources import ResourcesConsumed
-from .types.manual_batch_tuning_parameters import ManualBatchTuningParameters
-from .types.migratable_resource import MigratableResource
-from .types.migration_service import BatchMigrateResourcesOperationMetadata
-from .types.migration_service import BatchMigrateResourcesRequest
-from .types.migration_service import BatchMigrateResourcesResponse
-from .types.migration_service import MigrateResourceRequest
-from .types.migration_service import MigrateResourceResponse
-from .types.migration_service import SearchMigratableResourcesRequest
-from .types.migration_service import SearchMigratableResourcesResponse
-from .types.model import Model
-from .types.model import ModelContainerSpec
-from .types.model import Port
-from .types.model import PredictSchemata
-from .types.model_evaluation import ModelEvaluation
-from .types.model_evaluation_slice import ModelEvaluationSlice
-from .types.model_service import DeleteModelRequest
-from .types.model_service import ExportModelOperationMetadata
-from .types.model_service import ExportModelRequest
-from .types.model_service import ExportModelResponse
-from .types.model_service import GetModelEvaluationRequest
-from .types.model_service import GetModelEvaluationSliceRequest
-from .types.model_service import GetModelRequest
-from .types.model_service import ListModelEvaluationSlicesRequest
-from .types.model_service import ListModelEvaluationSlicesResponse
-from .types.model_service import ListModelEvaluationsRequest
-from .types.model_service import ListModelEvaluationsResponse
-from .types.model_service import ListModelsRequest
-from .types.model_service import ListModelsResponse
-from .types.model_service import UpdateModelRequest
-from .types.model_service import UploadModelOperationMetadata
-from .types.model_service import UploadModelRequest
-from .types.model_service import UploadModelResponse
-from .types.operation import DeleteOperationMetadata
-from .types.operation import GenericOperationMetadata
-from .types.pipeline_service import CancelTrainingPipelineRequest
-from .types.pipeline_service import CreateTrainingPipelineRequest
-from .types.pipeline_service import DeleteTrainingPipelineRequest
-from .types.pipeline_service import GetTrainingPipelineRequest
-from .types.pipeline_service import ListTrainingPipelinesRequest
-from .types.pipeline_service import ListTrainingPipelinesResponse
-from .types.pipeline_state import PipelineState
-from .types.prediction_service import PredictRequest
-from .types.prediction_service import PredictResponse
-from .types.specialist_pool import SpecialistPool
-from .types.specialist_pool_service import CreateSpecialistPoolOperationMetadata
-from .types.specialist_pool_service import CreateSpecialistPoolRequest
-from .types.specialist_pool_service import DeleteSpecialistPoolRequest
-from .types.specialist_pool_service import GetSpecialistPoolRequest
-from .types.specialist_pool_service import ListSpecialistPoolsRequest
-from .types.specialist_pool_service import ListSpecialistPoolsResponse
-from .types.specialist_pool_service import UpdateSpecialistPoolOperationMetadata
-from .types.specialist_pool_service import UpdateSpecialistPoolRequest
-from .types.study import Measurement
-from .types.study import StudySpec
-from .types.study import Trial
-from .types.training_pipeline import FilterSplit
-from .types.training_pipeline import FractionSplit
-from .types.training_pipeline import InputDataConfig
-from .types.training_pipeline import PredefinedSplit
-from .types.training_pipeline import TimestampSplit
-from .types.training_pipeline import TrainingPipeline
-from .types.user_action_reference import UserActionReference
+import importlib
+import sys
+import typing
+
+if typing.TYPE_CHECKING or sys.version_info < (3, 7):
+    from .services.dataset_service import DatasetServiceClient
+    from .services.endpoint_service import EndpointServiceClient
+    from .services.job_service import JobServiceClient
+    from .services.migration_service import MigrationServiceClient
+    from .services.model_service import ModelServiceClient
+    from .services.pipeline_service import PipelineServiceClient
+    from .services.prediction_service import PredictionServiceClient
+    from .services.specialist_pool_service import SpecialistPoolServiceClient
+    from .types.accelerator_type import AcceleratorType
+    from .types.annotation import Annotation
+    from .types.annotation_spec import AnnotationSpec
+    from .types.batch_prediction_job import BatchPredictionJob
+    from .types.completion_stats import CompletionStats
+    from .types.custom_job import ContainerSpec
+    from .types.custom_job import CustomJob
+    from .types.custom_job import CustomJobSpec
+    from .types.custom_job import PythonPackageSpec
+    from .types.custom_job import Scheduling
+    from .types.custom_job import WorkerPoolSpec
+    from .types.data_item import DataItem
+    from .types.data_labeling_job import ActiveLearningConfig
+    from .types.data_labeling_job import DataLabelingJob
+    from .types.data_labeling_job import SampleConfig
+    from .types.data_labeling_job import TrainingConfig
+    from .types.dataset import Dataset
+    from .types.dataset import ExportDataConfig
+    from .types.dataset import ImportDataConfig
+    from .types.dataset_service import CreateDatasetOperationMetadata
+    from .types.dataset_service import CreateDatasetRequest
+    from .types.dataset_service import DeleteDatasetRequest
+    from .types.dataset_service import ExportDataOperationMetadata
+    from .types.dataset_service import ExportDataRequest
+    from .types.dataset_service import ExportDataResponse
+    from .types.dataset_service import GetAnnotationSpecRequest
+    from .types.dataset_service import GetDatasetRequest
+    from .types.dataset_service import ImportDataOperationMetadata
+    from .types.dataset_service import ImportDataRequest
+    from .types.dataset_service import ImportDataResponse
+    from .types.dataset_service import ListAnnotationsRequest
+    from .types.dataset_service import ListAnnotationsResponse
+    from .types.dataset_service import ListDataItemsRequest
+    from .types.dataset_service import ListDataItemsResponse
+    from .types.dataset_service import ListDatasetsRequest
+    from .types.dataset_service import ListDatasetsResponse
+    from .types.dataset_service import UpdateDatasetRequest
+    from .types.deployed_model_ref import DeployedModelRef
+    from .types.encryption_spec import EncryptionSpec
+    from .types.endpoint import DeployedModel
+    from .types.endpoint import Endpoint
+    from .types.endpoint_service import CreateEndpointOperationMetadata
+    from .types.endpoint_service import CreateEndpointRequest
+    from .types.endpoint_service import DeleteEndpointRequest
+    from .types.endpoint_service import DeployModelOperationMetadata
+    from .types.endpoint_service import DeployModelRequest
+    from .types.endpoint_service import DeployModelResponse
+    from .types.endpoint_service import GetEndpointRequest
+    from .types.endpoint_service import ListEndpointsRequest
+    from .types.endpoint_service import ListEndpointsResponse
+    from .types.endpoint_service import UndeployModelOperationMetadata
+    from .types.endpoint_service import UndeployModelRequest
+    from .types.endpoint_service import UndeployModelResponse
+    from .types.endpoint_service import UpdateEndpointRequest
+    from .types.env_var import EnvVar
+    from .types.hyperparameter_tuning_job import HyperparameterTuningJob
+    from .types.io import BigQueryDestination
+    from .types.io import BigQuerySource
+    from .types.io import ContainerRegistryDestination
+    from .types.io import GcsDestination
+    from .types.io import GcsSource
+    from .types.job_service import CancelBatchPredictionJobRequest
+    from .types.job_service import CancelCustomJobRequest
+    from .types.job_service import CancelDataLabelingJobRequest
+    from .types.job_service import CancelHyperparameterTuningJobRequest
+    from .types.job_service import CreateBatchPredictionJobRequest
+    from .types.job_service import CreateCustomJobRequest
+    from .types.job_service import CreateDataLabelingJobRequest
+    from .types.job_service import CreateHyperparameterTuningJobRequest
+    from .types.job_service import DeleteBatchPredictionJobRequest
+    from .types.job_service import DeleteCustomJobRequest
+    from .types.job_service import DeleteDataLabelingJobRequest
+    from .types.job_service import DeleteHyperparameterTuningJobRequest
+    from .types.job_service import GetBatchPredictionJobRequest
+    from .types.job_service import GetCustomJobRequest
+    from .types.job_service import GetDataLabelingJobRequest
+    from .types.job_service import GetHyperparameterTuningJobRequest
+    from .types.job_service import ListBatchPredictionJobsRequest
+    from .types.job_service import ListBatchPredictionJobsResponse
+    from .types.job_service import ListCustomJobsRequest
+    from .types.job_service import ListCustomJobsResponse
+    from .types.job_service import ListDataLabelingJobsRequest
+    from .types.job_service import ListDataLabelingJobsResponse
+    from .types.job_service import ListHyperparameterTuningJobsRequest
+    from .types.job_service import ListHyperparameterTuningJobsResponse
+    from .types.job_state import JobState
+    from .types.machine_resources import AutomaticResources
+    from .types.machine_resources import BatchDedicatedResources
+    from .types.machine_resources import DedicatedResources
+    from .types.machine_resources import DiskSpec
+    from .types.machine_resources import MachineSpec
+    from .types.machine_resources import ResourcesConsumed
+    from .types.manual_batch_tuning_parameters import ManualBatchTuningParameters
+    from .types.migratable_resource import MigratableResource
+    from .types.migration_service import BatchMigrateResourcesOperationMetadata
+    from .types.migration_service import BatchMigrateResourcesRequest
+    from .types.migration_service import BatchMigrateResourcesResponse
+    from .types.migration_service import MigrateResourceRequest
+    from .types.migration_service import MigrateResourceResponse
+    from .types.migration_service import SearchMigratableResourcesRequest
+    from .types.migration_service import SearchMigratableResourcesResponse
+    from .types.model import Model
+    from .types.model import ModelContainerSpec
+    from .types.model import Port
+    from .types.model import PredictSchemata
+    from .types.model_evaluation import ModelEvaluation
+    from .types.model_evaluation_slice import ModelEvaluationSlice
+    from .types.model_service import DeleteModelRequest
+    from .types.model_service import ExportModelOperationMetadata
+    from .types.model_service import ExportModelRequest
+    from .types.model_service import ExportModelResponse
+    from .types.model_service import GetModelEvaluationRequest
+    from .types.model_service import GetModelEvaluationSliceRequest
+    from .types.model_service import GetModelRequest
+    from .types.model_service import ListModelEvaluationSlicesRequest
+    from .types.model_service import ListModelEvaluationSlicesResponse
+    from .types.model_service import ListModelEvaluationsRequest
+    from .types.model_service import ListModelEvaluationsResponse
+    from .types.model_service import ListModelsRequest
+    from .types.model_service import ListModelsResponse
+    from .types.model_service import UpdateModelRequest
+    from .types.model_service import UploadModelOperationMetadata
+    from .types.model_service import UploadModelRequest
+    from .types.model_service import UploadModelResponse
+    from .types.operation import DeleteOperationMetadata
+    from .types.operation import GenericOperationMetadata
+    from .types.pipeline_service import CancelTrainingPipelineRequest
+    from .types.pipeline_service import CreateTrainingPipelineRequest
+    from .types.pipeline_service import DeleteTrainingPipelineRequest
+    from .types.pipeline_service import GetTrainingPipelineRequest
+    from .types.pipeline_service import ListTrainingPipelinesRequest
+    from .types.pipeline_service import ListTrainingPipelinesResponse
+    from .types.pipeline_state import PipelineState
+    from .types.prediction_service import PredictRequest
+    from .types.prediction_service import PredictResponse
+    from .types.specialist_pool import SpecialistPool
+    from .types.specialist_pool_service import CreateSpecialistPoolOperationMetadata
+    from .types.specialist_pool_service import CreateSpecialistPoolRequest
+    from .types.specialist_pool_service import DeleteSpecialistPoolRequest
+    from .types.specialist_pool_service import GetSpecialistPoolRequest
+    from .types.specialist_pool_service import ListSpecialistPoolsRequest
+    from .types.specialist_pool_service import ListSpecialistPoolsResponse
+    from .types.specialist_pool_service import UpdateSpecialistPoolOperationMetadata
+    from .types.specialist_pool_service import UpdateSpecialistPoolRequest
+    from .types.study import Measurement
+    from .types.study import StudySpec
+    from .types.study import Trial
+    from .types.training_pipeline import FilterSplit
+    from .types.training_pipeline import FractionSplit
+    from .types.training_pipeline import InputDataConfig
+    from .types.training_pipeline import PredefinedSplit
+    from .types.training_pipeline import TimestampSplit
+    from .types.training_pipeline import TrainingPipeline
+    from .types.user_action_reference import UserActionReference
+else:
+    _SUBMODULES = ("services", "types")
+    _LAZY_ATTRIBUTES = {
+        "DatasetServiceClient": ".services.dataset_service",
+        "EndpointServiceClient": ".services.endpoint_service",
+        "JobServiceClient": ".services.job_service",
+        "MigrationServiceClient": ".services.migration_service",
+        "ModelServiceClient": ".services.model_service",
+        "PipelineServiceClient": ".services.pipeline_service",
+        "PredictionServiceClient": ".services.prediction_service",
+        "SpecialistPoolServiceClient": ".services.specialist_pool_service",
+        "AcceleratorType": ".types.accelerator_type",
+        "Annotation": ".types.annotation",
+        "AnnotationSpec": ".types.annotation_spec",
+        "BatchPredictionJob": ".types.batch_prediction_job",
+        "CompletionStats": ".types.completion_stats",
+        "ContainerSpec": ".types.custom_job",
+        "CustomJob": ".types.custom_job",
+        "CustomJobSpec": ".types.custom_job",
+        "PythonPackageSpec": ".types.custom_job",
+        "Scheduling": ".types.custom_job",
+        "WorkerPoolSpec": ".types.custom_job",
+        "DataItem": ".types.data_item",
+        "ActiveLearningConfig": ".types.data_labeling_job",
+        "DataLabelingJob": ".types.data_labeling_job",
+        "SampleConfig": ".types.data_labeling_job",
+        "TrainingConfig": ".types.data_labeling_job",
+        "Dataset": ".types.dataset",
+        "ExportDataConfig": ".types.dataset",
+        "ImportDataConfig": ".types.dataset",
+        "CreateDatasetOperationMetadata": ".types.dataset_service",
+        "CreateDatasetRequest": ".types.dataset_service",
+        "DeleteDatasetRequest": ".types.dataset_service",
+        "ExportDataOperationMetadata": ".types.dataset_service",
+        "ExportDataRequest": ".types.dataset_service",
+        "ExportDataResponse": ".types.dataset_service",
+        "GetAnnotationSpecRequest": ".types.dataset_service",
+        "GetDatasetRequest": ".types.dataset_service",
+        "ImportDataOperationMetadata": ".types.dataset_service",
+        "ImportDataRequest": ".types.dataset_service",
+        "ImportDataResponse": ".types.dataset_service",
+        "ListAnnotationsRequest": ".types.dataset_service",
+        "ListAnnotationsResponse": ".types.dataset_service",
+        "ListDataItemsRequest": ".types.dataset_service",
+        "ListDataItemsResponse": ".types.dataset_service",
+        "ListDatasetsRequest": ".types.dataset_service",
+        "ListDatasetsResponse": ".types.dataset_service",
+        "UpdateDatasetRequest": ".types.dataset_service",
+        "DeployedModelRef": ".types.deployed_model_ref",
+        "EncryptionSpec": ".types.encryption_spec",
+        "DeployedModel": ".types.endpoint",
+        "Endpoint": ".types.endpoint",
+        "CreateEndpointOperationMetadata": ".types.endpoint_service",
+        "CreateEndpointRequest": ".types.endpoint_service",
+        "DeleteEndpointRequest": ".types.endpoint_service",
+        "DeployModelOperationMetadata": ".types.endpoint_service",
+        "DeployModelRequest": ".types.endpoint_service",
+        "DeployModelResponse": ".types.endpoint_service",
+        "GetEndpointRequest": ".types.endpoint_service",
+        "ListEndpointsRequest": ".types.endpoint_service",
+        "ListEndpointsResponse": ".types.endpoint_service",
+        "UndeployModelOperationMetadata": ".types.endpoint_service",
+        "UndeployModelRequest": ".types.endpoint_service",
+        "UndeployModelResponse": ".types.endpoint_service",
+        "UpdateEndpointRequest": ".types.endpoint_service",
+        "EnvVar": ".types.env_var",
+        "HyperparameterTuningJob": ".types.hyperparameter_tuning_job",
+        "BigQueryDestination": ".types.io",
+        "BigQuerySource": ".types.io",
+        "ContainerRegistryDestination": ".types.io",
+        "GcsDestination": ".types.io",
+        "GcsSource": ".types.io",
+        "CancelBatchPredictionJobRequest": ".types.job_service",
+        "CancelCustomJobRequest": ".types.job_service",
+        "CancelDataLabelingJobRequest": ".types.job_service",
+        "CancelHyperparameterTuningJobRequest": ".types.job_service",
+        "CreateBatchPredictionJobRequest": ".types.job_service",
+        "CreateCustomJobRequest": ".types.job_service",
+        "CreateDataLabelingJobRequest": ".types.job_service",
+        "CreateHyperparameterTuningJobRequest": ".types.job_service",
+        "DeleteBatchPredictionJobRequest": ".types.job_service",
+        "DeleteCustomJobRequest": ".types.job_service",
+        "DeleteDataLabelingJobRequest": ".types.job_service",
+        "DeleteHyperparameterTuningJobRequest": ".types.job_service",
+        "GetBatchPredictionJobRequest": ".types.job_service",
+        "GetCustomJobRequest": ".types.job_service",
+        "GetDataLabelingJobRequest": ".types.job_service",
+        "GetHyperparameterTuningJobRequest": ".types.job_service",
+        "ListBatchPredictionJobsRequest": ".types.job_service",
+        "ListBatchPredictionJobsResponse": ".types.job_service",
+        "ListCustomJobsRequest": ".types.job_service",
+        "ListCustomJobsResponse": ".types.job_service",
+        "ListDataLabelingJobsRequest": ".types.job_service",
+        "ListDataLabelingJobsResponse": ".types.job_service",
+        "ListHyperparameterTuningJobsRequest": ".types.job_service",
+        "ListHyperparameterTuningJobsResponse": ".types.job_service",
+        "JobState": ".types.job_state",
+        "AutomaticResources": ".types.machine_resources",
+        "BatchDedicatedResources": ".types.machine_resources",
+        "DedicatedResources": ".types.machine_resources",
+        "DiskSpec": ".types.machine_resources",
+        "MachineSpec": ".types.machine_resources",
+        "ResourcesConsumed": ".types.machine_resources",
+        "ManualBatchTuningParameters": ".types.manual_batch_tuning_parameters",
+        "MigratableResource": ".types.migratable_resource",
+        "BatchMigrateResourcesOperationMetadata": ".types.migration_service",
+        "BatchMigrateResourcesRequest": ".types.migration_service",
+        "BatchMigrateResourcesResponse": ".types.migration_service",
+        "MigrateResourceRequest": ".types.migration_service",
+        "MigrateResourceResponse": ".types.migration_service",
+        "SearchMigratableResourcesRequest": ".types.migration_service",
+        "SearchMigratableResourcesResponse": ".types.migration_service",
+        "Model": ".types.model",
+        "ModelContainerSpec": ".types.model",
+        "Port": ".types.model",
+        "PredictSchemata": ".types.model",
+        "ModelEvaluation": ".types.model_evaluation",
+        "ModelEvaluationSlice": ".types.model_evaluation_slice",
+        "DeleteModelRequest": ".types.model_service",
+        "ExportModelOperationMetadata": ".types.model_service",
+        "ExportModelRequest": ".types.model_service",
+        "ExportModelResponse": ".types.model_service",
+        "GetModelEvaluationRequest": ".types.model_service",
+        "GetModelEvaluationSliceRequest": ".types.model_service",
+        "GetModelRequest": ".types.model_service",
+        "ListModelEvaluationSlicesRequest": ".types.model_service",
+        "ListModelEvaluationSlicesResponse": ".types.model_service",
+        "ListModelEvaluationsRequest": ".types.model_service",
+        "ListModelEvaluationsResponse": ".types.model_service",
+        "ListModelsRequest": ".types.model_service",
+        "ListModelsResponse": ".types.model_service",
+        "UpdateModelRequest": ".types.model_service",
+        "UploadModelOperationMetadata": ".types.model_service",
+        "UploadModelRequest": ".types.model_service",
+        "UploadModelResponse": ".types.model_service",
+        "DeleteOperationMetadata": ".types.operation",
+        "GenericOperationMetadata": ".types.operation",
+        "CancelTrainingPipelineRequest": ".types.pipeline_service",
+        "CreateTrainingPipelineRequest": ".types.pipeline_service",
+        "DeleteTrainingPipelineRequest": ".types.pipeline_service",
+        "GetTrainingPipelineRequest": ".types.pipeline_service",
+        "ListTrainingPipelinesRequest": ".types.pipeline_service",
+        "ListTrainingPipelinesResponse": ".types.pipeline_service",
+        "PipelineState": ".types.pipeline_state",
+        "PredictRequest": ".types.prediction_service",
+        "PredictResponse": ".types.prediction_service",
+        "SpecialistPool": ".types.specialist_pool",
+        "CreateSpecialistPoolOperationMetadata": ".types.specialist_pool_service",
+        "CreateSpecialistPoolRequest": ".types.specialist_pool_service",
+        "DeleteSpecialistPoolRequest": ".types.specialist_pool_service",
+        "GetSpecialistPoolRequest": ".types.specialist_pool_service",
+        "ListSpecialistPoolsRequest": ".types.specialist_pool_service",
+        "ListSpecialistPoolsResponse": ".types.specialist_pool_service",
+        "UpdateSpecialistPoolOperationMetadata": ".types.specialist_pool_service",
+        "UpdateSpecialistPoolRequest": ".types.specialist_pool_service",
+        "Measurement": ".types.study",
+        "StudySpec": ".types.study",
+        "Trial": ".types.study",
+        "FilterSplit": ".types.training_pipeline",
+        "FractionSplit": ".types.training_pipeline",
+        "InputDataConfig": ".types.training_pipeline",
+        "PredefinedSplit": ".types.training_pipeline",
+        "TimestampSplit": ".types.training_pipeline",
+        "TrainingPipeline": ".types.training_pipeline",
+        "UserActionReference": ".types.user_action_reference",
+    }
+
+    def __getattr__(name):
+        if name in _SUBMODULES:
+            return importlib.import_module("." + name, __name__)
+        module = _LAZY_ATTRIBUTES.get(name)
+        if module is None:
+            raise AttributeError(
+                "module {!r} has no attribute {!r}".format(__name__, name)
+            )
+        value = getattr(importlib.import_module(module, __name__), name)
+        globals()[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(globals()) | set(_SUBMODULES) | set(_LAZY_ATTRIBUTES))
 
 
 __all__ = (
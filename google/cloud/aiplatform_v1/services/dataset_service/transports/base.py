@@ -17,7 +17,8 @@
 
 import abc
 import typing
-import pkg_resources
+
+from google.cloud.aiplatform import version as package_version
 
 from google import auth  # type: ignore
 from google.api_core import exceptions  # type: ignore
@@ -33,14 +34,9 @@ from google.cloud.aiplatform_v1.types import dataset_service
 from google.longrunning import operations_pb2 as operations  # type: ignore
 
 
-try:
-    DEFAULT_CLIENT_INFO = gapic_v1.client_info.ClientInfo(
-        gapic_version=pkg_resources.get_distribution(
-            "google-cloud-aiplatform",
-        ).version,
-    )
-except pkg_resources.DistributionNotFound:
-    DEFAULT_CLIENT_INFO = gapic_v1.client_info.ClientInfo()
+DEFAULT_CLIENT_INFO = gapic_v1.client_info.ClientInfo(
+    gapic_version=package_version.__version__,
+)
 
 
 class DatasetServiceTransport(abc.ABC):
@@ -17,7 +17,8 @@
 
 import abc
 import typing
-import pkg_resources
+
+from google.cloud.aiplatform import version as package_version
 
 from google import auth  # type: ignore
 from google.api_core import exceptions  # type: ignore
@@ -43,14 +44,9 @@ from google.longrunning import operations_pb2 as operations  # type: ignore
 from google.protobuf import empty_pb2 as empty  # type: ignore
 
 
-try:
-    DEFAULT_CLIENT_INFO = gapic_v1.client_info.ClientInfo(
-        gapic_version=pkg_resources.get_distribution(
-            "google-cloud-aiplatform",
-        ).version,
-    )
-except pkg_resources.DistributionNotFound:
-    DEFAULT_CLIENT_INFO = gapic_v1.client_info.ClientInfo()
+DEFAULT_CLIENT_INFO = gapic_v1.client_info.ClientInfo(
+    gapic_version=package_version.__version__,
+)
 
 
 class JobServiceTransport(abc.ABC):
@@ -16,11 +16,11 @@
 #
 
 from collections import OrderedDict
-from distutils import util
 import os
 import re
 from typing import Callable, Dict, Optional, Sequence, Tuple, Type, Union
-import pkg_resources
+
+from google.cloud.aiplatform import version as package_version
 
 from google.api_core import client_options as client_options_lib  # type: ignore
 from google.api_core import exceptions  # type: ignore
@@ -43,6 +43,16 @@ from .transports.grpc import MigrationServiceGrpcTransport
 from .transports.grpc_asyncio import MigrationServiceGrpcAsyncIOTransport
 
 
+def _strtobool(value: str) -> bool:
+    """Parses a truth value like ``distutils.util.strtobool``."""
+    value = value.lower()
+    if value in ("y", "yes", "t", "true", "on", "1"):
+        return True
+    if value in ("n", "no", "f", "false", "off", "0"):
+        return False
+    raise ValueError("invalid truth value {!r}".format(value))
+
+
 class MigrationServiceClientMeta(type):
     """Metaclass for the MigrationService client.
 
@@ -382,8 +392,8 @@ class MigrationServiceClient(metaclass=MigrationServiceClientMeta):
             client_options = client_options_lib.ClientOptions()
 
         # Create SSL credentials for mutual TLS if needed.
-        use_client_cert = bool(
-            util.strtobool(os.getenv("GOOGLE_API_USE_CLIENT_CERTIFICATE", "false"))
+        use_client_cert = _strtobool(
+            os.getenv("GOOGLE_API_USE_CLIENT_CERTIFICATE", "false")
         )
 
         client_cert_source_func = None
@@ -641,14 +651,9 @@ class MigrationServiceClient(metaclass=MigrationServiceClientMeta):
         return response
 
 
-try:
-    DEFAULT_CLIENT_INFO = gapic_v1.client_info.ClientInfo(
-        gapic_version=pkg_resources.get_distribution(
-            "google-cloud-aiplatform",
-        ).version,
-    )
-except pkg_resources.DistributionNotFound:
-    DEFAULT_CLIENT_INFO = gapic_v1.client_info.ClientInfo()
+DEFAULT_CLIENT_INFO = gapic_v1.client_info.ClientInfo(
+    gapic_version=package_version.__version__,
+)
 
 
 __all__ = ("MigrationServiceClient",)
@@ -21,10 +21,15 @@ import os
 import setuptools  # type: ignore
 
 name = "google-cloud-aiplatform"
-version = "0.4.0"
 description = "Cloud AI Platform API client library"
 
 package_root = os.path.abspath(os.path.dirname(__file__))
+
+version = {}
+with io.open(os.path.join(package_root, "google/cloud/aiplatform/version.py")) as fp:
+    exec(fp.read(), version)
+version = version["__version__"]
+
 readme_filename = os.path.join(package_root, "README.rst")
 with io.open(readme_filename, encoding="utf-8") as readme_file:
     readme = readme_file.read()
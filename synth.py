@@ -15,6 +15,7 @@
 """This script is used to synthesize generated parts of this library."""
 
 import os
+import re
 
 import synthtool as s
 import synthtool.gcp as gcp
@@ -29,6 +30,66 @@ common = gcp.CommonTemplates()
 # ----------------------------------------------------------------------------
 
 
+# Versioned packages load their services and types on first access
+# (PEP 562), so importing one client does not import all of them.
+_LAZY_INIT_TEMPLATE = """{header}
+import importlib
+import sys
+import typing
+
+if typing.TYPE_CHECKING or sys.version_info < (3, 7):
+{imports}
+else:
+    _SUBMODULES = ("services", "types")
+    _LAZY_ATTRIBUTES = {{
+{attributes}
+    }}
+
+    def __getattr__(name):
+        if name in _SUBMODULES:
+            return importlib.import_module("." + name, __name__)
+        module = _LAZY_ATTRIBUTES.get(name)
+        if module is None:
+            raise AttributeError(
+                "module {{!r}} has no attribute {{!r}}".format(__name__, name)
+            )
+        value = getattr(importlib.import_module(module, __name__), name)
+        globals()[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(globals()) | set(_SUBMODULES) | set(_LAZY_ATTRIBUTES))
+
+
+{all}"""
+
+
+def make_lazy_init(path):
+    with open(path) as f:
+        content = f.read()
+    if "_LAZY_ATTRIBUTES" in content:
+        return
+    first = content.index("\nfrom .")
+    last = content.index("\n__all__ = (")
+    header = content[: first + 1]
+    imports = [line for line in content[first:last].splitlines() if line]
+    attributes = [
+        '        "{}": "{}",'.format(name, module)
+        for module, name in (
+            re.match(r"from (\S+) import (\w+)$", line).groups() for line in imports
+        )
+    ]
+    with open(path, "w") as f:
+        f.write(
+            _LAZY_INIT_TEMPLATE.format(
+                header=header.rstrip("\n") + "\n",
+                imports="\n".join("    " + line for line in imports),
+                attributes="\n".join(attributes),
+                all=content[last + 1 :],
+            )
+        )
+
+
 versions = ["v1beta1", "v1"]
 
 for version in versions:
@@ -82,6 +143,66 @@ for version in versions:
         "request.traffic_split = traffic_split",
     )
 
+    # Read the version from google/cloud/aiplatform/version.py instead of
+    # querying pkg_resources when each client module is imported.
+    s.replace(
+        f"google/cloud/aiplatform_{version}/services/**/*.py",
+        "import pkg_resources\n",
+        "\nfrom google.cloud.aiplatform import version as package_version\n",
+    )
+    s.replace(
+        f"google/cloud/aiplatform_{version}/services/**/*.py",
+        """try:
+    DEFAULT_CLIENT_INFO = gapic_v1.client_info.ClientInfo\(
+        gapic_version=pkg_resources.get_distribution\(
+            "google-cloud-aiplatform",
+        \).version,
+    \)
+except pkg_resources.DistributionNotFound:
+    DEFAULT_CLIENT_INFO = gapic_v1.client_info.ClientInfo\(\)
+""",
+        """DEFAULT_CLIENT_INFO = gapic_v1.client_info.ClientInfo(
+    gapic_version=package_version.__version__,
+)
+""",
+    )
+
+    # distutils pulls in setuptools and pkg_resources on import.
+    s.replace(
+        f"google/cloud/aiplatform_{version}/services/*/client.py",
+        "from distutils import util\n",
+        "",
+    )
+    s.replace(
+        f"google/cloud/aiplatform_{version}/services/*/client.py",
+        """use_client_cert = bool\(
+            util.strtobool\(os.getenv\("GOOGLE_API_USE_CLIENT_CERTIFICATE", "false"\)\)
+        \)
+""",
+        """use_client_cert = _strtobool(
+            os.getenv("GOOGLE_API_USE_CLIENT_CERTIFICATE", "false")
+        )
+""",
+    )
+    s.replace(
+        f"google/cloud/aiplatform_{version}/services/*/client.py",
+        r"\nclass (\w+)ClientMeta\(type\):",
+        r'''
+def _strtobool(value: str) -> bool:
+    """Parses a truth value like ``distutils.util.strtobool``."""
+    value = value.lower()
+    if value in ("y", "yes", "t", "true", "on", "1"):
+        return True
+    if value in ("n", "no", "f", "false", "off", "0"):
+        return False
+    raise ValueError("invalid truth value {!r}".format(value))
+
+
+class \1ClientMeta(type):''',
+    )
+
+    make_lazy_init(f"google/cloud/aiplatform_{version}/__init__.py")
+
 # ----------------------------------------------------------------------------
 # Patch the library
 # ----------------------------------------------------------------------------
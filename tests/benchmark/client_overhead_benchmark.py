@@ -0,0 +1,177 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Breaks down the client-side cost of a predict call against a local fake.
+
+For each instance count and payload size, every stage of a call is timed
+on its own and reported as p50/p99 in microseconds:
+
+    marshal      enhanced schema instances -> Value (``to_value``)
+    build        PredictRequest from the flattened arguments
+    serialize    PredictRequest -> bytes
+    transport    bytes round trip through gRPC (sync and asyncio)
+    unwrap       bytes -> PredictResponse -> Python predictions
+    sync/async   a whole ``client.predict`` call, marshalling excluded
+
+Run with:
+
+    python tests/benchmark/client_overhead_benchmark.py [--iterations N]
+"""
+from __future__ import absolute_import
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_prediction_service import FakePredictionServer  # noqa: E402
+
+from google.cloud.aiplatform.gapic.schema import predict  # noqa: E402
+from google.cloud.aiplatform_v1beta1.services.prediction_service import (  # noqa: E402
+    PredictionServiceAsyncClient,
+    PredictionServiceClient,
+)
+from google.cloud.aiplatform_v1beta1.services.prediction_service import (  # noqa: E402
+    transports,
+)
+from google.cloud.aiplatform_v1beta1.types import prediction_service  # noqa: E402
+
+ENDPOINT = "projects/p/locations/us-central1/endpoints/1234"
+_METHOD = "/google.cloud.aiplatform.v1beta1.PredictionService/Predict"
+
+
+def _percentiles(samples):
+    ordered = sorted(samples)
+    p50 = ordered[len(ordered) // 2]
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return p50 * 1e6, p99 * 1e6
+
+
+def _time(function, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def _time_async(function, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await function()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _identity(data):
+    return data
+
+
+def _measure(server, count, size, iterations):
+    instances = [
+        predict.instance.ImageClassificationPredictionInstance(
+            content="x" * size, mime_type="image/png"
+        )
+        for _ in range(count)
+    ]
+    values = [instance.to_value() for instance in instances]
+
+    def build():
+        request = prediction_service.PredictRequest()
+        request.endpoint = ENDPOINT
+        request.instances.extend(values)
+        return request
+
+    request = build()
+    request_bytes = prediction_service.PredictRequest.serialize(request)
+
+    channel = server.channel()
+    raw_stub = channel.unary_unary(
+        _METHOD, request_serializer=_identity, response_deserializer=_identity
+    )
+    response_bytes = raw_stub(request_bytes)
+    client = PredictionServiceClient(
+        transport=transports.PredictionServiceGrpcTransport(channel=channel)
+    )
+
+    def unwrap():
+        response = prediction_service.PredictResponse.deserialize(response_bytes)
+        return list(response.predictions)
+
+    stages = {
+        "marshal": _time(
+            lambda: [instance.to_value() for instance in instances], iterations
+        ),
+        "build": _time(build, iterations),
+        "serialize": _time(
+            lambda: prediction_service.PredictRequest.serialize(request), iterations
+        ),
+        "transport": _time(lambda: raw_stub(request_bytes), iterations),
+        "unwrap": _time(unwrap, iterations),
+        "sync": _time(
+            lambda: client.predict(endpoint=ENDPOINT, instances=values), iterations
+        ),
+    }
+
+    async def run_async():
+        aio_channel = server.aio_channel()
+        aio_stub = aio_channel.unary_unary(
+            _METHOD, request_serializer=_identity, response_deserializer=_identity
+        )
+        async_client = PredictionServiceAsyncClient(
+            transport=transports.PredictionServiceGrpcAsyncIOTransport(
+                channel=aio_channel
+            )
+        )
+        await aio_stub(request_bytes)
+        stages["transport (aio)"] = await _time_async(
+            lambda: aio_stub(request_bytes), iterations
+        )
+        stages["async"] = await _time_async(
+            lambda: async_client.predict(endpoint=ENDPOINT, instances=values),
+            iterations,
+        )
+        await aio_channel.close()
+
+    asyncio.run(run_async())
+    channel.close()
+    return stages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--counts", type=int, nargs="+", default=[1, 16, 128])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[64, 16384])
+    args = parser.parse_args()
+
+    with FakePredictionServer() as server:
+        for count in args.counts:
+            for size in args.sizes:
+                stages = _measure(server, count, size, args.iterations)
+                print("\n{} instances x {} bytes".format(count, size))
+                print("{:<16} {:>10} {:>10}".format("stage", "p50 us", "p99 us"))
+                for stage, samples in stages.items():
+                    print(
+                        "{:<16} {:>10.1f} {:>10.1f}".format(
+                            stage, *_percentiles(samples)
+                        )
+                    )
+
+
+if __name__ == "__main__":
+    main()
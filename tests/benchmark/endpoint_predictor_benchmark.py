@@ -0,0 +1,89 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Compares the per-call overhead of EndpointPredictor and client.predict.
+
+Both send through a fake channel that serializes the request and
+deserializes a canned response, so only client-side work is measured.
+Run with:
+
+    python tests/benchmark/endpoint_predictor_benchmark.py [--number N]
+"""
+from __future__ import absolute_import
+import argparse
+import timeit
+
+from google.cloud.aiplatform.helpers.predictor import EndpointPredictor
+from google.cloud.aiplatform_v1beta1.services.prediction_service import (
+    PredictionServiceClient,
+)
+from google.cloud.aiplatform_v1beta1.services.prediction_service import transports
+from google.cloud.aiplatform_v1beta1.types import prediction_service
+from google.protobuf.struct_pb2 import Value
+
+ENDPOINT = "projects/p/locations/us-central1/endpoints/1234"
+
+
+class _FakeChannel:
+    """Answers every unary call with a fixed response, without any I/O."""
+
+    def __init__(self, response: bytes):
+        self._response = response
+
+    def unary_unary(self, method, request_serializer, response_deserializer):
+        response = self._response
+
+        def call(request, timeout=None, metadata=None, **kwargs):
+            request_serializer(request)
+            return response_deserializer(response)
+
+        return call
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    response = prediction_service.PredictResponse(deployed_model_id="1")
+    response._pb.predictions.add().number_value = 0.5
+    client = PredictionServiceClient(
+        transport=transports.PredictionServiceGrpcTransport(
+            channel=_FakeChannel(prediction_service.PredictResponse.serialize(response))
+        )
+    )
+    parameters = Value(number_value=0.5)
+    predictor = EndpointPredictor(client, ENDPOINT, parameters)
+
+    print("{:>10} {:>14} {:>14} {:>6}".format("instances", "client", "predictor", "x"))
+    for count in (1, 8, 64):
+        instances = [Value(number_value=i) for i in range(count)]
+        before = timeit.timeit(
+            lambda: client.predict(
+                endpoint=ENDPOINT, instances=instances, parameters=parameters
+            ),
+            number=args.number,
+        )
+        after = timeit.timeit(lambda: predictor.predict(instances), number=args.number)
+        print(
+            "{:>10} {:>12.1f}us {:>12.1f}us {:>5.1f}x".format(
+                count,
+                before / args.number * 1e6,
+                after / args.number * 1e6,
+                before / after,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
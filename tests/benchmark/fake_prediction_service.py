@@ -0,0 +1,125 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""An in-process fake of PredictionService for benchmarks.
+
+The fake serves ``Predict`` and ``Explain`` for both the v1 and v1beta1
+APIs on an insecure localhost port. Every instance gets one prediction,
+a string of ``prediction_bytes`` characters, after ``latency`` seconds.
+
+    with FakePredictionServer(latency=0.001) as server:
+        client = PredictionServiceClient(
+            transport=PredictionServiceGrpcTransport(channel=server.channel())
+        )
+"""
+from __future__ import absolute_import
+from concurrent import futures
+import time
+
+import grpc
+from grpc.experimental import aio
+
+from google.cloud.aiplatform_v1beta1.types import explanation
+from google.cloud.aiplatform_v1beta1.types import prediction_service
+from google.protobuf.struct_pb2 import Value
+
+_SERVICES = (
+    "google.cloud.aiplatform.v1.PredictionService",
+    "google.cloud.aiplatform.v1beta1.PredictionService",
+)
+
+
+class FakePredictionServer:
+    """Answers Predict and Explain calls from a local gRPC server.
+
+    Args:
+        latency (float): Seconds each call waits before answering.
+        prediction_bytes (int): Size of the string predicted per instance.
+        max_workers (int): Threads serving calls.
+    """
+
+    def __init__(
+        self, latency: float = 0.0, prediction_bytes: int = 16, max_workers: int = 16
+    ):
+        self.latency = latency
+        self.prediction_bytes = prediction_bytes
+        self.calls = 0
+        self._server = grpc.server(futures.ThreadPoolExecutor(max_workers=max_workers))
+        self._server.add_generic_rpc_handlers(
+            [self._handler(service) for service in _SERVICES]
+        )
+        self._port = self._server.add_insecure_port("localhost:0")
+
+    @property
+    def address(self) -> str:
+        """The ``host:port`` the server listens on."""
+        return "localhost:{}".format(self._port)
+
+    def channel(self) -> grpc.Channel:
+        """Returns a new insecure channel to the server."""
+        return grpc.insecure_channel(self.address)
+
+    def aio_channel(self) -> aio.Channel:
+        """Returns a new insecure ``grpc.aio`` channel to the server."""
+        return aio.insecure_channel(self.address)
+
+    def start(self) -> "FakePredictionServer":
+        self._server.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.stop(None)
+
+    def __enter__(self) -> "FakePredictionServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+    def _predictions(self, instances):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        prediction = Value(string_value="x" * self.prediction_bytes)
+        return [prediction] * len(instances)
+
+    def _predict(self, request, context):
+        response = prediction_service.PredictResponse.pb()(deployed_model_id="1")
+        response.predictions.extend(self._predictions(request.instances))
+        return response
+
+    def _explain(self, request, context):
+        response = prediction_service.ExplainResponse.pb()(deployed_model_id="1")
+        predictions = self._predictions(request.instances)
+        response.predictions.extend(predictions)
+        attribution = explanation.Attribution.pb()(instance_output_value=1.0)
+        attribution.feature_attributions.struct_value.fields["x"].number_value = 1.0
+        for _ in predictions:
+            response.explanations.add().attributions.append(attribution)
+        return response
+
+    def _handler(self, service: str):
+        def method(behavior, request_type):
+            return grpc.unary_unary_rpc_method_handler(
+                behavior,
+                request_deserializer=request_type.pb().FromString,
+                response_serializer=lambda message: message.SerializeToString(),
+            )
+
+        return grpc.method_handlers_generic_handler(
+            service,
+            {
+                "Predict": method(self._predict, prediction_service.PredictRequest),
+                "Explain": method(self._explain, prediction_service.ExplainRequest),
+            },
+        )
@@ -0,0 +1,143 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Measures cold import times of the library in fresh interpreters.
+
+Each case runs its setup, then times its statement, in a new Python
+process; the median over ``--repeat`` runs is reported along with the
+number of modules the statement loaded. With ``--check``, the run fails
+if a statement loads a module it should leave for later. Run with:
+
+    python tests/benchmark/import_time_benchmark.py [--repeat N] [--check]
+"""
+from __future__ import absolute_import
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+_SCRIPT = """
+import json, sys, time
+{setup}
+before = set(sys.modules)
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps([elapsed, sorted(set(sys.modules) - before)]))
+"""
+
+# (name, setup, statement, module prefixes the statement must not load)
+CASES = [
+    (
+        "aiplatform",
+        "",
+        "import google.cloud.aiplatform",
+        ("google.cloud.aiplatform_v1", "google.cloud.aiplatform.gapic"),
+    ),
+    (
+        "aiplatform_v1beta1",
+        "",
+        "import google.cloud.aiplatform_v1beta1",
+        ("google.cloud.aiplatform_v1beta1.services", "pkg_resources"),
+    ),
+    (
+        "aiplatform_v1beta1 client",
+        "",
+        "from google.cloud.aiplatform_v1beta1 import PredictionServiceClient",
+        (
+            "google.cloud.aiplatform_v1beta1.services.dataset_service",
+            "google.cloud.aiplatform_v1beta1.services.job_service",
+            "google.cloud.aiplatform_v1beta1.services.model_service",
+            "google.cloud.aiplatform_v1.",
+            "pkg_resources",
+        ),
+    ),
+    (
+        "gapic client",
+        "",
+        "from google.cloud.aiplatform.gapic import EndpointServiceClient",
+        (
+            "google.cloud.aiplatform_v1.services.dataset_service",
+            "google.cloud.aiplatform_v1.services.job_service",
+            "google.cloud.aiplatform_v1beta1",
+            "google.cloud.aiplatform.v1beta1.schema",
+        ),
+    ),
+    (
+        "gapic.schema",
+        "import google.cloud.aiplatform_v1",
+        "import google.cloud.aiplatform.gapic.schema",
+        (
+            "google.cloud.aiplatform.v1beta1.schema.predict",
+            "google.cloud.aiplatform.v1beta1.schema.trainingjob",
+            "numpy",
+        ),
+    ),
+    (
+        "gapic.schema.predict",
+        "import google.cloud.aiplatform.gapic.schema as schema",
+        "schema.predict.instance.ImageClassificationPredictionInstance.to_value",
+        ("google.cloud.aiplatform.v1beta1.schema.trainingjob",),
+    ),
+    (
+        "gapic.schema.trainingjob",
+        "import google.cloud.aiplatform.gapic.schema as schema",
+        "schema.trainingjob.definition.AutoMlTablesInputs.to_value",
+        ("google.cloud.aiplatform.v1beta1.schema.predict",),
+    ),
+    (
+        "helpers.value_converter",
+        "import google.cloud.aiplatform_v1",
+        "from google.cloud.aiplatform.helpers import value_converter",
+        ("numpy", "yaml", "google.cloud.aiplatform.helpers.columnar"),
+    ),
+]
+
+
+def run(setup, statement):
+    output = subprocess.check_output(
+        [sys.executable, "-c", _SCRIPT.format(setup=setup, statement=statement)]
+    )
+    elapsed, loaded = json.loads(output.decode("utf-8").strip().splitlines()[-1])
+    return elapsed, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--check", action="store_true")
+    args = parser.parse_args()
+
+    failures = []
+    print("{:<28} {:>10} {:>8}".format("case", "median ms", "modules"))
+    for name, setup, statement, forbidden in CASES:
+        timings = []
+        for _ in range(args.repeat):
+            elapsed, loaded = run(setup, statement)
+            timings.append(elapsed)
+        print(
+            "{:<28} {:>10.1f} {:>8}".format(
+                name, statistics.median(timings) * 1e3, len(loaded)
+            )
+        )
+        unexpected = [m for m in loaded if m.startswith(tuple(forbidden))]
+        if unexpected:
+            failures.append("{} loaded {}".format(name, ", ".join(unexpected[:5])))
+
+    if args.check and failures:
+        sys.exit("\n".join(failures))
+
+
+if __name__ == "__main__":
+    main()
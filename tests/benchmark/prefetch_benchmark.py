@@ -0,0 +1,69 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Measures how much page prefetching hides List latency.
+
+Pages through a fake ListCustomJobs method that sleeps ``--latency``
+milliseconds per call, while the consumer spends ``--work``
+milliseconds on each page, with the plain pager and with prefetching at
+several depths. Run with:
+
+    python tests/benchmark/prefetch_benchmark.py [--pages N]
+"""
+from __future__ import absolute_import
+import argparse
+import time
+
+from google.cloud.aiplatform.helpers import prefetch
+from google.cloud.aiplatform_v1.services.job_service import pagers
+from google.cloud.aiplatform_v1.types import job_service
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=20.0)
+    parser.add_argument("--work", type=float, default=20.0)
+    args = parser.parse_args()
+
+    def list_custom_jobs(request, metadata=()):
+        time.sleep(args.latency / 1e3)
+        index = int(request.page_token)
+        return job_service.ListCustomJobsResponse(
+            next_page_token="" if index + 1 == args.pages else str(index + 1)
+        )
+
+    def pager():
+        return pagers.ListCustomJobsPager(
+            list_custom_jobs,
+            job_service.ListCustomJobsRequest(),
+            job_service.ListCustomJobsResponse(next_page_token="1"),
+        )
+
+    cases = [("pager", pager)] + [
+        (
+            "prefetch depth={}".format(depth),
+            lambda depth=depth: prefetch.prefetch(pager(), depth),
+        )
+        for depth in (1, 2, 4)
+    ]
+    print("{:<18} {:>10}".format("", "total ms"))
+    for label, make in cases:
+        start = time.perf_counter()
+        for _ in make().pages:
+            time.sleep(args.work / 1e3)
+        print("{:<18} {:>10.1f}".format(label, (time.perf_counter() - start) * 1e3))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Compares resource_names.parse with the clients' parse_*_path methods.
+
+Parses a page of mixed resource names (models, endpoints, trials and
+annotations), once by trying the parse_*_path methods of the clients in
+turn until one matches, and once with resource_names. The single-type
+row parses model names with ``parse_model_path`` alone. Run with:
+
+    python tests/benchmark/resource_name_benchmark.py [--number N]
+"""
+from __future__ import absolute_import
+import argparse
+import inspect
+import timeit
+
+from google.cloud.aiplatform.helpers import resource_names
+from google.cloud.aiplatform_v1 import (
+    DatasetServiceClient,
+    EndpointServiceClient,
+    JobServiceClient,
+    ModelServiceClient,
+)
+
+TEMPLATES = [
+    "projects/p/locations/us-central1/models/{}",
+    "projects/p/locations/us-central1/endpoints/{}",
+    "projects/p/locations/us-central1/studies/s/trials/{}",
+    "projects/p/locations/us-central1/datasets/d/dataItems/i/annotations/{}",
+]
+
+PARSERS = [
+    method
+    for client in (
+        DatasetServiceClient,
+        EndpointServiceClient,
+        JobServiceClient,
+        ModelServiceClient,
+    )
+    for name, method in inspect.getmembers(client)
+    if name.startswith("parse_") and name.endswith("_path")
+]
+
+
+def parse_with_clients(names):
+    parsed = []
+    for name in names:
+        for parser in PARSERS:
+            segments = parser(name)
+            if segments:
+                break
+        parsed.append(segments)
+    return parsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--number", type=int, default=20)
+    parser.add_argument("--page-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    names = [TEMPLATES[i % len(TEMPLATES)].format(i) for i in range(args.page_size)]
+    model_names = [TEMPLATES[0].format(i) for i in range(args.page_size)]
+
+    def cold(function, names):
+        def run():
+            resource_names.parse.cache_clear()
+            function(names)
+
+        return run
+
+    cases = [
+        ("parse_*_path, any type", lambda: parse_with_clients(names)),
+        (
+            "parse_model_path only",
+            lambda: [ModelServiceClient.parse_model_path(n) for n in model_names],
+        ),
+        (
+            "parse, cold",
+            cold(lambda page: [resource_names.parse(n) for n in page], names),
+        ),
+        ("parse, cached", lambda: [resource_names.parse(n) for n in names]),
+        ("parse_many", lambda: resource_names.parse_many(names)),
+    ]
+    print("{:<24} {:>12}".format("{} names".format(args.page_size), "us/name"))
+    for label, run in cases:
+        elapsed = min(timeit.repeat(run, number=args.number, repeat=3))
+        print(
+            "{:<24} {:>12.3f}".format(
+                label, elapsed / args.number / args.page_size * 1e6
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
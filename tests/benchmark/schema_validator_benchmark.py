@@ -0,0 +1,97 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Compares local schema validation with the predict call it can save.
+
+Validates batches of image classification instances against a compiled
+instance schema, and times a predict call with the same batch against the
+local fake PredictionService (no network or server-side work, so this is
+a lower bound on what a rejected request costs). Run with:
+
+    python tests/benchmark/schema_validator_benchmark.py [--number N]
+"""
+from __future__ import absolute_import
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_prediction_service import FakePredictionServer  # noqa: E402
+
+from google.cloud.aiplatform.gapic.schema import predict  # noqa: E402
+from google.cloud.aiplatform.helpers import schemata  # noqa: E402
+from google.cloud.aiplatform_v1beta1.services.prediction_service import (  # noqa: E402
+    PredictionServiceClient,
+    transports,
+)
+
+ENDPOINT = "projects/p/locations/us-central1/endpoints/1234"
+
+INSTANCE_SCHEMA = {
+    "title": "ImageClassification",
+    "type": "object",
+    "required": ["content"],
+    "properties": {
+        "content": {"type": "string", "format": "byte"},
+        "mimeType": {
+            "type": "string",
+            "enum": ["image/jpeg", "image/gif", "image/png", "image/webp"],
+        },
+    },
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--number", type=int, default=200)
+    parser.add_argument("--counts", type=int, nargs="+", default=[1, 16, 128])
+    args = parser.parse_args()
+
+    validator = schemata.SchemaValidator(INSTANCE_SCHEMA)
+    print("{:>9} {:>14} {:>14} {:>9}".format("instances", "validate", "predict", "x"))
+    with FakePredictionServer() as server:
+        client = PredictionServiceClient(
+            transport=transports.PredictionServiceGrpcTransport(
+                channel=server.channel()
+            )
+        )
+        for count in args.counts:
+            values = predict.instance.ImageClassificationPredictionInstance.to_values(
+                [
+                    predict.instance.ImageClassificationPredictionInstance(
+                        content="x" * 1024, mime_type="image/png"
+                    )
+                ]
+                * count
+            )
+            validate = timeit.timeit(
+                lambda: validator.validate(values), number=args.number
+            )
+            call = timeit.timeit(
+                lambda: client.predict(endpoint=ENDPOINT, instances=values),
+                number=args.number,
+            )
+            print(
+                "{:>9} {:>12.1f}us {:>12.1f}us {:>8.1f}x".format(
+                    count,
+                    validate / args.number * 1e6,
+                    call / args.number * 1e6,
+                    call / validate,
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Compares value_converter against the json_format round-trip it replaced.
+
+Every instance, params, prediction and definition class is filled with
+sample data and converted in both directions. The bulk ``to_values`` and
+``columns_to_values`` class methods are then compared against converting
+``--rows`` messages one ``to_value`` call at a time. Run with:
+
+    python tests/benchmark/value_converter_benchmark.py [--number N] [--rows N]
+"""
+from __future__ import absolute_import
+import argparse
+import timeit
+
+from google.cloud.aiplatform.helpers import value_converter
+from google.cloud.aiplatform.v1beta1.schema.predict.instance_v1beta1 import (
+    types as instance,
+)
+from google.cloud.aiplatform.v1beta1.schema.predict.params_v1beta1 import (
+    types as params,
+)
+from google.cloud.aiplatform.v1beta1.schema.predict.prediction_v1beta1 import (
+    types as prediction,
+)
+from google.cloud.aiplatform.v1beta1.schema.trainingjob.definition_v1beta1 import (
+    types as definition,
+)
+from google.protobuf import json_format
+from google.protobuf.descriptor import FieldDescriptor
+from google.protobuf.struct_pb2 import Value
+
+_SAMPLES = {
+    FieldDescriptor.CPPTYPE_BOOL: True,
+    FieldDescriptor.CPPTYPE_DOUBLE: 0.25,
+    FieldDescriptor.CPPTYPE_FLOAT: 0.5,
+    FieldDescriptor.CPPTYPE_INT32: 7,
+    FieldDescriptor.CPPTYPE_INT64: 7,
+    FieldDescriptor.CPPTYPE_UINT32: 7,
+    FieldDescriptor.CPPTYPE_UINT64: 7,
+}
+
+
+def _sample(field):
+    if field.cpp_type == FieldDescriptor.CPPTYPE_ENUM:
+        return field.enum_type.values[-1].number
+    if field.type == FieldDescriptor.TYPE_BYTES:
+        return b"\x00\x01sample-bytes"
+    if field.cpp_type == FieldDescriptor.CPPTYPE_STRING:
+        return "sample-string"
+    return _SAMPLES[field.cpp_type]
+
+
+def populate(message, depth=0):
+    """Sets every field of ``message`` (recursively) to a sample value."""
+    for field in message.DESCRIPTOR.fields:
+        repeated = field.label == FieldDescriptor.LABEL_REPEATED
+        if field.cpp_type != FieldDescriptor.CPPTYPE_MESSAGE:
+            if repeated:
+                getattr(message, field.name).extend([_sample(field)] * 3)
+            else:
+                setattr(message, field.name, _sample(field))
+            continue
+        if depth > 3:
+            continue
+        target = getattr(message, field.name)
+        target = target.add() if repeated else target
+        full_name = field.message_type.full_name
+        if full_name == "google.protobuf.Duration":
+            target.FromJsonString("1.5s")
+        elif full_name == "google.protobuf.ListValue":
+            target.extend([1, "a", {"b": True}])
+        elif full_name.startswith("google.protobuf."):
+            target.value = _sample(target.DESCRIPTOR.fields_by_name["value"])
+        else:
+            populate(target, depth + 1)
+    return message
+
+
+def _json_to_value(pb):
+    return json_format.ParseDict(json_format.MessageToDict(pb), Value())
+
+
+def _json_from_value(cls, value):
+    return json_format.ParseDict(json_format.MessageToDict(value), cls.pb()())
+
+
+def _classes():
+    for pkg in (instance, params, prediction, definition):
+        for name, cls in sorted(pkg.__dict__.items()):
+            if isinstance(cls, type) and hasattr(cls, "pb"):
+                yield pkg.__name__.split(".")[-2], cls
+
+
+def _columns(message, rows):
+    return {
+        field.name: [list(value) if field.label == field.LABEL_REPEATED else value]
+        * rows
+        for field, value in message._pb.ListFields()
+        if field.cpp_type != FieldDescriptor.CPPTYPE_MESSAGE
+    }
+
+
+def bulk(number, rows):
+    print(
+        "\n{:<18} {:<52} {:>9} {:>9} {:>9}".format(
+            "package", "class", "to_value", "to_values", "columns"
+        )
+    )
+    for package, cls in _classes():
+        message = cls.wrap(populate(cls.pb()()))
+        messages = [message] * rows
+        columns = _columns(message, rows)
+        if not columns:
+            continue
+        flat = cls.wrap(cls.pb()())
+        for name, column in columns.items():
+            setattr(flat, name, column[0])
+        flat_messages = [flat] * rows
+        assert cls.to_values(messages) == [m.to_value() for m in messages], cls
+        assert cls.columns_to_values(columns) == cls.to_values(flat_messages), cls
+
+        timings = [
+            timeit.timeit(lambda: [m.to_value() for m in flat_messages], number=number),
+            timeit.timeit(lambda: cls.to_values(flat_messages), number=number),
+            timeit.timeit(lambda: cls.columns_to_values(columns), number=number),
+        ]
+        print(
+            "{:<18} {:<52} {:>7.1f}us {:>7.1f}us {:>7.1f}us".format(
+                package, cls.__name__, *[t / number * 1e6 for t in timings]
+            )
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--number", type=int, default=2000)
+    parser.add_argument("--rows", type=int, default=256)
+    args = parser.parse_args()
+
+    print(
+        "{:<18} {:<52} {:>9} {:>9} {:>6} {:>9} {:>9} {:>6}".format(
+            "package", "class", "to json", "to new", "x", "from json", "from new", "x"
+        )
+    )
+    totals = [0.0, 0.0, 0.0, 0.0]
+    for package, cls in _classes():
+        message = cls.wrap(populate(cls.pb()()))
+        value = value_converter.to_value(message)
+        assert value == _json_to_value(message._pb), cls
+        assert value_converter.from_value(cls, value) == message._pb, cls
+
+        timings = [
+            timeit.timeit(lambda: _json_to_value(message._pb), number=args.number),
+            timeit.timeit(
+                lambda: value_converter.to_value(message), number=args.number
+            ),
+            timeit.timeit(lambda: _json_from_value(cls, value), number=args.number),
+            timeit.timeit(
+                lambda: value_converter.from_value(cls, value), number=args.number
+            ),
+        ]
+        totals = [total + timing for total, timing in zip(totals, timings)]
+        us = [timing / args.number * 1e6 for timing in timings]
+        print(
+            "{:<18} {:<52} {:>7.1f}us {:>7.1f}us {:>5.1f}x {:>7.1f}us {:>7.1f}us {:>5.1f}x".format(
+                package,
+                cls.__name__,
+                us[0],
+                us[1],
+                us[0] / us[1],
+                us[2],
+                us[3],
+                us[2] / us[3],
+            )
+        )
+    print(
+        "overall speedup: to_value {:.1f}x, from_value {:.1f}x".format(
+            totals[0] / totals[1], totals[2] / totals[3]
+        )
+    )
+    bulk(max(1, args.number // args.rows), args.rows)
+
+
+if __name__ == "__main__":
+    main()
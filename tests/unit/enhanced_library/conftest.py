@@ -0,0 +1,25 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import absolute_import
+import asyncio
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def fresh_event_loop_policy():
+    yield
+    # Closing the loop of an asyncio test leaves no current event loop;
+    # the gapic tests running afterwards call asyncio.get_event_loop().
+    asyncio.set_event_loop_policy(None)
@@ -0,0 +1,122 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import absolute_import
+import asyncio
+from concurrent import futures
+
+import mock
+import pytest
+
+from google.api_core import exceptions
+from google.cloud.aiplatform.helpers import batching
+from google.cloud.aiplatform_v1beta1.types import prediction_service
+from google.protobuf.struct_pb2 import Value
+
+ENDPOINT = "projects/p/locations/l/endpoints/e"
+
+
+def _echo_predict(endpoint, instances, parameters, **kwargs):
+    response = prediction_service.PredictResponse()
+    response.predictions.extend([v.number_value * 2 for v in instances])
+    return response
+
+
+def _client(side_effect=_echo_predict):
+    client = mock.Mock()
+    client.predict.side_effect = side_effect
+    return client
+
+
+def test_batches_by_max_instances():
+    client = _client()
+    with batching.BatchingPredictor(
+        client, ENDPOINT, max_instances=3, linger=60
+    ) as predictor:
+        pending = [predictor.submit(Value(number_value=i)) for i in range(6)]
+        results = [f.result(timeout=5) for f in pending]
+
+    assert results == [0, 2, 4, 6, 8, 10]
+    assert client.predict.call_count == 2
+    for call in client.predict.call_args_list:
+        assert call[1]["endpoint"] == ENDPOINT
+        assert len(call[1]["instances"]) == 3
+
+
+def test_batches_by_max_bytes():
+    client = _client()
+    size = Value(number_value=1).ByteSize()
+    with batching.BatchingPredictor(
+        client, ENDPOINT, max_bytes=2 * size, linger=60
+    ) as predictor:
+        pending = [predictor.submit(Value(number_value=1)) for _ in range(4)]
+        futures.wait(pending, timeout=5)
+
+    assert client.predict.call_count == 2
+
+
+def test_flushes_after_linger():
+    client = _client()
+    predictor = batching.BatchingPredictor(client, ENDPOINT, linger=0.01)
+    assert predictor.predict(Value(number_value=21), timeout=5) == 42
+    predictor.close()
+
+
+def test_close_flushes_open_batch():
+    client = _client()
+    predictor = batching.BatchingPredictor(client, ENDPOINT, linger=60)
+    future = predictor.submit(Value(number_value=1))
+    predictor.close()
+
+    assert future.result(timeout=0) == 2
+    with pytest.raises(RuntimeError):
+        predictor.submit(Value(number_value=1))
+
+
+def test_error_propagates_to_every_caller():
+    client = _client(side_effect=exceptions.InternalServerError("boom"))
+    with batching.BatchingPredictor(
+        client, ENDPOINT, max_instances=2, linger=60
+    ) as predictor:
+        pending = [predictor.submit(Value(number_value=i)) for i in range(2)]
+        for future in pending:
+            with pytest.raises(exceptions.InternalServerError):
+                future.result(timeout=5)
+
+
+def test_prediction_count_mismatch_is_an_error():
+    client = _client(side_effect=lambda **kwargs: prediction_service.PredictResponse())
+    with batching.BatchingPredictor(client, ENDPOINT, linger=0) as predictor:
+        with pytest.raises(ValueError):
+            predictor.predict(Value(number_value=1), timeout=5)
+
+
+@pytest.mark.asyncio
+async def test_predict_async():
+    client = _client()
+
+    with batching.BatchingPredictor(
+        client, ENDPOINT, max_instances=4, linger=60
+    ) as predictor:
+        results = await asyncio.gather(
+            *[predictor.predict_async(Value(number_value=i)) for i in range(4)]
+        )
+
+    assert results == [0, 2, 4, 6]
+    assert client.predict.call_count == 1
+
+
+def test_rejects_non_value_instances():
+    with batching.BatchingPredictor(_client(), ENDPOINT) as predictor:
+        with pytest.raises(TypeError):
+            predictor.submit({"a": 1})
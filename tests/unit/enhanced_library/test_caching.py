@@ -0,0 +1,267 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import absolute_import
+
+import mock
+
+from google.cloud.aiplatform.gapic.schema import params
+from google.cloud.aiplatform.helpers import caching
+from google.cloud.aiplatform_v1beta1.types import explanation
+from google.cloud.aiplatform_v1beta1.types import prediction_service
+from google.protobuf.struct_pb2 import Value
+
+ENDPOINT = "projects/p/locations/l/endpoints/e"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _client(deployed_model_id="m1"):
+    client = mock.Mock()
+
+    def predict(endpoint=None, instances=None, parameters=None, request=None, **kw):
+        if request is not None:
+            instances = list(request._pb.instances)
+        response = prediction_service.PredictResponse(
+            deployed_model_id=client.deployed_model_id
+        )
+        response._pb.predictions.extend(
+            [Value(number_value=v.number_value * 10) for v in instances]
+        )
+        return response
+
+    def explain(endpoint=None, instances=None, request=None, **kw):
+        if request is not None:
+            instances = list(request._pb.instances)
+        response = prediction_service.ExplainResponse(
+            deployed_model_id=client.deployed_model_id
+        )
+        response._pb.predictions.extend(
+            [Value(number_value=v.number_value * 10) for v in instances]
+        )
+        response._pb.explanations.extend(
+            [explanation.Explanation()._pb for _ in instances]
+        )
+        return response
+
+    client.deployed_model_id = deployed_model_id
+    client.predict.side_effect = predict
+    client.explain.side_effect = explain
+    return client
+
+
+def _values(*numbers):
+    return [Value(number_value=n) for n in numbers]
+
+
+def _predictions(response):
+    return [p.number_value for p in response._pb.predictions]
+
+
+def test_partial_hit_sends_only_missing_instances():
+    client = _client()
+    caching_client = caching.CachingPredictionClient(client)
+
+    caching_client.predict(endpoint=ENDPOINT, instances=_values(1, 2))
+    response = caching_client.predict(endpoint=ENDPOINT, instances=_values(2, 3, 1))
+
+    assert _predictions(response) == [20, 30, 10]
+    assert response.deployed_model_id == "m1"
+    sent = client.predict.call_args_list[1][1]["instances"]
+    assert [v.number_value for v in sent] == [3]
+
+
+def test_full_hit_skips_the_rpc():
+    client = _client()
+    caching_client = caching.CachingPredictionClient(client)
+
+    caching_client.predict(endpoint=ENDPOINT, instances=_values(1, 2))
+    response = caching_client.predict(endpoint=ENDPOINT, instances=_values(2, 1))
+
+    assert _predictions(response) == [20, 10]
+    assert client.predict.call_count == 1
+    assert caching_client.cache.hits == 2
+
+
+def test_parameters_are_part_of_the_key():
+    client = _client()
+    caching_client = caching.CachingPredictionClient(client)
+
+    caching_client.predict(endpoint=ENDPOINT, instances=_values(1))
+    caching_client.predict(
+        endpoint=ENDPOINT, instances=_values(1), parameters=Value(bool_value=True)
+    )
+
+    assert client.predict.call_count == 2
+
+
+def test_enhanced_parameters_are_accepted():
+    client = _client()
+    caching_client = caching.CachingPredictionClient(client)
+    parameters = params.ImageClassificationPredictionParams(confidence_threshold=0.5)
+
+    caching_client.predict(
+        endpoint=ENDPOINT, instances=_values(1), parameters=parameters
+    )
+    caching_client.predict(
+        endpoint=ENDPOINT, instances=_values(1), parameters=parameters.to_value()
+    )
+    caching_client.predict(
+        endpoint=ENDPOINT,
+        instances=_values(1),
+        parameters=params.ImageClassificationPredictionParams(max_predictions=3),
+    )
+
+    assert client.predict.call_count == 2
+    assert client.predict.call_args_list[0][1]["parameters"] is parameters
+
+
+def test_request_objects_and_fields_share_entries():
+    client = _client()
+    caching_client = caching.CachingPredictionClient(client)
+    request = prediction_service.PredictRequest(
+        endpoint=ENDPOINT, parameters=Value(string_value="p")
+    )
+    request._pb.instances.extend(_values(4))
+
+    caching_client.predict(request)
+    response = caching_client.predict(
+        endpoint=ENDPOINT, instances=_values(4), parameters=Value(string_value="p")
+    )
+    caching_client.explain(
+        endpoint=ENDPOINT, instances=_values(4), deployed_model_id=""
+    )
+    explain_request = prediction_service.ExplainRequest(endpoint=ENDPOINT)
+    explain_request._pb.instances.extend(_values(4))
+    caching_client.explain(request=explain_request)
+
+    assert _predictions(response) == [40]
+    assert client.predict.call_count == 1
+    assert client.explain.call_count == 1
+
+
+def test_request_objects_are_cached():
+    client = _client()
+    caching_client = caching.CachingPredictionClient(client)
+    request = prediction_service.PredictRequest(endpoint=ENDPOINT)
+    request._pb.instances.extend(_values(4))
+
+    caching_client.predict(request)
+    response = caching_client.predict(request)
+
+    assert _predictions(response) == [40]
+    assert client.predict.call_count == 1
+
+
+def test_entries_expire():
+    clock = FakeClock()
+    client = _client()
+    caching_client = caching.CachingPredictionClient(
+        client, caching.PredictionCache(ttl=10, clock=clock)
+    )
+
+    caching_client.predict(endpoint=ENDPOINT, instances=_values(1))
+    clock.now = 11
+    caching_client.predict(endpoint=ENDPOINT, instances=_values(1))
+
+    assert client.predict.call_count == 2
+
+
+def test_model_change_invalidates_endpoint():
+    client = _client()
+    caching_client = caching.CachingPredictionClient(client)
+
+    caching_client.predict(endpoint=ENDPOINT, instances=_values(1, 2))
+    client.deployed_model_id = "m2"
+    caching_client.predict(endpoint=ENDPOINT, instances=_values(3))
+    caching_client.predict(endpoint=ENDPOINT, instances=_values(1))
+
+    assert client.predict.call_count == 3
+
+
+def _payload(text):
+    return (Value(string_value=text),)
+
+
+def test_lru_eviction_by_entries_and_bytes():
+    cache = caching.PredictionCache(max_entries=2, max_bytes=100)
+    cache.put(ENDPOINT, "a", _payload("a"), 10)
+    cache.put(ENDPOINT, "b", _payload("b"), 10)
+    cache.get(ENDPOINT, "a")
+    cache.put(ENDPOINT, "c", _payload("c"), 10)
+
+    assert cache.get(ENDPOINT, "b") is None
+    assert cache.get(ENDPOINT, "a") == _payload("a")
+
+    cache.put(ENDPOINT, "d", _payload("d"), 95)
+    assert len(cache) == 1
+    assert cache.byte_size == 95
+
+    cache.put(ENDPOINT, "e", _payload("e"), 101)
+    assert cache.get(ENDPOINT, "e") is None
+
+
+def test_cached_results_are_copies():
+    caching_client = caching.CachingPredictionClient(_client())
+
+    first = caching_client.predict(endpoint=ENDPOINT, instances=_values(1))
+    first._pb.predictions[0].number_value = -1
+    second = caching_client.predict(endpoint=ENDPOINT, instances=_values(1))
+    second._pb.predictions[0].number_value = -2
+    third = caching_client.predict(endpoint=ENDPOINT, instances=_values(1))
+
+    assert caching_client.cache.hits == 2
+    assert _predictions(third) == [10]
+    payload = caching_client.cache.get(
+        ENDPOINT, next(iter(caching_client.cache._entries))
+    )
+    payload[0].number_value = -3
+    assert _predictions(
+        caching_client.predict(endpoint=ENDPOINT, instances=_values(1))
+    ) == [10]
+
+
+def test_responses_are_not_cached_across_a_model_change():
+    client = _client()
+    caching_client = caching.CachingPredictionClient(client)
+    predict = client.predict.side_effect
+
+    def predict_during_redeploy(**kwargs):
+        response = predict(**kwargs)
+        # Another caller sees the new model before this response returns.
+        caching_client.cache.observe(ENDPOINT, "m2")
+        return response
+
+    client.predict.side_effect = predict_during_redeploy
+    caching_client.predict(endpoint=ENDPOINT, instances=_values(1))
+
+    assert len(caching_client.cache) == 0
+    assert caching_client.cache.generation(ENDPOINT) == 1
+
+
+def test_explain_partial_hit():
+    client = _client()
+    caching_client = caching.CachingPredictionClient(client)
+
+    caching_client.explain(endpoint=ENDPOINT, instances=_values(1))
+    response = caching_client.explain(endpoint=ENDPOINT, instances=_values(5, 1))
+
+    assert _predictions(response) == [50, 10]
+    assert len(response.explanations) == 2
+    assert client.explain.call_count == 2
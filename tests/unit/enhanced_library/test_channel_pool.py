@@ -0,0 +1,209 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import absolute_import
+from concurrent import futures
+
+import grpc
+from grpc.experimental import aio
+import mock
+import pytest
+
+from google.api_core import exceptions
+from google.auth import credentials
+from google.cloud.aiplatform.helpers import channel_pool
+from google.cloud.aiplatform_v1beta1.services.prediction_service import (
+    PredictionServiceAsyncClient,
+    PredictionServiceClient,
+)
+from google.cloud.aiplatform_v1beta1.services.prediction_service import transports
+from google.cloud.aiplatform_v1beta1.types import prediction_service
+
+ENDPOINT = "projects/p/locations/l/endpoints/e"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(scope="module")
+def server_address():
+    def predict(request, context):
+        if request.endpoint.endswith("unavailable"):
+            context.abort(grpc.StatusCode.UNAVAILABLE, "try later")
+        return prediction_service.PredictResponse(
+            deployed_model_id=str(len(request.instances))
+        )._pb
+
+    handler = grpc.method_handlers_generic_handler(
+        "google.cloud.aiplatform.v1beta1.PredictionService",
+        {
+            "Predict": grpc.unary_unary_rpc_method_handler(
+                predict,
+                request_deserializer=prediction_service.PredictRequest.pb().FromString,
+                response_serializer=lambda m: m.SerializeToString(),
+            )
+        },
+    )
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+    server.add_generic_rpc_handlers((handler,))
+    port = server.add_insecure_port("localhost:0")
+    server.start()
+    yield "localhost:{}".format(port)
+    server.stop(None)
+
+
+def test_round_robin():
+    balancer = channel_pool._Balancer(3, "round_robin", 1, 30, FakeClock())
+    picks = [balancer.acquire() for _ in range(6)]
+    assert picks == [0, 1, 2, 0, 1, 2]
+    assert balancer.outstanding() == [2, 2, 2]
+
+
+def test_least_outstanding():
+    balancer = channel_pool._Balancer(3, "least_outstanding", 1, 30, FakeClock())
+    first, second, third = (balancer.acquire() for _ in range(3))
+    balancer.release(second, None)
+    assert balancer.acquire() == second
+
+
+def test_unhealthy_channels_cool_down():
+    clock = FakeClock()
+    balancer = channel_pool._Balancer(2, "round_robin", 1, 30, clock)
+    balancer.release(balancer.acquire(), grpc.StatusCode.UNAVAILABLE)
+    assert balancer.healthy() == [False, True]
+    assert [balancer.acquire() for _ in range(3)] == [1, 1, 1]
+
+    clock.now = 1.5
+    assert balancer.healthy() == [True, True]
+    # An unrelated error does not count against the channel.
+    balancer.release(0, grpc.StatusCode.INVALID_ARGUMENT)
+    assert balancer.healthy() == [True, True]
+
+
+def test_only_ok_clears_failures():
+    clock = FakeClock()
+    balancer = channel_pool._Balancer(2, "round_robin", 1, 30, clock)
+    balancer.release(balancer.acquire(), grpc.StatusCode.UNAVAILABLE)
+
+    balancer.release(0, None)
+    assert balancer.healthy() == [False, True]
+
+    balancer.release(0, grpc.StatusCode.OK)
+    assert balancer.healthy() == [True, True]
+
+
+@pytest.mark.parametrize(
+    "pool_class", [channel_pool.ChannelPool, channel_pool.AsyncChannelPool]
+)
+def test_streaming_stubs_keep_unhealthy_channels_skipped(pool_class):
+    channels = [mock.Mock(), mock.Mock()]
+    clock = FakeClock()
+    pool = pool_class(channels, clock=clock)
+    balancer = pool._balancer
+    balancer.release(balancer.acquire(), grpc.StatusCode.UNAVAILABLE)
+    clock.now = 0.5
+    balancer.release(balancer.acquire(), grpc.StatusCode.UNAVAILABLE)
+
+    # Every channel is cooling down, so the stub goes to the first to
+    # recover, which must stay in its cooldown.
+    pool.unary_stream("/Service/Stream")
+
+    assert pool.healthy() == [False, False]
+    channels[0].unary_stream.assert_called_once()
+    clock.now = 1.2
+    assert pool.healthy() == [True, False]
+    pool.unary_stream("/Service/Stream")
+    pool.unary_stream("/Service/Stream")
+    assert channels[0].unary_stream.call_count == 3
+    channels[1].unary_stream.assert_not_called()
+    assert pool.outstanding() == [0, 0]
+
+
+def test_all_unhealthy_uses_first_to_recover():
+    clock = FakeClock()
+    balancer = channel_pool._Balancer(2, "round_robin", 1, 30, clock)
+    balancer.release(balancer.acquire(), grpc.StatusCode.UNAVAILABLE)
+    balancer.release(balancer.acquire(), grpc.StatusCode.UNAVAILABLE)
+    balancer.release(balancer.acquire(), grpc.StatusCode.UNAVAILABLE)
+    assert balancer.acquire() == 1
+
+
+def test_invalid_selection():
+    with pytest.raises(ValueError):
+        channel_pool.ChannelPool([mock.Mock()], selection="random")
+
+
+def test_sync_client_over_pool(server_address):
+    channels = [grpc.insecure_channel(server_address) for _ in range(3)]
+    pool = channel_pool.ChannelPool(channels)
+    client = PredictionServiceClient(
+        transport=transports.PredictionServiceGrpcTransport(channel=pool)
+    )
+
+    for count in range(6):
+        response = client.predict(
+            endpoint=ENDPOINT, instances=[1] * count, parameters=None
+        )
+        assert response.deployed_model_id == str(count)
+    assert pool.outstanding() == [0, 0, 0]
+
+    with pytest.raises(exceptions.ServiceUnavailable):
+        client.predict(
+            endpoint=ENDPOINT + "/unavailable", instances=[], retry=None,
+        )
+    assert pool.healthy().count(False) == 1
+    pool.close()
+
+
+@pytest.mark.asyncio
+async def test_async_client_over_pool(server_address):
+    channels = [aio.insecure_channel(server_address) for _ in range(2)]
+    pool = channel_pool.AsyncChannelPool(channels, selection="least_outstanding")
+    client = PredictionServiceAsyncClient(
+        transport=transports.PredictionServiceGrpcAsyncIOTransport(channel=pool)
+    )
+
+    response = await client.predict(endpoint=ENDPOINT, instances=[1, 2])
+
+    assert response.deployed_model_id == "2"
+    assert pool.outstanding() == [0, 0]
+    await pool.close()
+
+
+def test_pooled_transport():
+    creds = credentials.AnonymousCredentials()
+    with mock.patch.object(
+        transports.PredictionServiceGrpcTransport, "create_channel"
+    ) as create_channel:
+        create_channel.side_effect = lambda *args, **kwargs: mock.Mock(
+            spec=grpc.Channel
+        )
+        transport = channel_pool.pooled_transport(
+            transports.PredictionServiceGrpcTransport,
+            pool_size=3,
+            host="us-central1-aiplatform.googleapis.com",
+            credentials=creds,
+        )
+
+    assert isinstance(transport.grpc_channel, channel_pool.ChannelPool)
+    assert len(transport.grpc_channel.channels) == 3
+    assert create_channel.call_count == 3
+    args, kwargs = create_channel.call_args
+    assert args == ("us-central1-aiplatform.googleapis.com:443",)
+    assert kwargs["credentials"] is creds
+    assert ("grpc.use_local_subchannel_pool", 1) in kwargs["options"]
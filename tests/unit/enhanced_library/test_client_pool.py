@@ -0,0 +1,120 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import absolute_import
+
+from grpc.experimental import aio
+import mock
+import pytest
+
+from google.auth import credentials
+from google.cloud.aiplatform.helpers import channel_pool
+from google.cloud.aiplatform.helpers import client_pool
+from google.cloud.aiplatform_v1.services.job_service import JobServiceClient
+from google.cloud.aiplatform_v1.services.model_service import (
+    ModelServiceAsyncClient,
+    ModelServiceClient,
+)
+from google.cloud.aiplatform_v1beta1.services.dataset_service import (
+    DatasetServiceClient,
+)
+
+ENDPOINT = "us-central1-aiplatform.googleapis.com"
+
+
+@pytest.fixture
+def default_credentials():
+    creds = credentials.AnonymousCredentials()
+    with mock.patch.object(
+        client_pool.auth, "default", return_value=(creds, None)
+    ) as default:
+        yield default
+
+
+def test_clients_share_one_channel_per_endpoint(default_credentials):
+    with client_pool.ClientPool() as pool:
+        jobs = pool.client(JobServiceClient, api_endpoint=ENDPOINT)
+        models = pool.client(ModelServiceClient, location="us-central1")
+        datasets = pool.client(DatasetServiceClient, api_endpoint=ENDPOINT + ":443")
+        other = pool.client(JobServiceClient, location="europe-west4")
+
+        assert pool.client(JobServiceClient, api_endpoint=ENDPOINT) is jobs
+        channel = jobs._transport.grpc_channel
+        assert models._transport.grpc_channel is channel
+        assert datasets._transport.grpc_channel is channel
+        assert other._transport.grpc_channel is not channel
+        assert other._transport._host == "europe-west4-aiplatform.googleapis.com:443"
+        default_credentials.assert_called_once_with(
+            scopes=JobServiceClient.get_transport_class().AUTH_SCOPES,
+            quota_project_id=None,
+        )
+
+    assert pool.closed
+    with pytest.raises(RuntimeError):
+        pool.client(JobServiceClient)
+
+
+def test_close_closes_channels():
+    pool = client_pool.ClientPool(credentials.AnonymousCredentials())
+    with mock.patch.object(
+        JobServiceClient.get_transport_class(), "create_channel"
+    ) as create_channel:
+        pool.client(JobServiceClient)
+        pool.client(JobServiceClient)
+
+    create_channel.assert_called_once()
+    options = create_channel.call_args[1]["options"]
+    assert options == list(channel_pool._CHANNEL_OPTIONS)
+    pool.close()
+    create_channel.return_value.close.assert_called_once_with()
+
+
+def test_pool_size_spreads_calls_over_channels():
+    pool = client_pool.ClientPool(
+        credentials.AnonymousCredentials(), pool_size=3, selection="least_outstanding"
+    )
+
+    jobs = pool.client(JobServiceClient, location="us-central1")
+    models = pool.client(ModelServiceClient, location="us-central1")
+
+    channel = jobs._transport.grpc_channel
+    assert isinstance(channel, channel_pool.ChannelPool)
+    assert len(channel.channels) == 3
+    assert models._transport.grpc_channel is channel
+    pool.close()
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        client_pool.ClientPool(pool_size=0)
+    with pytest.raises(ValueError):
+        client_pool.ClientPool().client(
+            JobServiceClient, api_endpoint=ENDPOINT, location="us-central1"
+        )
+
+
+@pytest.mark.asyncio
+async def test_async_clients_get_their_own_channel():
+    async with client_pool.ClientPool(credentials.AnonymousCredentials()) as pool:
+        sync_client = pool.client(ModelServiceClient)
+        async_client = pool.client(ModelServiceAsyncClient)
+        channel = async_client._client._transport.grpc_channel
+
+        assert isinstance(channel, aio.Channel)
+        assert sync_client._transport.grpc_channel is not channel
+        assert pool.client(ModelServiceAsyncClient) is async_client
+
+        # close() leaves the async channel to aclose().
+        pool.close()
+        assert pool._channels
+    assert not pool._channels
@@ -0,0 +1,170 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import absolute_import
+
+import pytest
+
+from google.cloud.aiplatform.gapic.schema import predict
+from google.cloud.aiplatform.helpers import columnar
+from google.cloud.aiplatform_v1beta1.types import explanation
+from google.cloud.aiplatform_v1beta1.types import explanation_metadata
+from google.cloud.aiplatform_v1beta1.types import prediction_service
+from google.protobuf import json_format
+from google.protobuf.struct_pb2 import Value
+
+np = pytest.importorskip("numpy")
+
+
+def _response(predictions):
+    response = prediction_service.PredictResponse()
+    response._pb.predictions.extend(
+        [json_format.ParseDict(p, Value()) for p in predictions]
+    )
+    return response
+
+
+classification_response = _response(
+    [
+        {"ids": ["1", "2"], "displayNames": ["cat", "dog"], "confidences": [0.9, 0.1]},
+        {"ids": [2], "displayNames": ["dog"], "confidences": [0.7]},
+        {},
+    ]
+)
+
+
+def test_to_numpy_classification():
+    columns = columnar.to_numpy(
+        predict.prediction.ClassificationPredictionResult, classification_response
+    )
+
+    ids = columns["ids"]
+    assert len(ids) == 3
+    assert ids.values.tolist() == [1, 2, 2]
+    assert ids.offsets.tolist() == [0, 2, 3, 3]
+    assert ids[2].tolist() == []
+
+    names = columns["display_names"]
+    assert names.values.categories.tolist() == ["cat", "dog"]
+    assert names.values.codes.tolist() == [0, 1, 1]
+    assert names[0].tolist() == ["cat", "dog"]
+
+    confidences = columns["confidences"].values
+    assert confidences.dtype == np.float32
+    np.testing.assert_allclose(confidences, [0.9, 0.1, 0.7], rtol=1e-6)
+
+
+def test_to_numpy_scalar_fields():
+    response = _response(
+        [{"value": 1.5, "lowerBound": 1.0, "upper_bound": 2.0}, {"value": 3.0}]
+    )
+    columns = columnar.to_numpy(
+        predict.prediction.TimeSeriesForecastingPredictionResult, response._pb
+    )
+
+    assert columns["value"].tolist() == [1.5, 3.0]
+    assert columns["lower_bound"][0] == 1.0
+    assert np.isnan(columns["lower_bound"][1])
+    assert columns["upper_bound"][0] == 2.0
+
+
+def test_to_arrow_tabular_classification():
+    pyarrow = pytest.importorskip("pyarrow")
+    response = _response(
+        [
+            {"classes": ["yes", "no"], "scores": [0.8, 0.2]},
+            {"classes": ["yes", "no"], "scores": [0.4, 0.6]},
+        ]
+    )
+    table = columnar.to_arrow(
+        predict.prediction.TabularClassificationPredictionResult,
+        response._pb.predictions,
+    )
+
+    assert table.column_names == ["classes", "scores"]
+    assert table.num_rows == 2
+    classes = table.column("classes").combine_chunks()
+    assert pyarrow.types.is_dictionary(classes.type.value_type)
+    assert classes.to_pylist() == [["yes", "no"], ["yes", "no"]]
+
+
+def _explain_response():
+    response = prediction_service.ExplainResponse()
+    for attributions in (
+        [
+            {
+                "baselineOutputValue": 0.1,
+                "instanceOutputValue": 0.9,
+                "outputDisplayName": "cat",
+                "featureAttributions": {"age": 0.5, "pixels": [[0.1, 0.2], [0.3]]},
+            },
+            {
+                "instanceOutputValue": 0.4,
+                "outputDisplayName": "dog",
+                "featureAttributions": {"age": -0.2, "unknown": 1.0},
+            },
+        ],
+        [{"instanceOutputValue": 0.7, "featureAttributions": {"pixels": 0.25}}],
+    ):
+        response._pb.explanations.add().CopyFrom(
+            json_format.ParseDict(
+                {"attributions": attributions}, explanation.Explanation.pb()()
+            )
+        )
+    return response
+
+
+def test_attributions_to_numpy_with_metadata():
+    metadata = explanation_metadata.ExplanationMetadata(
+        inputs={
+            "pixels": explanation_metadata.ExplanationMetadata.InputMetadata(),
+            "age": explanation_metadata.ExplanationMetadata.InputMetadata(),
+        }
+    )
+
+    matrix = columnar.attributions_to_numpy(_explain_response(), metadata=metadata)
+
+    assert matrix.feature_names == ("age", "pixels")
+    assert matrix.attributions.shape == (2, 2, 2)
+    np.testing.assert_allclose(matrix.attributions[0, 0], [0.5, 0.6])
+    assert matrix.attributions[0, 1, 0] == -0.2
+    assert np.isnan(matrix.attributions[0, 1, 1])
+    assert np.isnan(matrix.attributions[1, 1]).all()
+    np.testing.assert_allclose(matrix.instance_output_values[:, 0], [0.9, 0.7])
+    assert np.isnan(matrix.baseline_output_values[1, 1])
+    assert matrix.output_display_names.tolist() == [["cat", "dog"], ["", None]]
+
+
+def test_attributions_to_numpy_discovers_features():
+    matrix = columnar.attributions_to_numpy(_explain_response()._pb.explanations)
+
+    assert matrix.feature_names == ("age", "pixels", "unknown")
+    assert matrix.attributions[0, 1, 2] == 1.0
+    assert matrix.attributions[1, 0, 1] == 0.25
+
+
+def test_attributions_to_numpy_sorts_discovered_features():
+    explanations = [
+        json_format.ParseDict(
+            {"attributions": [{"featureAttributions": features}]},
+            explanation.Explanation.pb()(),
+        )
+        for features in ({"zeta": 1.0, "mu": 2.0}, {"alpha": 3.0, "zeta": 4.0})
+    ]
+
+    matrix = columnar.attributions_to_numpy(explanations)
+
+    assert matrix.feature_names == ("alpha", "mu", "zeta")
+    np.testing.assert_equal(
+        matrix.attributions[:, 0], [[np.nan, 2.0, 1.0], [3.0, np.nan, 4.0]]
+    )
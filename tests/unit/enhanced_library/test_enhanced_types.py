@@ -12,7 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from __future__ import absolute_import
+import os
+import subprocess
+import sys
 
+import mock
+import pytest
+
+from google.auth import credentials
 from google.cloud.aiplatform.v1beta1.schema.trainingjob import definition
 
 ModelType = definition.AutoMlImageClassificationInputs().ModelType
@@ -34,3 +41,77 @@ def test_exposes_from_value_method():
 
 def test_exposes_from_map_method():
     assert hasattr(test_training_input, "from_map")
+
+
+def test_bulk_methods_round_trip():
+    cls = definition.AutoMlImageClassificationInputs
+    values = cls.to_values([test_training_input] * 2)
+
+    assert values == [test_training_input.to_value()] * 2
+    assert cls.from_values(values) == [test_training_input._pb] * 2
+    assert (
+        cls.columns_to_values(
+            {
+                "multi_label": [True],
+                "model_type": [ModelType.CLOUD],
+                "budget_milli_node_hours": [8000],
+                "disable_early_stopping": [False],
+            }
+        )
+        == values[:1]
+    )
+
+
+def test_schema_types_load_on_first_use():
+    script = """
+import sys
+import google.cloud.aiplatform.gapic.schema as schema
+assert not [m for m in sys.modules if ".schema.predict" in m or "numpy" in m]
+assert schema.predict.instance.ImageClassificationPredictionInstance.to_value
+assert not [m for m in sys.modules if ".schema.trainingjob" in m]
+"""
+    subprocess.check_call([sys.executable, "-c", script])
+
+
+def test_schema_keeps_baseline_names():
+    script = """
+import google.cloud.aiplatform.gapic.schema as schema
+from google.cloud.aiplatform.gapic.schema import definition, instance, params, prediction
+from google.cloud.aiplatform.v1beta1.schema.predict import instance_v1beta1
+assert schema.instance is instance_v1beta1.types
+assert params.ImageClassificationPredictionParams.to_value
+assert prediction.ClassificationPredictionResult.from_value
+assert definition.AutoMlImageClassificationInputs.from_map
+assert schema.enhanced_types_packages == [instance, params, prediction, definition]
+assert set(schema.__all__) <= set(dir(schema))
+for name in schema.__all__:
+    getattr(schema, name)
+"""
+    subprocess.check_call([sys.executable, "-c", script])
+
+
+def test_clients_load_on_first_use():
+    script = """
+import sys
+from google.cloud import aiplatform
+assert not [m for m in sys.modules if m.startswith("google.cloud.aiplatform_v1")]
+client = aiplatform.gapic.EndpointServiceClient
+assert client is aiplatform.gapic.v1.EndpointServiceClient
+assert not [m for m in sys.modules if ".services.dataset_service" in m or "pkg_resources" in m]
+assert "DatasetServiceClient" in dir(aiplatform.gapic)
+"""
+    subprocess.check_call([sys.executable, "-c", script])
+
+
+@pytest.mark.parametrize("value", ["true", "True", "1", "yes", "false", "0", "off"])
+def test_client_certificate_env_keeps_lenient_parsing(value):
+    from google.cloud.aiplatform_v1.services.prediction_service import (
+        PredictionServiceClient,
+    )
+
+    with mock.patch.dict(os.environ, {"GOOGLE_API_USE_CLIENT_CERTIFICATE": value}):
+        PredictionServiceClient(credentials=credentials.AnonymousCredentials())
+
+    with mock.patch.dict(os.environ, {"GOOGLE_API_USE_CLIENT_CERTIFICATE": "maybe"}):
+        with pytest.raises(ValueError):
+            PredictionServiceClient(credentials=credentials.AnonymousCredentials())
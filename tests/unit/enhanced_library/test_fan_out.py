@@ -0,0 +1,246 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import absolute_import
+import asyncio
+import collections
+import threading
+import time
+
+import pytest
+
+from google.api_core import exceptions
+from google.cloud.aiplatform.helpers import fan_out
+from google.cloud.aiplatform_v1.services.model_service import (
+    ModelServiceAsyncClient,
+    ModelServiceClient,
+    pagers,
+)
+from google.cloud.aiplatform_v1.types import model
+from google.cloud.aiplatform_v1.types import model_service
+
+US = "projects/p/locations/us-central1"
+EU = "projects/p/locations/europe-west4"
+BROKEN = "projects/p/locations/broken"
+FLAKY = "projects/p/locations/flaky"
+
+
+def _page(parent, index, pages=3):
+    return model_service.ListModelsResponse(
+        models=[
+            model.Model(name="{}/models/{}-{}".format(parent, index, i))
+            for i in range(2)
+        ],
+        next_page_token="" if index + 1 == pages else str(index + 1),
+    )
+
+
+class FakeClient:
+    """Lists three pages of two models under every parent."""
+
+    def __init__(self, delay=0.0):
+        self.requests = []
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def _fetch(self, request):
+        self.requests.append(request)
+        if request.parent == BROKEN:
+            raise exceptions.PermissionDenied("no access")
+        index = int(request.page_token or 0)
+        if request.parent == FLAKY and index == 1:
+            raise exceptions.ServiceUnavailable("try later")
+        return _page(request.parent, index)
+
+    def _method(self, request, metadata=()):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            return self._fetch(request)
+        finally:
+            with self.lock:
+                self.active -= 1
+
+    def list_models(self, request, retry=None, timeout=None, metadata=()):
+        request = model_service.ListModelsRequest(request)
+        return pagers.ListModelsPager(
+            self._method, request, self._method(request), metadata=metadata
+        )
+
+
+class FakePool:
+    def __init__(self, client):
+        self.fake_client = client
+        self.endpoints = collections.Counter()
+
+    def client(self, client_class, api_endpoint=None):
+        self.endpoints[api_endpoint] += 1
+        return self.fake_client
+
+
+def _by_parent(listed):
+    grouped = collections.defaultdict(list)
+    for entry in listed:
+        grouped[entry.parent].append(entry.item.name if entry.error is None else entry)
+    return grouped
+
+
+def test_merges_every_parent():
+    pool = FakePool(FakeClient())
+
+    listed = list(
+        fan_out.list_across(
+            pool,
+            ModelServiceClient,
+            "list_models",
+            [US, EU, ("projects/q/locations/global", "aiplatform.googleapis.com")],
+            request={"filter": "labels.team=x"},
+        )
+    )
+
+    grouped = _by_parent(listed)
+    assert grouped[US] == [m.name for i in range(3) for m in _page(US, i).models]
+    assert len(grouped[EU]) == 6
+    assert len(grouped["projects/q/locations/global"]) == 6
+    assert pool.endpoints == {
+        "us-central1-aiplatform.googleapis.com": 1,
+        "europe-west4-aiplatform.googleapis.com": 1,
+        "aiplatform.googleapis.com": 1,
+    }
+    assert {r.filter for r in pool.fake_client.requests} == {"labels.team=x"}
+
+
+def test_failures_are_isolated():
+    listed = list(
+        fan_out.list_across(
+            FakePool(FakeClient()),
+            ModelServiceClient,
+            "list_models",
+            [BROKEN, US, FLAKY],
+            max_concurrency=1,
+        )
+    )
+
+    grouped = _by_parent(listed)
+    assert len(grouped[US]) == 6
+    (broken,) = grouped[BROKEN]
+    assert broken.item is None
+    assert isinstance(broken.error, exceptions.PermissionDenied)
+    *flaky_models, flaky = grouped[FLAKY]
+    assert len(flaky_models) == 2
+    assert isinstance(flaky.error, exceptions.ServiceUnavailable)
+
+
+def test_concurrency_is_capped():
+    client = FakeClient(delay=0.01)
+    parents = ["projects/p{}/locations/us-central1".format(i) for i in range(8)]
+
+    listed = list(
+        fan_out.list_across(
+            FakePool(client),
+            ModelServiceClient,
+            "list_models",
+            parents,
+            max_concurrency=3,
+        )
+    )
+
+    assert len(listed) == 48
+    assert 1 < client.max_active <= 3
+
+
+def test_stopping_stops_the_workers():
+    client = FakeClient(delay=0.01)
+    parents = ["projects/p{}/locations/us-central1".format(i) for i in range(20)]
+    listed = fan_out.list_across(
+        FakePool(client), ModelServiceClient, "list_models", parents, max_concurrency=2,
+    )
+
+    next(listed)
+    listed.close()
+    time.sleep(0.05)
+
+    assert len(client.requests) < 10
+
+
+def test_invalid_concurrency():
+    with pytest.raises(ValueError):
+        fan_out.list_across(
+            None, ModelServiceClient, "list_models", [], max_concurrency=0
+        )
+
+
+class FakeAsyncClient(FakeClient):
+    async def _async_method(self, request, metadata=()):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            return self._fetch(request)
+        finally:
+            self.active -= 1
+
+    async def list_models(self, request, retry=None, timeout=None, metadata=()):
+        request = model_service.ListModelsRequest(request)
+        return pagers.ListModelsAsyncPager(
+            self._async_method,
+            request,
+            await self._async_method(request),
+            metadata=metadata,
+        )
+
+
+@pytest.mark.asyncio
+async def test_async_merges_and_isolates_failures():
+    client = FakeAsyncClient(delay=0.001)
+
+    listed = [
+        entry
+        async for entry in fan_out.list_across(
+            FakePool(client),
+            ModelServiceAsyncClient,
+            "list_models",
+            [US, BROKEN, EU, FLAKY],
+            max_concurrency=2,
+        )
+    ]
+
+    grouped = _by_parent(listed)
+    assert grouped[US] == [m.name for i in range(3) for m in _page(US, i).models]
+    assert len(grouped[EU]) == 6
+    assert isinstance(grouped[BROKEN][0].error, exceptions.PermissionDenied)
+    assert isinstance(grouped[FLAKY][-1].error, exceptions.ServiceUnavailable)
+    assert client.max_active <= 2
+
+
+@pytest.mark.asyncio
+async def test_async_stopping_cancels_the_workers():
+    client = FakeAsyncClient(delay=0.01)
+    parents = ["projects/p{}/locations/us-central1".format(i) for i in range(20)]
+    listed = fan_out.list_across(
+        FakePool(client),
+        ModelServiceAsyncClient,
+        "list_models",
+        parents,
+        max_concurrency=2,
+    )
+
+    await listed.__anext__()
+    await listed.aclose()
+
+    assert client.active == 0
+    assert len(client.requests) < 10
@@ -0,0 +1,191 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import absolute_import
+
+import asyncio
+import threading
+
+import mock
+import pytest
+
+from google.api_core import exceptions
+from google.cloud.aiplatform.helpers import hedging
+from google.cloud.aiplatform_v1beta1.types import prediction_service
+
+PRIMARY = "projects/p/locations/us-central1/endpoints/e"
+SECONDARY = "projects/p/locations/europe-west4/endpoints/e"
+
+
+def _client(block=None, error=None):
+    client = mock.Mock()
+
+    def predict(endpoint=None, **kwargs):
+        if block is not None:
+            block.wait(5)
+        if error is not None:
+            raise error
+        return prediction_service.PredictResponse(deployed_model_id=endpoint)
+
+    client.predict.side_effect = predict
+    return client
+
+
+def test_policy_percentile_delay():
+    policy = hedging.HedgePolicy(delay=1.0, percentile=90, min_samples=10)
+    assert policy.hedge_delay() == 1.0
+    for latency in range(1, 11):
+        policy.record(latency / 100)
+    assert policy.hedge_delay() == pytest.approx(0.09)
+
+
+def test_policy_budget():
+    policy = hedging.HedgePolicy(budget=0.5, burst=1)
+    assert policy.try_acquire()
+    assert not policy.try_acquire()
+    policy.hedge_delay()
+    policy.hedge_delay()
+    assert policy.try_acquire()
+    assert policy.hedges_sent == 2
+
+
+def test_requires_hedge_target():
+    with pytest.raises(ValueError):
+        hedging.HedgingPredictionClient(_client(), PRIMARY)
+
+
+def test_fast_primary_is_not_hedged():
+    primary, secondary = _client(), _client()
+    client = hedging.HedgingPredictionClient(
+        primary, PRIMARY, secondary, SECONDARY, hedging.HedgePolicy(delay=5)
+    )
+
+    response = client.predict(instances=[])
+
+    assert response.deployed_model_id == PRIMARY
+    secondary.predict.assert_not_called()
+    assert client.policy.hedges_sent == 0
+
+
+def test_slow_primary_is_hedged():
+    unblock = threading.Event()
+    primary, secondary = _client(block=unblock), _client()
+    client = hedging.HedgingPredictionClient(
+        primary, PRIMARY, secondary, SECONDARY, hedging.HedgePolicy(delay=0.01)
+    )
+
+    response = client.predict(instances=[], timeout=3)
+    unblock.set()
+
+    assert response.deployed_model_id == SECONDARY
+    assert secondary.predict.call_args[1]["timeout"] == 3
+    assert client.policy.hedges_won == 1
+    client.close()
+
+
+def test_exhausted_budget_waits_for_primary():
+    unblock = threading.Event()
+    primary, secondary = _client(block=unblock), _client()
+    policy = hedging.HedgePolicy(delay=0.01, budget=0, burst=0)
+    client = hedging.HedgingPredictionClient(primary, PRIMARY, secondary, policy=policy)
+    threading.Timer(0.05, unblock.set).start()
+
+    response = client.predict(instances=[])
+
+    assert response.deployed_model_id == PRIMARY
+    secondary.predict.assert_not_called()
+
+
+def test_failed_hedge_falls_back_to_primary():
+    unblock = threading.Event()
+    primary = _client(block=unblock)
+    secondary = _client(error=exceptions.ServiceUnavailable("down"))
+    client = hedging.HedgingPredictionClient(
+        primary, PRIMARY, secondary, SECONDARY, hedging.HedgePolicy(delay=0.01)
+    )
+    threading.Timer(0.05, unblock.set).start()
+
+    assert client.predict(instances=[]).deployed_model_id == PRIMARY
+
+
+def test_both_failures_raise_primary_error():
+    client = hedging.HedgingPredictionClient(
+        _client(error=exceptions.DeadlineExceeded("slow")),
+        PRIMARY,
+        _client(error=exceptions.ServiceUnavailable("down")),
+        policy=hedging.HedgePolicy(delay=5),
+    )
+
+    with pytest.raises(exceptions.DeadlineExceeded):
+        client.predict(instances=[])
+
+
+@pytest.mark.asyncio
+async def test_async_loser_is_cancelled():
+    cancelled = []
+
+    async def slow(endpoint=None, **kwargs):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(endpoint)
+            raise
+
+    async def fast(endpoint=None, **kwargs):
+        return prediction_service.PredictResponse(deployed_model_id=endpoint)
+
+    primary, secondary = mock.Mock(), mock.Mock()
+    primary.predict.side_effect = slow
+    secondary.predict.side_effect = fast
+    client = hedging.HedgingPredictionAsyncClient(
+        primary, PRIMARY, secondary, SECONDARY, hedging.HedgePolicy(delay=0.01)
+    )
+
+    response = await client.predict(instances=[])
+    await asyncio.sleep(0)
+
+    assert response.deployed_model_id == SECONDARY
+    assert cancelled == [PRIMARY]
+
+
+@pytest.mark.asyncio
+async def test_async_slow_primaries_keep_the_delay_up():
+    calls = []
+
+    async def sometimes_slow(endpoint=None, **kwargs):
+        calls.append(endpoint)
+        await asyncio.sleep(0.001 if len(calls) % 2 else 5)
+        return prediction_service.PredictResponse(deployed_model_id=endpoint)
+
+    async def fast(endpoint=None, **kwargs):
+        await asyncio.sleep(0.005)
+        return prediction_service.PredictResponse(deployed_model_id=endpoint)
+
+    primary, secondary = mock.Mock(), mock.Mock()
+    primary.predict.side_effect = sometimes_slow
+    secondary.predict.side_effect = fast
+    policy = hedging.HedgePolicy(
+        delay=0.02, percentile=90, budget=1, min_samples=4, window=10
+    )
+    client = hedging.HedgingPredictionAsyncClient(
+        primary, PRIMARY, secondary, SECONDARY, policy
+    )
+
+    for _ in range(10):
+        await client.predict(instances=[])
+        await asyncio.sleep(0)
+
+    assert policy.hedges_won == 5
+    # Half of the primaries lose to the hedge after at least 20ms; only
+    # counting the fast ones would put the delay near 1ms.
+    assert policy.hedge_delay() >= 0.02
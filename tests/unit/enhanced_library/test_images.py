@@ -0,0 +1,136 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import absolute_import
+import base64
+
+import mock
+import pytest
+
+from google.cloud.aiplatform.gapic.schema import predict
+from google.cloud.aiplatform.helpers import batching
+from google.cloud.aiplatform.helpers import images
+from google.cloud.aiplatform_v1beta1.types import prediction_service
+
+
+@pytest.fixture
+def image_files(tmp_path):
+    paths = []
+    for i in range(10):
+        path = tmp_path / "image_{}.png".format(i)
+        path.write_bytes(bytes([i]) * (i + 1))
+        paths.append(path)
+    return paths
+
+
+def test_encode_images_in_order(image_files):
+    instances = list(images.encode_images(image_files, max_workers=3, max_pending=2))
+
+    assert len(instances) == 10
+    for i, instance in enumerate(instances):
+        decoded = predict.instance.ImageClassificationPredictionInstance.from_value(
+            instance
+        )
+        assert base64.b64decode(decoded.content) == bytes([i]) * (i + 1)
+        assert decoded.mime_type == "image/png"
+
+
+def test_encode_images_matches_to_value():
+    for instance_type in (
+        predict.instance.ImageClassificationPredictionInstance,
+        predict.instance.ImageObjectDetectionPredictionInstance,
+        predict.instance.ImageSegmentationPredictionInstance,
+    ):
+        (instance,) = images.encode_images(
+            [b"\x89PNG"], instance_type, mime_type="image/png"
+        )
+        expected = instance_type(
+            content=base64.b64encode(b"\x89PNG").decode(), mime_type="image/png"
+        ).to_value()
+        assert instance == expected
+
+
+@pytest.mark.parametrize("size", [0, 1, 5, 6, 7, 12, 13, 14])
+def test_encode_images_in_chunks(tmp_path, monkeypatch, size):
+    monkeypatch.setattr(images, "_CHUNK_SIZE", 6)
+    data = bytes(range(size))
+    path = tmp_path / "image.jpg"
+    path.write_bytes(data)
+
+    from_file, from_bytes = images.encode_images([path, data])
+
+    expected = base64.b64encode(data).decode()
+    assert from_file.struct_value.fields["content"].string_value == expected
+    assert from_bytes.struct_value.fields["content"].string_value == expected
+
+
+@pytest.mark.parametrize("size_hint", [0, 8, 100])
+def test_b64encode_chunks_adjusts_to_actual_size(size_hint):
+    encoded = images._b64encode_chunks([b"abc", b"def", b"gh"], size_hint)
+
+    assert bytes(encoded) == base64.b64encode(b"abcdefgh")
+
+
+def test_encode_images_reads_files_in_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(images, "_CHUNK_SIZE", 3)
+    path = tmp_path / "image.jpg"
+    path.write_bytes(b"abcdefgh")
+    reads = []
+    real_open = open
+
+    def tracking_open(*args, **kwargs):
+        f = real_open(*args, **kwargs)
+        read = f.read
+
+        def tracked_read(size=-1):
+            data = read(size)
+            reads.append(len(data))
+            return data
+
+        f.read = tracked_read
+        return f
+
+    with mock.patch("builtins.open", tracking_open):
+        list(images.encode_images([path]))
+
+    assert reads == [3, 3, 2, 0]
+
+
+def test_encode_images_rejects_other_instances():
+    with pytest.raises(TypeError):
+        list(
+            images.encode_images(
+                [b""], predict.params.ImageClassificationPredictionParams
+            )
+        )
+
+
+def test_encode_images_propagates_errors(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        list(images.encode_images([tmp_path / "missing.jpg"]))
+
+
+def test_predict_images(image_files):
+    def predict_(endpoint, instances, parameters, **kwargs):
+        response = prediction_service.PredictResponse()
+        response.predictions.extend(
+            [len(v.struct_value.fields["content"].string_value) for v in instances]
+        )
+        return response
+
+    client = mock.Mock()
+    client.predict.side_effect = predict_
+    with batching.BatchingPredictor(client, "e", max_instances=4) as predictor:
+        results = list(images.predict_images(predictor, image_files, max_in_flight=3))
+
+    assert results == [len(base64.b64encode(bytes(i + 1))) for i in range(10)]
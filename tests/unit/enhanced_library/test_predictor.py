@@ -0,0 +1,93 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import absolute_import
+
+import mock
+import pytest
+
+from google.auth import credentials
+from google.cloud.aiplatform import gapic
+from google.cloud.aiplatform.gapic.schema import predict
+from google.cloud.aiplatform.helpers.predictor import EndpointPredictor
+from google.cloud.aiplatform_v1beta1.services.prediction_service import (
+    PredictionServiceClient,
+)
+from google.cloud.aiplatform_v1beta1.types import prediction_service
+from google.protobuf.struct_pb2 import Value
+
+ENDPOINT = "projects/p/locations/l/endpoints/e"
+
+
+@pytest.fixture
+def client():
+    return PredictionServiceClient(credentials=credentials.AnonymousCredentials())
+
+
+def test_predict_matches_client(client):
+    parameters = predict.params.ImageClassificationPredictionParams(max_predictions=3)
+    predictor = EndpointPredictor(
+        client, ENDPOINT, parameters, metadata=[("x-extra", "1")]
+    )
+    instances = [Value(number_value=1), Value(string_value="a")]
+
+    with mock.patch.object(type(client.transport.predict), "__call__") as call:
+        call.return_value = prediction_service.PredictResponse(deployed_model_id="m")
+        response = predictor.predict(instances)
+        client.predict(
+            endpoint=ENDPOINT,
+            instances=instances,
+            parameters=parameters.to_value(),
+            metadata=[("x-extra", "1")],
+        )
+
+    assert response.deployed_model_id == "m"
+    (_, ours, our_kw), (_, theirs, their_kw) = call.mock_calls
+    assert ours[0] == theirs[0]
+    assert our_kw["metadata"] == their_kw["metadata"]
+    assert predictor.endpoint == ENDPOINT
+
+
+def test_predict_converts_enhanced_types(client):
+    predictor = EndpointPredictor(client, ENDPOINT)
+    instance = predict.instance.ImageClassificationPredictionInstance(content="abc")
+
+    with mock.patch.object(type(client.transport.predict), "__call__") as call:
+        call.return_value = prediction_service.PredictResponse()
+        predictor.predict(iter([Value(number_value=1), instance]))
+        predictor.predict([], metadata=[("x-call", "2")])
+
+    first, second = call.mock_calls
+    assert list(first[1][0]._pb.instances) == [
+        Value(number_value=1),
+        instance.to_value(),
+    ]
+    assert not first[1][0]._pb.HasField("parameters")
+    assert ("x-call", "2") in second[2]["metadata"]
+    assert second[2]["metadata"][-1] == (
+        "x-goog-request-params",
+        "endpoint={}".format(ENDPOINT),
+    )
+
+
+def test_v1_client():
+    client = gapic.PredictionServiceClient(
+        credentials=credentials.AnonymousCredentials()
+    )
+    predictor = EndpointPredictor(client, ENDPOINT)
+
+    with mock.patch.object(type(client.transport.predict), "__call__") as call:
+        call.return_value = gapic.PredictResponse()
+        predictor.predict([Value(number_value=1)])
+
+    assert isinstance(call.mock_calls[0][1][0], gapic.PredictRequest)
@@ -0,0 +1,207 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import absolute_import
+import asyncio
+import threading
+import time
+
+import pytest
+
+from google.api_core import exceptions
+from google.cloud.aiplatform.helpers import prefetch
+from google.cloud.aiplatform_v1.services.job_service import pagers
+from google.cloud.aiplatform_v1.types import custom_job
+from google.cloud.aiplatform_v1.types import job_service
+
+METADATA = (("x-goog-request-params", "parent=p"),)
+
+
+def _page(index, last=4):
+    return job_service.ListCustomJobsResponse(
+        custom_jobs=[
+            custom_job.CustomJob(name="job-{}-{}".format(index, i)) for i in range(2)
+        ],
+        next_page_token="" if index == last else str(index + 1),
+    )
+
+
+def _names(jobs):
+    return [job.name for job in jobs]
+
+
+class FakeList:
+    """A List method returning page N for page token N."""
+
+    def __init__(self, fail_at=None):
+        self.tokens = []
+        self.fail_at = fail_at
+        self.called = threading.Condition()
+
+    def __call__(self, request, metadata=()):
+        assert metadata == METADATA
+        with self.called:
+            self.tokens.append(request.page_token)
+            self.called.notify_all()
+        index = int(request.page_token)
+        if index == self.fail_at:
+            raise exceptions.ServiceUnavailable("try later")
+        return _page(index)
+
+    def wait_for_calls(self, count, timeout=5):
+        with self.called:
+            return self.called.wait_for(lambda: len(self.tokens) >= count, timeout)
+
+
+def _pager(method):
+    return pagers.ListCustomJobsPager(
+        method,
+        job_service.ListCustomJobsRequest(parent="p"),
+        _page(0),
+        metadata=METADATA,
+    )
+
+
+def test_iterates_every_item():
+    method = FakeList()
+
+    jobs = prefetch.prefetch(_pager(method), depth=2)
+
+    assert _names(jobs) == _names(_pager(FakeList()))
+    assert method.tokens == ["1", "2", "3", "4"]
+    assert jobs.next_page_token == ""
+
+
+def test_fetches_ahead_up_to_depth():
+    method = FakeList()
+    pages = prefetch.prefetch(_pager(method), depth=2).pages
+
+    next(pages)
+
+    assert method.wait_for_calls(2)
+    time.sleep(0.05)
+    assert method.tokens == ["1", "2"]
+    next(pages)
+    assert method.wait_for_calls(3)
+    pages.close()
+
+
+def test_errors_are_raised_at_their_page():
+    pager = prefetch.prefetch(_pager(FakeList(fail_at=2)))
+    pages = pager.pages
+
+    assert next(pages).next_page_token == "1"
+    assert next(pages).next_page_token == "2"
+    with pytest.raises(exceptions.ServiceUnavailable):
+        next(pages)
+
+
+def test_close_stops_prefetching():
+    method = FakeList()
+    with prefetch.prefetch(_pager(method), depth=1) as pager:
+        for job in pager:
+            break
+        assert method.wait_for_calls(1)
+
+    time.sleep(0.05)
+    assert method.tokens == ["1"]
+
+
+def test_single_page():
+    pager = pagers.ListCustomJobsPager(
+        FakeList(), job_service.ListCustomJobsRequest(), _page(0, last=0)
+    )
+
+    assert len(list(prefetch.prefetch(pager))) == 2
+
+
+def test_invalid_depth():
+    with pytest.raises(ValueError):
+        prefetch.prefetch(_pager(FakeList()), depth=0)
+
+
+class FakeAsyncList:
+    def __init__(self, fail_at=None, block_at=None):
+        self.tokens = []
+        self.fail_at = fail_at
+        self.block_at = block_at
+        self.cancelled = False
+
+    async def __call__(self, request, metadata=()):
+        self.tokens.append(request.page_token)
+        index = int(request.page_token)
+        if index == self.fail_at:
+            raise exceptions.ServiceUnavailable("try later")
+        if index == self.block_at:
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                self.cancelled = True
+                raise
+        return _page(index)
+
+
+def _async_pager(method):
+    return pagers.ListCustomJobsAsyncPager(
+        method,
+        job_service.ListCustomJobsRequest(parent="p"),
+        _page(0),
+        metadata=METADATA,
+    )
+
+
+@pytest.mark.asyncio
+async def test_async_iterates_every_item():
+    method = FakeAsyncList()
+
+    jobs = prefetch.prefetch(_async_pager(method), depth=2)
+
+    assert isinstance(jobs, prefetch.AsyncPrefetchingPager)
+    assert _names([job async for job in jobs]) == _names(_pager(FakeList()))
+    assert method.tokens == ["1", "2", "3", "4"]
+
+
+@pytest.mark.asyncio
+async def test_async_fetches_ahead_up_to_depth():
+    method = FakeAsyncList()
+    pages = prefetch.prefetch(_async_pager(method), depth=2).pages
+
+    await pages.__anext__()
+    await asyncio.sleep(0.01)
+
+    assert method.tokens == ["1", "2"]
+    await pages.aclose()
+
+
+@pytest.mark.asyncio
+async def test_async_errors_are_raised_at_their_page():
+    pages = prefetch.prefetch(_async_pager(FakeAsyncList(fail_at=2)), depth=3).pages
+
+    assert (await pages.__anext__()).next_page_token == "1"
+    assert (await pages.__anext__()).next_page_token == "2"
+    with pytest.raises(exceptions.ServiceUnavailable):
+        await pages.__anext__()
+
+
+@pytest.mark.asyncio
+async def test_async_close_cancels_request_in_flight():
+    method = FakeAsyncList(block_at=1)
+
+    async with prefetch.prefetch(_async_pager(method)) as pager:
+        pages = pager.pages
+        await pages.__anext__()
+        await asyncio.sleep(0.01)
+
+    assert method.tokens == ["1"]
+    assert method.cancelled
+    await pages.aclose()
@@ -0,0 +1,205 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import absolute_import
+from concurrent import futures
+
+import grpc
+from grpc.experimental import aio
+import pytest
+
+from google.api_core import exceptions
+from google.api_core import gapic_v1
+from google.api_core import retry as retries
+from google.cloud.aiplatform import gapic
+from google.cloud.aiplatform.helpers import raw
+from google.cloud.aiplatform_v1beta1.services.prediction_service import (
+    PredictionServiceAsyncClient,
+    PredictionServiceClient,
+)
+from google.cloud.aiplatform_v1beta1.services.prediction_service import transports
+from google.cloud.aiplatform_v1beta1.types import prediction_service
+from google.protobuf.struct_pb2 import Value
+
+ENDPOINT = "projects/p/locations/l/endpoints/e"
+
+
+def _request(endpoint=ENDPOINT):
+    pb = prediction_service.PredictRequest.pb()(endpoint=endpoint)
+    pb.instances.add().number_value = 3
+    pb.parameters.string_value = "p"
+    return pb
+
+
+@pytest.fixture(scope="module")
+def server():
+    state = {"calls": [], "fail": 0}
+
+    def handle(service):
+        def predict(request, context):
+            state["calls"].append(
+                (service, request, dict(context.invocation_metadata()))
+            )
+            state["time_remaining"] = context.time_remaining()
+            if state["fail"]:
+                state["fail"] -= 1
+                context.abort(grpc.StatusCode.UNAVAILABLE, "try again")
+            response = prediction_service.PredictResponse.pb()(deployed_model_id="m")
+            response.predictions.extend(request.instances)
+            return response
+
+        return grpc.method_handlers_generic_handler(
+            service,
+            {
+                "Predict": grpc.unary_unary_rpc_method_handler(
+                    predict,
+                    request_deserializer=prediction_service.PredictRequest.pb().FromString,
+                    response_serializer=lambda m: m.SerializeToString(),
+                )
+            },
+        )
+
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=2))
+    server.add_generic_rpc_handlers(
+        (
+            handle("google.cloud.aiplatform.v1beta1.PredictionService"),
+            handle("google.cloud.aiplatform.v1.PredictionService"),
+        )
+    )
+    port = server.add_insecure_port("localhost:0")
+    server.start()
+    state["address"] = "localhost:{}".format(port)
+    yield state
+    server.stop(None)
+
+
+def _client(server):
+    channel = grpc.insecure_channel(server["address"])
+    return PredictionServiceClient(
+        transport=transports.PredictionServiceGrpcTransport(channel=channel)
+    )
+
+
+def test_endpoint_from_bytes():
+    data = _request().SerializeToString()
+    assert raw._endpoint(data) == ENDPOINT
+    # The endpoint may come after the other fields.
+    assert raw._endpoint(data[len(ENDPOINT) + 2 :] + data[: len(ENDPOINT) + 2]) == (
+        ENDPOINT
+    )
+    assert raw._endpoint(b"") == ""
+
+
+def test_predict_bytes(server):
+    server["calls"].clear()
+    predictor = raw.RawPredictor(_client(server))
+
+    response = predictor.predict(_request().SerializeToString(), metadata=[("k", "v")])
+
+    assert isinstance(response, bytes)
+    parsed = prediction_service.PredictResponse.deserialize(response)
+    assert parsed.deployed_model_id == "m"
+    assert list(parsed._pb.predictions) == [Value(number_value=3)]
+    ((service, request, metadata),) = server["calls"]
+    assert service == "google.cloud.aiplatform.v1beta1.PredictionService"
+    assert request == _request()
+    assert metadata["x-goog-request-params"] == "endpoint={}".format(ENDPOINT)
+    assert metadata["k"] == "v"
+    assert "x-goog-api-client" in metadata
+
+
+def test_predict_lazy_pb_with_retry(server):
+    server["calls"].clear()
+    server["fail"] = 1
+    predictor = raw.RawPredictor(_client(server).transport, response_format=raw.PB)
+
+    response = predictor.predict(
+        _request().SerializeToString(),
+        endpoint="explicit",
+        retry=retries.Retry(
+            predicate=retries.if_exception_type(exceptions.ServiceUnavailable),
+            initial=0.01,
+        ),
+    )
+
+    assert response._pb is None
+    assert response.deployed_model_id == "m"
+    assert isinstance(response.raw, bytes)
+    assert len(server["calls"]) == 2
+    assert server["calls"][1][2]["x-goog-request-params"] == "endpoint=explicit"
+
+
+def test_v1_transport(server):
+    server["calls"].clear()
+    channel = grpc.insecure_channel(server["address"])
+    transport = gapic.PredictionServiceClient.get_transport_class("grpc")(
+        channel=channel
+    )
+
+    raw.RawPredictor(transport).predict(_request().SerializeToString())
+
+    assert server["calls"][0][0] == "google.cloud.aiplatform.v1.PredictionService"
+
+
+def test_v1_keeps_transport_timeout_and_client_info(server):
+    channel = grpc.insecure_channel(server["address"])
+    transport = gapic.PredictionServiceClient.get_transport_class("grpc")(
+        channel=channel,
+        client_info=gapic_v1.client_info.ClientInfo(user_agent="raw-test/1.0"),
+    )
+
+    raw.RawPredictor(transport).predict(_request().SerializeToString())
+
+    # v1 predict has no default timeout.
+    assert server["time_remaining"] > 3600
+    assert "raw-test/1.0" in server["calls"][-1][2]["x-goog-api-client"]
+
+
+def test_v1beta1_keeps_transport_timeout_and_client_info(server):
+    channel = grpc.insecure_channel(server["address"])
+    transport = transports.PredictionServiceGrpcTransport(
+        channel=channel,
+        client_info=gapic_v1.client_info.ClientInfo(user_agent="raw-test/1.0"),
+    )
+
+    raw.RawPredictor(transport).predict(_request().SerializeToString())
+
+    # v1beta1 predict defaults to a 5 second timeout.
+    assert 0 < server["time_remaining"] < 6
+    assert "raw-test/1.0" in server["calls"][-1][2]["x-goog-api-client"]
+    raw.RawPredictor(transport).predict(_request().SerializeToString(), timeout=30)
+    assert 6 < server["time_remaining"] < 31
+
+
+def test_invalid_response_format(server):
+    with pytest.raises(ValueError):
+        raw.RawPredictor(_client(server), response_format="json")
+
+
+@pytest.mark.asyncio
+async def test_async_predict(server):
+    server["calls"].clear()
+    client = PredictionServiceAsyncClient(
+        transport=transports.PredictionServiceGrpcAsyncIOTransport(
+            channel=aio.insecure_channel(server["address"])
+        )
+    )
+    predictor = raw.AsyncRawPredictor(client, response_format=raw.PB)
+
+    response = await predictor.predict(_request().SerializeToString())
+
+    assert response.deployed_model_id == "m"
+    assert 0 < server["time_remaining"] < 6
+    assert server["calls"][0][2]["x-goog-request-params"] == (
+        "endpoint={}".format(ENDPOINT)
+    )
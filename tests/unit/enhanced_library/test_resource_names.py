@@ -0,0 +1,121 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import absolute_import
+import inspect
+import pickle
+
+import pytest
+
+from google.cloud import aiplatform_v1
+from google.cloud import aiplatform_v1beta1
+from google.cloud.aiplatform.helpers import resource_names
+from google.cloud.aiplatform_v1beta1.types import model
+
+CLIENTS = [
+    getattr(package, name)
+    for package in (aiplatform_v1, aiplatform_v1beta1)
+    for name in package.__all__
+    if name.endswith("ServiceClient")
+]
+
+
+def _path_methods():
+    for client in CLIENTS:
+        for name, build in inspect.getmembers(client):
+            if name.endswith("_path") and not name.startswith("parse_"):
+                yield pytest.param(
+                    client,
+                    name,
+                    build,
+                    id="{}.{}.{}".format(
+                        client.__module__.split(".")[2], client.__name__, name
+                    ),
+                )
+
+
+@pytest.mark.parametrize("client,name,build", list(_path_methods()))
+def test_parses_every_client_path(client, name, build):
+    args = ["id-{}".format(i) for i in inspect.signature(build).parameters]
+    path = build(*args)
+
+    key = resource_names.parse(path)
+
+    assert key is not None
+    assert key._asdict() == getattr(client, "parse_" + name)(path)
+    assert str(key) == path
+
+
+def test_keys_are_typed_and_hashable():
+    name = "projects/p/locations/us-central1/models/123"
+
+    key = resource_names.parse(name)
+
+    assert isinstance(key, resource_names.ModelName)
+    assert key.kind == "model"
+    assert key == resource_names.ModelName("p", "us-central1", "123")
+    assert key != resource_names.EndpointName("p", "us-central1", "123")
+    assert len({key, resource_names.EndpointName(*key)}) == 2
+    assert key.location == "us-central1"
+    assert pickle.loads(pickle.dumps(key)) == key
+
+
+def test_parse_interns_keys():
+    name = "/".join(["projects", "p", "locations", "l", "endpoints", "e"])
+    key = resource_names.parse(name)
+
+    assert resource_names.parse("projects/p/locations/l/endpoints/e") is key
+    assert key.project is resource_names.parse("projects/p").project
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "",
+        "projects",
+        "projects/",
+        "projects/p/locations",
+        "projects//locations/l",
+        "projects/p/widgets/w",
+        "projects/p/locations/l/studies/s",
+    ],
+)
+def test_unknown_names(name):
+    assert resource_names.parse(name) is None
+
+
+def test_parse_many():
+    names = [
+        "projects/p/locations/l/models/1",
+        "folders/f",
+        "not/a/name",
+        "projects/p/locations/l/models/1",
+    ]
+
+    keys = resource_names.parse_many(iter(names))
+
+    assert keys[0] is keys[3]
+    assert keys[1] == resource_names.FolderName("f")
+    assert keys[2] is None
+
+
+def test_index():
+    models = [
+        model.Model(name="projects/p/locations/l/models/{}".format(i)) for i in range(3)
+    ]
+
+    by_name = resource_names.index(models)
+
+    assert by_name[resource_names.ModelName("p", "l", "2")] is models[2]
+    with pytest.raises(ValueError):
+        resource_names.index([model.Model(name="models/1")])
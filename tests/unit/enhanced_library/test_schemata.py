@@ -0,0 +1,262 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import absolute_import
+import os
+
+import mock
+import pytest
+
+from google.cloud.aiplatform.gapic.schema import predict
+from google.cloud.aiplatform.helpers import schemata
+from google.cloud.aiplatform_v1beta1.types import model
+from google.protobuf import json_format
+from google.protobuf.struct_pb2 import Value
+
+pytest.importorskip("yaml")
+
+INSTANCE_URI = "gs://schemata/predict/instance/image_classification_1.0.0.yaml"
+PARAMETERS_URI = "gs://schemata/predict/params/image_classification_1.0.0.yaml"
+
+INSTANCE_YAML = b"""
+title: ImageClassification
+type: object
+required:
+- content
+properties:
+  content:
+    type: string
+    format: byte
+  mimeType:
+    type: string
+    enum:
+    - image/jpeg
+    - image/png
+"""
+
+PARAMETERS_YAML = b"""
+title: ImageClassificationPredictionParams
+type: object
+properties:
+  confidenceThreshold:
+    type: number
+    minimum: 0.0
+    maximum: 1.0
+  maxPredictions:
+    type: integer
+    minimum: 1
+"""
+
+
+def _write(directory, name, data):
+    path = os.path.join(str(directory), name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+@pytest.fixture
+def local_dir(tmpdir):
+    _write(tmpdir, "image_classification_1.0.0.yaml", INSTANCE_YAML)
+    _write(
+        tmpdir,
+        "schemata/predict/params/image_classification_1.0.0.yaml",
+        PARAMETERS_YAML,
+    )
+    return str(tmpdir)
+
+
+@pytest.fixture
+def validator(local_dir):
+    schemata_ = model.PredictSchemata(
+        instance_schema_uri=INSTANCE_URI, parameters_schema_uri=PARAMETERS_URI
+    )
+    loader = schemata.SchemaLoader(cache_dir=None, local_dir=local_dir)
+    return schemata.PredictSchemataValidator(schemata_, loader=loader)
+
+
+def test_validates_instances_in_every_form(validator):
+    validator.validate(
+        [
+            predict.instance.ImageClassificationPredictionInstance(
+                content="abc", mime_type="image/png"
+            ),
+            json_format.ParseDict({"content": "abc"}, Value()),
+            {"content": "abc", "mimeType": "image/jpeg"},
+        ],
+        parameters=predict.params.ImageClassificationPredictionParams(
+            confidence_threshold=0.5, max_predictions=5
+        ),
+    )
+
+
+def test_reports_every_violation_in_the_batch(validator):
+    instances = [
+        {"content": "abc"},
+        {"mimeType": "image/gif"},
+        {"content": 3},
+        "not an object",
+    ]
+
+    with pytest.raises(schemata.SchemaValidationError) as excinfo:
+        validator.validate(
+            instances, parameters={"confidenceThreshold": 2, "maxPredictions": 1.5}
+        )
+
+    assert excinfo.value.violations == [
+        schemata.Violation(None, "confidenceThreshold", "2.0 is above the maximum 1.0"),
+        schemata.Violation(None, "maxPredictions", "1.5 is not an integer"),
+        schemata.Violation(1, "", "missing required property 'content'"),
+        schemata.Violation(
+            1, "mimeType", "'image/gif' is not one of ['image/jpeg', 'image/png']"
+        ),
+        schemata.Violation(2, "content", "expected string, got number"),
+        schemata.Violation(3, "", "expected object, got string"),
+    ]
+    assert "instance 2 at content" in str(excinfo.value)
+
+
+def test_compiles_nested_and_referenced_schemas():
+    validator = schemata.SchemaValidator(
+        {
+            "type": "array",
+            "maxItems": 2,
+            "items": {"$ref": "#/definitions/box"},
+            "definitions": {
+                "box": {
+                    "type": "object",
+                    "additionalProperties": False,
+                    "properties": {
+                        "label": {"type": "string", "nullable": True},
+                        "children": {"$ref": "#"},
+                        "xMin": {
+                            "type": "number",
+                            "exclusiveMinimum": True,
+                            "minimum": 0,
+                        },
+                    },
+                }
+            },
+        }
+    )
+
+    assert validator.is_valid([{"label": None, "children": [{"xMin": 1}]}])
+    assert [str(v) for v in validator.iter_violations([[{"xMin": 0, "y": 1}]])] == [
+        "instance 0 at [0].xMin: 0.0 is below the minimum 0",
+        "instance 0 at [0]: unexpected property 'y'",
+    ]
+    assert not validator.is_valid([{}, {}, {}])
+
+
+def test_loader_caches_fetched_files_on_disk(tmpdir):
+    storage_client = mock.Mock()
+    blob = storage_client.bucket.return_value.blob.return_value
+    blob.download_as_bytes.return_value = INSTANCE_YAML
+    loader = schemata.SchemaLoader(cache_dir=str(tmpdir), storage_client=storage_client)
+
+    first = loader.validator(INSTANCE_URI)
+
+    assert loader.validator(INSTANCE_URI) is first
+    storage_client.bucket.assert_called_once_with("schemata")
+    storage_client.bucket.return_value.blob.assert_called_once_with(
+        "predict/instance/image_classification_1.0.0.yaml"
+    )
+    (cached,) = os.listdir(str(tmpdir))
+    assert cached.endswith("-image_classification_1.0.0.yaml")
+
+    other = schemata.SchemaLoader(cache_dir=str(tmpdir), storage_client=mock.Mock())
+    assert other.load(INSTANCE_URI) == first.schema
+    other._storage_client.bucket.assert_not_called()
+
+
+def test_validator_skips_missing_schemas(local_dir):
+    validator = schemata.PredictSchemataValidator(
+        model.Model(
+            predict_schemata=model.PredictSchemata(instance_schema_uri=INSTANCE_URI)
+        ),
+        loader=schemata.SchemaLoader(cache_dir=None, local_dir=local_dir),
+    )
+
+    assert validator.parameters is None
+    validator.validate([{"content": "abc"}], parameters={"anything": 1})
+
+
+def test_untyped_schemas_check_object_keywords():
+    validator = schemata.SchemaValidator(
+        {
+            "required": ["content"],
+            "properties": {"content": {"type": "string"}},
+            "additionalProperties": False,
+        }
+    )
+
+    assert validator.is_valid({"content": "abc"})
+    assert validator.is_valid("not an object")
+    assert [
+        str(v) for v in validator.iter_violations([{"content": 1, "x": 2}, {"x": 3}])
+    ] == [
+        "instance 0 at content: expected string, got number",
+        "instance 0: unexpected property 'x'",
+        "instance 1: missing required property 'content'",
+        "instance 1: unexpected property 'x'",
+    ]
+
+
+def test_loader_rereads_edited_local_files(tmpdir):
+    cache_dir = tmpdir.mkdir("cache")
+    path = os.path.join(str(tmpdir), "instance.yaml")
+    _write(tmpdir, "instance.yaml", b"type: string\n")
+    loader = schemata.SchemaLoader(cache_dir=str(cache_dir))
+
+    assert loader.validator(path).is_valid("abc")
+    assert loader.validator(path) is loader.validator(path)
+
+    _write(tmpdir, "instance.yaml", b"type: number\n")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    assert loader.validator("file://" + path).is_valid(1)
+    assert not loader.validator(path).is_valid("abc")
+    assert cache_dir.listdir() == []
+
+
+def test_loader_downloads_with_a_timeout(tmpdir):
+    storage_client = mock.Mock()
+    blob = storage_client.bucket.return_value.blob.return_value
+    blob.download_as_bytes.return_value = INSTANCE_YAML
+    loader = schemata.SchemaLoader(
+        cache_dir=None, storage_client=storage_client, timeout=7.5
+    )
+    response = mock.MagicMock()
+    response.__enter__.return_value.read.return_value = PARAMETERS_YAML
+
+    loader.read(INSTANCE_URI)
+    with mock.patch.object(
+        schemata.urlrequest, "urlopen", return_value=response
+    ) as urlopen:
+        assert loader.read("https://example.com/params.yaml") == PARAMETERS_YAML
+
+    blob.download_as_bytes.assert_called_once_with(timeout=7.5)
+    urlopen.assert_called_once_with("https://example.com/params.yaml", timeout=7.5)
+    assert schemata.SchemaLoader().timeout == schemata.DEFAULT_TIMEOUT
+
+
+def test_untyped_enum_rejects_objects_and_arrays():
+    validator = schemata.SchemaValidator({"enum": ["a", 1]})
+
+    assert validator.is_valid("a")
+    assert [str(v) for v in validator.iter_violations([{"k": "a"}, ["a"], "b"])] == [
+        "instance 0: an object is not one of ['a', 1]",
+        "instance 1: an array is not one of ['a', 1]",
+        "instance 2: 'b' is not one of ['a', 1]",
+    ]
@@ -0,0 +1,75 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import absolute_import
+import io
+
+import pytest
+
+from google.cloud.aiplatform.gapic.schema import predict
+from google.cloud.aiplatform.helpers import segmentation
+from google.cloud.aiplatform_v1beta1.types import prediction_service
+
+
+def _png(pixels):
+    np = pytest.importorskip("numpy")
+    Image = pytest.importorskip("PIL.Image")
+    buffer = io.BytesIO()
+    Image.fromarray(np.array(pixels, dtype=np.uint8)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _response(results):
+    response = prediction_service.PredictResponse()
+    response._pb.predictions.extend([result.to_value() for result in results])
+    return response
+
+
+def test_png_bytes_are_lazy():
+    result = predict.prediction.ImageSegmentationPredictionResult(
+        category_mask=b"category", confidence_mask=b"confidence"
+    )
+    (masks,) = segmentation.masks(_response([result]))
+
+    assert masks._png == {}
+    assert masks.category_mask_png.tobytes() == b"category"
+    assert masks.category_mask_png is masks.category_mask_png
+    assert bytes(masks.confidence_mask_png) == b"confidence"
+
+
+def test_missing_masks():
+    result = predict.prediction.ImageSegmentationPredictionResult(
+        category_mask=b"category"
+    )
+    for prediction in (result, result.to_value()):
+        masks = segmentation.SegmentationMasks(prediction)
+        assert masks.confidence_mask_png is None
+        assert masks.confidence_mask is None
+
+
+def test_decode_masks():
+    category = [[0, 1], [2, 1]]
+    confidence = [[255, 128], [0, 64]]
+    results = [
+        predict.prediction.ImageSegmentationPredictionResult(
+            category_mask=_png(category), confidence_mask=_png(confidence)
+        )
+        for _ in range(3)
+    ]
+
+    decoded = segmentation.decode_masks(_response(results), max_workers=2)
+
+    assert len(decoded) == 3
+    for masks in decoded:
+        assert masks._arrays["category_mask"].tolist() == category
+        assert masks.confidence_mask.tolist() == confidence
@@ -0,0 +1,186 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import absolute_import
+
+import mock
+import pytest
+
+from google.api_core import exceptions
+from google.cloud.aiplatform.helpers import splitting
+from google.cloud.aiplatform_v1beta1.types import explanation
+from google.cloud.aiplatform_v1beta1.types import prediction_service
+from google.protobuf.struct_pb2 import Value
+
+ENDPOINT = "projects/p/locations/l/endpoints/e"
+
+
+def _client(limit):
+    client = mock.Mock()
+    client.limit = limit
+
+    def predict(endpoint=None, instances=None, **kwargs):
+        if len(instances) > client.limit:
+            raise exceptions.InvalidArgument(
+                "The number of instances exceeds the limit of {}.".format(client.limit)
+            )
+        response = prediction_service.PredictResponse(deployed_model_id="m")
+        response._pb.predictions.extend(instances)
+        return response
+
+    def explain(endpoint=None, instances=None, **kwargs):
+        if len(instances) > limit:
+            raise exceptions.ResourceExhausted(
+                "Sent message larger than max (5000 vs. 4000)"
+            )
+        response = prediction_service.ExplainResponse(deployed_model_id="m")
+        response._pb.predictions.extend(instances)
+        response._pb.explanations.extend(
+            [explanation.Explanation()._pb for _ in instances]
+        )
+        return response
+
+    client.predict.side_effect = predict
+    client.explain.side_effect = explain
+    return client
+
+
+def _instances(count):
+    return [Value(number_value=i) for i in range(count)]
+
+
+def test_is_payload_too_large():
+    assert splitting.is_payload_too_large(
+        exceptions.ResourceExhausted("Received message larger than max")
+    )
+    assert not splitting.is_payload_too_large(
+        exceptions.ResourceExhausted("Quota exceeded for online prediction")
+    )
+    assert not splitting.is_payload_too_large(exceptions.InvalidArgument("bad"))
+    assert splitting.is_payload_too_large(
+        exceptions.InvalidArgument("Request payload size exceeds the limit: 1572864")
+    )
+    assert splitting.is_payload_too_large(
+        exceptions.InvalidArgument("Too many instances in the request.")
+    )
+    assert not splitting.is_payload_too_large(
+        exceptions.InvalidArgument("instances[0].size exceeds the limit of 10.")
+    )
+    assert not splitting.is_payload_too_large(ValueError("too large"))
+
+
+def test_small_batch_is_sent_once():
+    client = _client(limit=10)
+    adaptive = splitting.AdaptivePredictionClient(client)
+
+    response = adaptive.predict(endpoint=ENDPOINT, instances=_instances(5))
+
+    assert len(response.predictions) == 5
+    assert client.predict.call_count == 1
+    assert adaptive.batch_size(ENDPOINT) is None
+
+
+def test_splits_and_stitches_in_order():
+    client = _client(limit=3)
+    adaptive = splitting.AdaptivePredictionClient(client)
+
+    response = adaptive.predict(endpoint=ENDPOINT, instances=_instances(10))
+
+    assert [v.number_value for v in response._pb.predictions] == list(range(10))
+    assert response.deployed_model_id == "m"
+    assert adaptive.batch_size(ENDPOINT) == 3
+
+
+def test_learned_batch_size_is_used_up_front():
+    client = _client(limit=3)
+    adaptive = splitting.AdaptivePredictionClient(client)
+    adaptive.predict(endpoint=ENDPOINT, instances=_instances(10))
+    client.predict.reset_mock()
+
+    response = adaptive.predict(endpoint=ENDPOINT, instances=_instances(7))
+
+    assert len(response.predictions) == 7
+    sizes = [len(c[1]["instances"]) for c in client.predict.call_args_list]
+    assert sizes == [3, 3, 1]
+    assert adaptive.batch_size("other") is None
+
+
+def test_explain_on_message_size():
+    adaptive = splitting.AdaptivePredictionClient(_client(limit=2), max_batch_size=8)
+
+    response = adaptive.explain(endpoint=ENDPOINT, instances=_instances(5))
+
+    assert len(response.predictions) == 5
+    assert len(response.explanations) == 5
+    assert adaptive.batch_size(ENDPOINT) == 2
+
+
+def test_other_errors_are_raised():
+    client = mock.Mock()
+    client.predict.side_effect = exceptions.InvalidArgument("bad instance")
+    adaptive = splitting.AdaptivePredictionClient(client)
+
+    with pytest.raises(exceptions.InvalidArgument):
+        adaptive.predict(endpoint=ENDPOINT, instances=_instances(4))
+    assert client.predict.call_count == 1
+
+
+def test_single_instance_too_large_is_raised():
+    adaptive = splitting.AdaptivePredictionClient(_client(limit=0))
+
+    with pytest.raises(exceptions.InvalidArgument):
+        adaptive.predict(endpoint=ENDPOINT, instances=_instances(2))
+
+
+def test_unrelated_invalid_argument_is_not_split():
+    client = mock.Mock()
+    client.predict.side_effect = exceptions.InvalidArgument(
+        "Field value exceeds the limit of 100."
+    )
+    adaptive = splitting.AdaptivePredictionClient(client)
+
+    with pytest.raises(exceptions.InvalidArgument):
+        adaptive.predict(endpoint=ENDPOINT, instances=_instances(8))
+    assert client.predict.call_count == 1
+    assert adaptive.batch_size(ENDPOINT) is None
+
+
+def test_failed_split_is_not_learned():
+    adaptive = splitting.AdaptivePredictionClient(_client(limit=0))
+
+    with pytest.raises(exceptions.InvalidArgument):
+        adaptive.predict(endpoint=ENDPOINT, instances=_instances(4))
+    assert adaptive.batch_size(ENDPOINT) is None
+
+
+def test_learned_batch_size_grows_back():
+    client = _client(limit=2)
+    adaptive = splitting.AdaptivePredictionClient(
+        client, max_batch_size=16, grow_after=2
+    )
+    adaptive.predict(endpoint=ENDPOINT, instances=_instances(4))
+    assert adaptive.batch_size(ENDPOINT) == 2
+
+    client.limit = 100
+    for _ in range(4):
+        adaptive.predict(endpoint=ENDPOINT, instances=_instances(8))
+
+    assert adaptive.batch_size(ENDPOINT) == 16
+    client.predict.reset_mock()
+    adaptive.predict(endpoint=ENDPOINT, instances=_instances(8))
+    assert client.predict.call_count == 1
+
+
+def test_invalid_grow_after():
+    with pytest.raises(ValueError):
+        splitting.AdaptivePredictionClient(mock.Mock(), grow_after=0)
@@ -0,0 +1,119 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import absolute_import
+import asyncio
+
+import pytest
+
+from google.api_core import exceptions
+from google.cloud.aiplatform.helpers import streaming
+from google.cloud.aiplatform_v1beta1.types import prediction_service
+from google.protobuf.struct_pb2 import Value
+
+ENDPOINT = "projects/p/locations/l/endpoints/e"
+
+
+class FakeAsyncClient:
+    def __init__(self, fail_at=None):
+        self.fail_at = fail_at
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = 0
+
+    async def predict(self, endpoint, instances, parameters, **kwargs):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            # Later chunks finish first so ordering is exercised.
+            await asyncio.sleep(0.01 / instances[0].number_value if instances else 0)
+            if self.fail_at is not None and any(
+                v.number_value == self.fail_at for v in instances
+            ):
+                raise exceptions.InvalidArgument("bad instance")
+            response = prediction_service.PredictResponse(deployed_model_id="m")
+            response.predictions.extend([v.number_value for v in instances])
+            return response
+        finally:
+            self.in_flight -= 1
+
+
+def _instances(n):
+    return (Value(number_value=i) for i in range(1, n + 1))
+
+
+async def _collect(agen):
+    return [result async for result in agen]
+
+
+@pytest.mark.asyncio
+async def test_predict_many_preserves_order():
+    client = FakeAsyncClient()
+    results = await _collect(
+        streaming.predict_many(
+            client, ENDPOINT, _instances(10), chunk_size=3, max_concurrency=2
+        )
+    )
+
+    assert [r.start for r in results] == [0, 3, 6, 9]
+    assert [r.size for r in results] == [3, 3, 3, 1]
+    assert [p for r in results for p in r.predictions] == list(range(1, 11))
+    assert all(r.deployed_model_id == "m" for r in results)
+    assert client.max_in_flight <= 2
+
+
+@pytest.mark.asyncio
+async def test_predict_many_attaches_chunk_errors():
+    client = FakeAsyncClient(fail_at=5)
+    results = await _collect(
+        streaming.predict_many(client, ENDPOINT, _instances(6), chunk_size=2)
+    )
+
+    assert [r.error is None for r in results] == [True, True, False]
+    assert isinstance(results[2].error, exceptions.InvalidArgument)
+    assert results[2].predictions == []
+
+
+@pytest.mark.asyncio
+async def test_predict_many_accepts_async_iterables():
+    async def instances():
+        for value in _instances(4):
+            yield value
+
+    results = await _collect(
+        streaming.predict_many(FakeAsyncClient(), ENDPOINT, instances(), chunk_size=4)
+    )
+
+    assert len(results) == 1
+    assert results[0].predictions == [1, 2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_predict_many_applies_backpressure():
+    client = FakeAsyncClient()
+    stream = streaming.predict_many(
+        client, ENDPOINT, _instances(1000), chunk_size=1, max_concurrency=3
+    )
+    await stream.__anext__()
+    await stream.aclose()
+
+    assert client.calls <= 4
+
+
+@pytest.mark.asyncio
+async def test_predict_many_validates_arguments():
+    with pytest.raises(ValueError):
+        await _collect(
+            streaming.predict_many(FakeAsyncClient(), ENDPOINT, [], chunk_size=0)
+        )
@@ -0,0 +1,140 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import absolute_import
+
+import pytest
+
+from google.cloud.aiplatform.helpers import tabular
+from google.cloud.aiplatform_v1beta1.types import prediction_service
+from google.protobuf import json_format
+
+np = pytest.importorskip("numpy")
+
+
+def _instances(request):
+    return [json_format.MessageToDict(value) for value in request._pb.instances]
+
+
+def test_encode_structured_array():
+    data = np.array(
+        [(1, 2.5, True, "a"), (2, np.nan, False, "b")],
+        dtype=[("id", "i8"), ("score", "f8"), ("flag", "?"), ("name", "U4")],
+    )
+    request = prediction_service.PredictRequest(endpoint="e")
+
+    assert tabular.encode_instances(data, request) is request
+    assert _instances(request) == [
+        {"id": 1.0, "score": 2.5, "flag": True, "name": "a"},
+        {"id": 2.0, "score": None, "flag": False, "name": "b"},
+    ]
+
+
+def test_encode_mapping_of_columns():
+    request = prediction_service.PredictRequest()
+    tabular.encode_instances(
+        {
+            "when": np.array(["2020-01-01", "NaT"], dtype="datetime64[D]"),
+            "mixed": np.array([None, {"k": 1}], dtype=object),
+            "raw": np.array([b"x", b"y"]),
+        },
+        request,
+    )
+
+    assert _instances(request) == [
+        {"when": "2020-01-01", "mixed": None, "raw": "x"},
+        {"when": None, "mixed": {"k": 1.0}, "raw": "y"},
+    ]
+
+
+def test_encode_dataframe_appends_to_raw_request():
+    pd = pytest.importorskip("pandas")
+    frame = pd.DataFrame({"a": [1.0, None], "b": ["x", None]})
+    request = prediction_service.ExplainRequest()._pb
+
+    tabular.encode_instances(frame, request)
+    tabular.encode_instances(frame, request)
+
+    assert len(request.instances) == 4
+    assert json_format.MessageToDict(request.instances[1]) == {"a": None, "b": None}
+
+
+def test_encode_dataframe_with_nullable_dtypes():
+    pd = pytest.importorskip("pandas")
+    frame = pd.DataFrame(
+        {
+            "flag": pd.array([True, None], dtype="boolean"),
+            "name": pd.array(["x", None], dtype="string"),
+            "count": pd.array([3, None], dtype="Int64"),
+            "when": pd.to_datetime(["2020-01-01", None]).tz_localize("UTC"),
+        }
+    )
+    request = prediction_service.PredictRequest()
+
+    tabular.encode_instances(frame, request)
+
+    instances = _instances(request)
+    assert instances[0]["flag"] is True
+    assert instances[0]["name"] == "x"
+    assert instances[0]["count"] == 3
+    assert instances[0]["when"] == "2020-01-01T00:00:00+00:00"
+    assert instances[1] == {"flag": None, "name": None, "count": None, "when": None}
+
+
+def test_encode_datetimes_as_iso_8601():
+    pd = pytest.importorskip("pandas")
+    frame = pd.DataFrame(
+        {
+            "naive": pd.to_datetime(["2020-01-01 12:30:00.5", None]),
+            "aware": pd.to_datetime(["2020-01-01 12:30", None]).tz_localize(
+                "Europe/Paris"
+            ),
+            "mixed": pd.Series(
+                [np.datetime64("2020-01-02T03:04"), np.datetime64("NaT")], dtype=object,
+            ),
+        }
+    )
+    request = prediction_service.PredictRequest()
+
+    tabular.encode_instances(frame, request)
+
+    assert _instances(request) == [
+        {
+            "naive": "2020-01-01T12:30:00.500000",
+            "aware": "2020-01-01T12:30:00+01:00",
+            "mixed": "2020-01-02T03:04:00",
+        },
+        {"naive": None, "aware": None, "mixed": None},
+    ]
+
+
+def test_encode_numpy_nan_in_object_column_as_null():
+    request = prediction_service.PredictRequest()
+    tabular.encode_instances(
+        {"score": np.array([np.float32("nan"), np.float16(1.5)], dtype=object)},
+        request,
+    )
+
+    assert _instances(request) == [{"score": None}, {"score": 1.5}]
+
+
+def test_encode_rejects_ragged_columns():
+    with pytest.raises(ValueError):
+        tabular.encode_instances(
+            {"a": [1, 2], "b": [1]}, prediction_service.PredictRequest()
+        )
+
+
+def test_encode_rejects_unknown_input():
+    with pytest.raises(TypeError):
+        tabular.encode_instances([1, 2], prediction_service.PredictRequest())
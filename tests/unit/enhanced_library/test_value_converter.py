@@ -12,9 +12,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from __future__ import absolute_import
+import threading
+import time
+
+import pytest
 
 from google.cloud.aiplatform.helpers import value_converter
+from google.protobuf import duration_pb2 as duration
 from google.protobuf import json_format
+from google.protobuf import struct_pb2 as struct
+from google.protobuf import wrappers_pb2 as wrappers
 from google.protobuf.struct_pb2 import Value
 import proto
 
@@ -85,3 +92,250 @@ def test_convert_map_to_message():
 
     # Check property-to-key/value equivalency
     assert actual_output.test_int == map_composite["test_int"]
+
+
+class SomeEnum(proto.Enum):
+    UNSPECIFIED = 0
+    FIRST = 1
+
+
+class SomeNestedMessage(proto.Message):
+    test_float = proto.Field(proto.FLOAT, number=1)
+
+
+class SomeRichMessage(proto.Message):
+    test_uint64 = proto.Field(proto.UINT64, number=1)
+    test_double = proto.Field(proto.DOUBLE, number=2)
+    test_bytes = proto.Field(proto.BYTES, number=3)
+    test_enum = proto.Field(proto.ENUM, number=4, enum=SomeEnum)
+    test_repeated = proto.RepeatedField(proto.STRING, number=5)
+    test_nested = proto.RepeatedField(
+        proto.MESSAGE, number=6, message=SomeNestedMessage
+    )
+    test_map = proto.MapField(proto.STRING, proto.INT32, number=7)
+    test_duration = proto.Field(proto.MESSAGE, number=8, message=duration.Duration)
+    test_wrapper = proto.Field(proto.MESSAGE, number=9, message=wrappers.FloatValue)
+    test_struct = proto.Field(proto.MESSAGE, number=10, message=struct.Struct)
+    test_empty = proto.Field(proto.MESSAGE, number=11, message=SomeNestedMessage)
+
+
+rich_message = SomeRichMessage(
+    test_uint64=2 ** 60,
+    test_double=float("inf"),
+    test_bytes=b"\x00\xff",
+    test_enum=SomeEnum.FIRST,
+    test_repeated=["a", "b"],
+    test_nested=[SomeNestedMessage(test_float=0.1), SomeNestedMessage()],
+    test_map={"k": 5},
+    test_duration=duration.Duration(seconds=3, nanos=500000000),
+    test_wrapper=wrappers.FloatValue(value=0.3),
+    test_struct=struct.Struct(fields={"x": struct.Value(bool_value=True)}),
+    test_empty=SomeNestedMessage(),
+)
+
+
+def test_to_value_matches_json_mapping():
+    expected = json_format.ParseDict(
+        json_format.MessageToDict(rich_message._pb), Value()
+    )
+
+    assert value_converter.to_value(rich_message) == expected
+
+
+def test_from_value_round_trips():
+    value = value_converter.to_value(rich_message)
+
+    assert value_converter.from_value(SomeRichMessage, value) == rich_message._pb
+
+
+def test_from_value_accepts_json_and_field_names():
+    value = json_format.ParseDict(
+        {"testStr": "a", "test_int64": "12", "test_bool": None}, Value()
+    )
+    actual = value_converter.from_value(SomeMessage, value)
+
+    assert actual.test_str == "a"
+    assert actual.test_int64 == 12
+    assert actual.test_bool is False
+
+
+def test_from_value_rejects_unknown_fields():
+    value = json_format.ParseDict({"not_a_field": 1}, Value())
+
+    with pytest.raises(json_format.ParseError):
+        value_converter.from_value(SomeMessage, value)
+
+
+def test_from_value_rejects_non_integral_numbers():
+    value = json_format.ParseDict({"test_int64": 1.5}, Value())
+
+    with pytest.raises(json_format.ParseError):
+        value_converter.from_value(SomeMessage, value)
+
+
+class SomeValueHolder(proto.Message):
+    test_value = proto.Field(proto.MESSAGE, number=1, message=struct.Value)
+
+
+def test_convert_struct_map_to_message():
+    holder = SomeValueHolder(test_value=input_value)
+    map_composite = holder.test_value
+
+    actual_output = value_converter.from_map(SomeMessage, map_composite)
+
+    assert actual_output == SomeMessage(input_dict)._pb
+
+
+def test_converters_are_cached_per_class():
+    converter = value_converter._get_converter(SomeMessage)
+
+    assert value_converter._get_converter(SomeMessage) is converter
+    assert value_converter._get_converter(SomeOutType) is not converter
+
+
+def test_to_values_matches_to_value():
+    messages = [rich_message, SomeRichMessage(), SomeMessage(input_dict)._pb]
+
+    actual = value_converter.to_values(SomeRichMessage, messages[:2])
+
+    assert actual == [value_converter.to_value(message) for message in messages[:2]]
+    assert value_converter.to_values(SomeMessage, iter(messages[2:])) == [
+        value_converter.to_value(messages[2])
+    ]
+
+
+def test_from_values_round_trips():
+    values = value_converter.to_values(SomeRichMessage, [rich_message] * 3)
+
+    actual = value_converter.from_values(SomeRichMessage, values)
+
+    assert actual == [rich_message._pb] * 3
+
+
+def test_columns_to_values_matches_to_value():
+    columns = {
+        "test_str": ["a", "b", None],
+        "testInt64": [1, 2 ** 40, 3],
+        "test_bool": (True, False, True),
+    }
+    messages = [
+        SomeMessage(test_str="a", test_int64=1, test_bool=True),
+        SomeMessage(test_str="b", test_int64=2 ** 40),
+        SomeMessage(test_int64=3, test_bool=True),
+    ]
+
+    actual = value_converter.columns_to_values(SomeMessage, columns)
+
+    assert actual == value_converter.to_values(SomeMessage, messages)
+
+
+def test_columns_to_values_accepts_message_columns():
+    columns = {
+        "test_nested": [[SomeNestedMessage(test_float=0.1)], []],
+        "test_duration": [duration.Duration(seconds=3, nanos=500000000), None],
+        "test_wrapper": [0.3, wrappers.FloatValue(value=0.5)],
+        "test_struct": [{"x": True}, None],
+        "test_map": [{"k": 5}, {}],
+    }
+    messages = [
+        SomeRichMessage(
+            test_nested=[SomeNestedMessage(test_float=0.1)],
+            test_duration=duration.Duration(seconds=3, nanos=500000000),
+            test_wrapper=wrappers.FloatValue(value=0.3),
+            test_struct=struct.Struct(fields={"x": struct.Value(bool_value=True)}),
+            test_map={"k": 5},
+        ),
+        SomeRichMessage(test_wrapper=wrappers.FloatValue(value=0.5)),
+    ]
+
+    actual = value_converter.columns_to_values(SomeRichMessage, columns)
+
+    assert actual == value_converter.to_values(SomeRichMessage, messages)
+    assert value_converter.columns_to_values(
+        SomeNestedMessage, {"test_float": [0.1, 0.0]}
+    ) == value_converter.to_values(
+        SomeNestedMessage, [SomeNestedMessage(test_float=0.1), SomeNestedMessage()]
+    )
+
+
+def test_columns_to_values_accepts_numpy_columns():
+    np = pytest.importorskip("numpy")
+
+    actual = value_converter.columns_to_values(
+        SomeRichMessage,
+        {"test_double": np.array([0.5, np.inf]), "test_uint64": np.arange(2)},
+    )
+
+    assert actual == value_converter.to_values(
+        SomeRichMessage,
+        [
+            SomeRichMessage(test_double=0.5),
+            SomeRichMessage(test_double=float("inf"), test_uint64=1),
+        ],
+    )
+
+
+def test_columns_to_values_rejects_bad_columns():
+    with pytest.raises(ValueError):
+        value_converter.columns_to_values(SomeMessage, {"not_a_field": [1]})
+    with pytest.raises(ValueError):
+        value_converter.columns_to_values(
+            SomeMessage, {"test_str": ["a"], "test_bool": [True, False]}
+        )
+
+
+class SomeTreeMessage(proto.Message):
+    label = proto.Field(proto.STRING, number=1)
+    children = proto.RepeatedField(proto.MESSAGE, number=2, message="SomeTreeMessage")
+
+
+def test_concurrent_first_use_sees_complete_plans(monkeypatch):
+    def slowly(planner):
+        # Widens the window in which a plan is being built.
+        def plan_field(field, *args):
+            time.sleep(0.001)
+            return planner(field, *args)
+
+        return plan_field
+
+    monkeypatch.setattr(
+        value_converter, "_field_writer", slowly(value_converter._field_writer)
+    )
+    monkeypatch.setattr(
+        value_converter, "_field_reader", slowly(value_converter._field_reader)
+    )
+    tree = SomeTreeMessage(
+        label="root", children=[SomeTreeMessage(label="leaf", children=[])]
+    )
+    value = value_converter.to_value(tree)
+    errors = []
+
+    def convert(barrier):
+        barrier.wait()
+        try:
+            assert value_converter.to_value(rich_message) == value_converter.to_value(
+                rich_message
+            )
+            assert value_converter.to_value(tree) == value
+            assert value_converter.from_value(SomeTreeMessage, value) == tree._pb
+            value_converter.from_value(
+                SomeRichMessage, value_converter.to_value(rich_message)
+            )
+        except Exception as exc:
+            errors.append(exc)
+
+    for _ in range(5):
+        for name in (
+            SomeRichMessage.pb().DESCRIPTOR.full_name,
+            SomeTreeMessage.pb().DESCRIPTOR.full_name,
+        ):
+            value_converter._to_value_plans.pop(name, None)
+            value_converter._from_value_plans.pop(name, None)
+        barrier = threading.Barrier(8)
+        threads = [threading.Thread(target=convert, args=(barrier,)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert errors == []
@@ -0,0 +1,89 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import absolute_import
+
+import mock
+import pytest
+
+from google.cloud.aiplatform.helpers import views
+from google.cloud.aiplatform_v1beta1.types import data_item
+from google.cloud.aiplatform_v1beta1.types import dataset_service
+from google.cloud.aiplatform_v1beta1.types import prediction_service
+from google.protobuf import json_format
+from google.protobuf.struct_pb2 import Value
+
+PREDICTIONS = [
+    {"ids": ["1", "2"], "confidences": [0.9, 0.1], "nested": {"ok": True}},
+    "text",
+    3.5,
+    None,
+]
+
+
+@pytest.fixture
+def response():
+    response = prediction_service.PredictResponse()
+    response._pb.predictions.extend(
+        [json_format.ParseDict(p, Value()) for p in PREDICTIONS]
+    )
+    return response
+
+
+def test_predictions_view(response):
+    predictions = views.predictions(response)
+
+    assert len(predictions) == 4
+    assert predictions == PREDICTIONS
+    assert predictions[-1] is None
+    assert predictions[1:3] == ["text", 3.5]
+    first = predictions[0]
+    assert isinstance(first, views.StructView)
+    assert sorted(first) == ["confidences", "ids", "nested"]
+    assert first["nested"]["ok"] is True
+    assert list(first["confidences"]) == [0.9, 0.1]
+    assert "missing" not in first
+    with pytest.raises(KeyError):
+        first["missing"]
+    # The lookup must not have added the key.
+    assert len(first) == 3
+
+
+def test_conversion_is_per_access(response):
+    predictions = views.predictions(response)
+    with mock.patch.object(
+        views, "_value_to_python", wraps=views._value_to_python
+    ) as convert:
+        predictions._convert = convert
+        assert predictions[2] == 3.5
+        assert convert.call_count == 1
+        assert predictions[2] == 3.5
+        assert convert.call_count == 2
+
+
+def test_message_items_are_wrapped_without_copy():
+    response = dataset_service.ListDataItemsResponse()
+    response._pb.data_items.add().name = "items/1"
+    response._pb.data_items.add().name = "items/2"
+
+    items = views.repeated_view(response, "data_items")
+
+    assert [item.name for item in items] == ["items/1", "items/2"]
+    assert isinstance(items[0], data_item.DataItem)
+    assert items[0]._pb is response._pb.data_items[0]
+
+
+def test_scalar_and_invalid_fields():
+    response = dataset_service.ListDataItemsResponse(next_page_token="t")
+    with pytest.raises(ValueError):
+        views.repeated_view(response, "next_page_token")